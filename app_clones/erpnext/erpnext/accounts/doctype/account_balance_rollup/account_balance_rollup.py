@@ -0,0 +1,303 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import hashlib
+import random
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.query_builder.functions import Round, Sum
+from frappe.utils import cint, cstr, flt, getdate, now
+
+from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
+	get_accounting_dimensions,
+)
+
+KEY_FIELDS = (
+	"company",
+	"account",
+	"account_currency",
+	"posting_date",
+	"fiscal_year",
+	"cost_center",
+	"project",
+	"finance_book",
+	"is_opening",
+	"is_period_closing_voucher_entry",
+)
+AMOUNT_FIELDS = ("debit", "credit", "debit_in_account_currency", "credit_in_account_currency")
+# number of rows postings to the same balance are spread over
+ROLLUP_SLOTS = 8
+
+
+class AccountBalanceRollup(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		account: DF.Link | None
+		account_currency: DF.Link | None
+		company: DF.Link | None
+		cost_center: DF.Link | None
+		credit: DF.Currency
+		credit_in_account_currency: DF.Currency
+		debit: DF.Currency
+		debit_in_account_currency: DF.Currency
+		finance_book: DF.Link | None
+		fiscal_year: DF.Link | None
+		is_opening: DF.Literal["No", "Yes"]
+		is_period_closing_voucher_entry: DF.Check
+		posting_date: DF.Date | None
+		project: DF.Link | None
+		slot: DF.Int
+	# end: auto-generated types
+
+	pass
+
+
+def is_account_balance_rollup_enabled() -> bool:
+	"""Whether the rollup is kept up to date as GL Entries are posted and cancelled."""
+	return bool(cint(frappe.db.get_single_value("Accounts Settings", "use_account_balance_rollup")))
+
+
+def use_account_balance_rollup() -> bool:
+	"""Whether balances can be read from the rollup, i.e. it is maintained and has been built."""
+	return is_account_balance_rollup_enabled() and bool(
+		frappe.db.get_single_value("Accounts Settings", "account_balance_rollup_built_on")
+	)
+
+
+def get_balance_doctype() -> str:
+	"""DocType to read account balances from, `Account Balance Rollup` or `GL Entry`."""
+	return "Account Balance Rollup" if use_account_balance_rollup() else "GL Entry"
+
+
+def update_account_balance_rollup(gl_entries, cancel=False):
+	"""Add the amounts of non-cancelled GL Entries to the rollup, or subtract them on `cancel`."""
+	if not gl_entries or not is_account_balance_rollup_enabled():
+		return
+
+	balances = aggregate_balances(gl_entries)
+	for company in sorted({values["company"] for values in balances.values()}):
+		lock_rollup_company(company)
+
+	sign = -1 if cancel else 1
+	# concurrent postings to the same balance likely update different rows
+	slot = random.randrange(ROLLUP_SLOTS)
+	rollup = frappe.qb.DocType("Account Balance Rollup")
+	# rows are always locked in the same order, to avoid deadlocks
+	for name, values in sorted((get_rollup_name(key, slot), values) for key, values in balances.items()):
+		if not frappe.db.exists("Account Balance Rollup", name):
+			_create_rollup(name, values, slot)
+
+		query = frappe.qb.update(rollup).set(rollup.modified, now()).where(rollup.name == name)
+		for fieldname in AMOUNT_FIELDS:
+			query = query.set(rollup[fieldname], rollup[fieldname] + sign * values[fieldname])
+		query.run()
+
+
+def remove_vouchers_from_account_balance_rollup(voucher_type, voucher_nos, voucher_detail_nos=None):
+	"""Subtract the non-cancelled GL Entries of vouchers (or only of their `voucher_detail_nos`)
+	that are about to be removed or cancelled from the rollup."""
+	if not voucher_nos or not is_account_balance_rollup_enabled():
+		return
+
+	if isinstance(voucher_nos, str):
+		voucher_nos = [voucher_nos]
+
+	gle = frappe.qb.DocType("GL Entry")
+	query = (
+		frappe.qb.from_(gle)
+		.select("*")
+		.where(
+			(gle.voucher_type == voucher_type) & (gle.voucher_no.isin(voucher_nos)) & (gle.is_cancelled == 0)
+		)
+		.for_update()
+	)
+	if voucher_detail_nos:
+		query = query.where(gle.voucher_detail_no.isin(voucher_detail_nos))
+
+	gl_entries = query.run(as_dict=True)
+
+	update_account_balance_rollup(gl_entries, cancel=True)
+
+
+def lock_rollup_company(company, exclusive=False):
+	"""Lock the company row, shared while posting and exclusively while rebuilding the rollup of the
+	company, so that a rebuild neither misses nor double counts entries posted meanwhile."""
+	if exclusive:
+		lock = "for update"
+	elif frappe.db.db_type == "postgres":
+		lock = "for share"
+	else:
+		lock = "lock in share mode"
+
+	frappe.db.sql(f"select name from `tabCompany` where name = %s {lock}", company)
+
+
+def _create_rollup(name, values, slot):
+	"""Create an empty rollup row, ignoring rows created concurrently."""
+	rollup = frappe.new_doc("Account Balance Rollup")
+	rollup.update({fieldname: values[fieldname] for fieldname in get_key_fields()})
+	rollup.slot = slot
+	rollup.name = name
+	rollup.db_insert(ignore_if_duplicate=True)
+
+
+def aggregate_balances(entries) -> dict:
+	"""Sum up the amounts of GL Entries (or rollup rows) by rollup key. Amounts are rounded before
+	being summed up, same as balances read from GL Entries."""
+	from erpnext.accounts.utils import get_currency_precision
+
+	precision = get_currency_precision()
+	key_fields = get_key_fields()
+	balances = {}
+	for entry in entries:
+		values = get_key_values(entry, key_fields)
+		key = tuple(values[fieldname] for fieldname in key_fields)
+		if key not in balances:
+			balances[key] = values
+			balances[key].update(dict.fromkeys(AMOUNT_FIELDS, 0.0))
+
+		for fieldname in AMOUNT_FIELDS:
+			balances[key][fieldname] += flt(entry.get(fieldname), precision)
+
+	return balances
+
+
+def get_key_fields() -> tuple:
+	return KEY_FIELDS + tuple(get_accounting_dimensions())
+
+
+def get_key_values(entry, key_fields) -> dict:
+	values = {fieldname: cstr(entry.get(fieldname)) for fieldname in key_fields}
+	values["posting_date"] = cstr(getdate(entry.get("posting_date")))
+	values["is_opening"] = entry.get("is_opening") or "No"
+
+	if entry.get("voucher_type"):
+		is_period_closing_voucher_entry = entry.get("voucher_type") == "Period Closing Voucher"
+		values["is_period_closing_voucher_entry"] = cint(is_period_closing_voucher_entry)
+	else:
+		values["is_period_closing_voucher_entry"] = cint(entry.get("is_period_closing_voucher_entry"))
+
+	return values
+
+
+def get_rollup_name(key, slot=0) -> str:
+	if slot:
+		key = (*key, slot)
+	return hashlib.md5("\x1f".join(cstr(value) for value in key).encode(), usedforsecurity=False).hexdigest()
+
+
+def get_gl_balances(company):
+	"""Sum of non-cancelled GL Entries of a company by rollup key, as stored in the rollup."""
+	from erpnext.accounts.utils import get_currency_precision
+
+	precision = get_currency_precision()
+	gle = frappe.qb.DocType("GL Entry")
+	dimensions = get_accounting_dimensions()
+	group_by = [gle[fieldname] for fieldname in KEY_FIELDS if fieldname != "is_period_closing_voucher_entry"]
+	group_by += [gle[dimension] for dimension in dimensions]
+
+	entries = []
+	for is_period_closing_voucher_entry in (0, 1):
+		query = (
+			frappe.qb.from_(gle)
+			.select(
+				*group_by,
+				*(Sum(Round(gle[fieldname], precision)).as_(fieldname) for fieldname in AMOUNT_FIELDS),
+			)
+			.where((gle.company == company) & (gle.is_cancelled == 0))
+			.groupby(*group_by)
+		)
+		if is_period_closing_voucher_entry:
+			query = query.where(gle.voucher_type == "Period Closing Voucher")
+		else:
+			query = query.where(gle.voucher_type != "Period Closing Voucher")
+
+		for entry in query.run(as_dict=True):
+			entry.is_period_closing_voucher_entry = is_period_closing_voucher_entry
+			entries.append(entry)
+
+	return aggregate_balances(entries)
+
+
+def rebuild_account_balance_rollup(company=None):
+	"""Rebuild the rollup of a company (or all companies) from GL Entries."""
+	companies = [company] if company else frappe.get_all("Company", pluck="name")
+	fields = ["name", "creation", "modified", "owner", "modified_by", *get_key_fields(), *AMOUNT_FIELDS]
+
+	for rollup_company in companies:
+		# postings of the company wait till its rollup is rebuilt
+		lock_rollup_company(rollup_company, exclusive=True)
+		frappe.db.delete("Account Balance Rollup", {"company": rollup_company})
+
+		timestamp, user = now(), frappe.session.user
+		rows = []
+		for key, values in get_gl_balances(rollup_company).items():
+			amounts = [values[fieldname] for fieldname in AMOUNT_FIELDS]
+			rows.append((get_rollup_name(key), timestamp, timestamp, user, user, *key, *amounts))
+		frappe.db.bulk_insert("Account Balance Rollup", fields, rows)
+
+		if not frappe.flags.in_test:
+			frappe.db.commit()  # nosemgrep
+
+	if not company:
+		frappe.db.set_single_value("Accounts Settings", "account_balance_rollup_built_on", now())
+
+
+def verify_account_balance_rollup(company) -> list[dict]:
+	"""Compare the rollup of a company with its GL Entries and return the rows that differ."""
+	from erpnext.accounts.utils import get_currency_precision
+
+	precision = get_currency_precision()
+	expected = get_gl_balances(company)
+
+	rollup_rows = frappe.get_all(
+		"Account Balance Rollup",
+		filters={"company": company},
+		fields=[*get_key_fields(), *AMOUNT_FIELDS],
+	)
+	actual = aggregate_balances(rollup_rows)
+
+	mismatches = []
+	zero = dict.fromkeys(AMOUNT_FIELDS, 0.0)
+	for key in expected.keys() | actual.keys():
+		expected_values = expected.get(key, zero)
+		actual_values = actual.get(key, zero)
+		key_values = dict(zip(get_key_fields(), key, strict=True))
+
+		for fieldname in AMOUNT_FIELDS:
+			if flt(expected_values[fieldname], precision) != flt(actual_values[fieldname], precision):
+				mismatches.append(
+					frappe._dict(
+						key_values,
+						fieldname=fieldname,
+						expected=flt(expected_values[fieldname], precision),
+						actual=flt(actual_values[fieldname], precision),
+					)
+				)
+
+	return mismatches
+
+
+def enqueue_rebuild():
+	frappe.enqueue(
+		rebuild_account_balance_rollup,
+		queue="long",
+		timeout=7200,
+		job_id="rebuild_account_balance_rollup",
+		deduplicate=True,
+		enqueue_after_commit=True,
+	)
+	frappe.msgprint(_("Account Balance Rollup will be built in the background."), alert=True)
+
+
+def on_doctype_update():
+	frappe.db.add_index("Account Balance Rollup", ["company", "posting_date"])
+	frappe.db.add_index("Account Balance Rollup", ["account", "posting_date"])
@@ -0,0 +1,71 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase, change_settings
+from frappe.utils import now
+
+from erpnext.accounts.doctype.account_balance_rollup.account_balance_rollup import (
+	get_balance_doctype,
+	rebuild_account_balance_rollup,
+	verify_account_balance_rollup,
+)
+from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+from erpnext.accounts.utils import get_balance_on
+
+
+class TestAccountBalanceRollup(FrappeTestCase):
+	@change_settings("Accounts Settings", {"use_account_balance_rollup": 1})
+	def test_rollup_follows_gl_entries(self):
+		company = "_Test Company"
+		rebuild_account_balance_rollup(company)
+		self.assertEqual(verify_account_balance_rollup(company), [])
+
+		je = make_journal_entry(
+			"_Test Account Cost for Goods Sold - _TC",
+			"_Test Bank - _TC",
+			100,
+			"_Test Cost Center - _TC",
+			submit=True,
+		)
+		self.assertEqual(verify_account_balance_rollup(company), [])
+
+		gl_balance = get_balance_on("_Test Bank - _TC", company=company)
+		frappe.db.set_single_value("Accounts Settings", "account_balance_rollup_built_on", now())
+		self.assertEqual(get_balance_doctype(), "Account Balance Rollup")
+		self.assertEqual(get_balance_on("_Test Bank - _TC", company=company), gl_balance)
+
+		je.cancel()
+		self.assertEqual(verify_account_balance_rollup(company), [])
+		self.assertEqual(get_balance_on("_Test Bank - _TC", company=company), gl_balance + 100)
+
+	@change_settings("Accounts Settings", {"use_account_balance_rollup": 1})
+	def test_postings_spread_over_slots(self):
+		company = "_Test Company"
+		rebuild_account_balance_rollup(company)
+		frappe.db.set_single_value("Accounts Settings", "account_balance_rollup_built_on", now())
+		gl_balance = get_balance_on("_Test Bank - _TC", company=company)
+
+		for slot in (3, 5):
+			with patch(
+				"erpnext.accounts.doctype.account_balance_rollup.account_balance_rollup.random.randrange",
+				return_value=slot,
+			):
+				make_journal_entry(
+					"_Test Account Cost for Goods Sold - _TC",
+					"_Test Bank - _TC",
+					100,
+					"_Test Cost Center - _TC",
+					submit=True,
+				)
+
+		slots = frappe.get_all(
+			"Account Balance Rollup",
+			filters={"account": "_Test Bank - _TC", "posting_date": frappe.utils.nowdate(), "slot": (">", 0)},
+			pluck="slot",
+		)
+		self.assertEqual(sorted(slots), [3, 5])
+		self.assertEqual(verify_account_balance_rollup(company), [])
+		self.assertEqual(get_balance_on("_Test Bank - _TC", company=company), gl_balance - 200)
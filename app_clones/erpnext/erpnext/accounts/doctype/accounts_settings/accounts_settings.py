@@ -10,6 +10,7 @@ from frappe.custom.doctype.property_setter.property_setter import make_property_
 from frappe.model.document import Document
 from frappe.utils import cint
 
+from erpnext.accounts.doctype.account_balance_rollup.account_balance_rollup import enqueue_rebuild
 from erpnext.accounts.utils import sync_auto_reconcile_config
 from erpnext.stock.utils import check_pending_reposting
 
@@ -24,6 +25,7 @@ class AccountsSettings(Document):
 		from frappe.types import DF
 
 		acc_frozen_upto: DF.Date | None
+		account_balance_rollup_built_on: DF.Datetime | None
 		add_taxes_from_item_tax_template: DF.Check
 		add_taxes_from_taxes_and_charges_template: DF.Check
 		allow_multi_currency_invoices_against_single_party_account: DF.Check
@@ -58,8 +60,11 @@ class AccountsSettings(Document):
 		merge_similar_account_heads: DF.Check
 		over_billing_allowance: DF.Currency
 		post_change_gl_entries: DF.Check
-		receivable_payable_fetch_method: DF.Literal["Buffered Cursor", "UnBuffered Cursor"]
+		receivable_payable_fetch_method: DF.Literal[
+			"Buffered Cursor", "UnBuffered Cursor", "Party-wise Stream"
+		]
 		receivable_payable_remarks_length: DF.Int
+		receivable_payable_stream_processes: DF.Int
 		reconciliation_queue_size: DF.Int
 		role_allowed_to_over_bill: DF.Link | None
 		role_to_override_stop_action: DF.Link | None
@@ -72,6 +77,7 @@ class AccountsSettings(Document):
 		submit_journal_entries: DF.Check
 		unlink_advance_payment_on_cancelation_of_order: DF.Check
 		unlink_payment_on_cancellation_of_invoice: DF.Check
+		use_account_balance_rollup: DF.Check
 	# end: auto-generated types
 
 	def validate(self):
@@ -103,6 +109,7 @@ class AccountsSettings(Document):
 			frappe.clear_cache()
 
 		self.validate_and_sync_auto_reconcile_config()
+		self.rebuild_account_balance_rollup()
 
 	def validate_stale_days(self):
 		if not self.allow_stale and cint(self.stale_days) <= 0:
@@ -143,6 +150,15 @@ class AccountsSettings(Document):
 			if cint(self.reconciliation_queue_size) < 5 or cint(self.reconciliation_queue_size) > 100:
 				frappe.throw(_("Queue Size should be between 5 and 100"))
 
+	def rebuild_account_balance_rollup(self):
+		if not self.has_value_changed("use_account_balance_rollup"):
+			return
+
+		# readers fall back to GL Entry until the rebuild is complete
+		self.account_balance_rollup_built_on = None
+		if self.use_account_balance_rollup:
+			enqueue_rebuild()
+
 	def validate_auto_tax_settings(self):
 		if self.add_taxes_from_item_tax_template and self.add_taxes_from_taxes_and_charges_template:
 			frappe.throw(
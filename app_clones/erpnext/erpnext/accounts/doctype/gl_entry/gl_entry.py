@@ -10,6 +10,9 @@ from frappe.model.naming import set_name_from_naming_options
 from frappe.utils import create_batch, flt, fmt_money, now
 
 import erpnext
+from erpnext.accounts.doctype.account_balance_rollup.account_balance_rollup import (
+	update_account_balance_rollup,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_checks_for_pl_and_bs_accounts,
 )
@@ -123,6 +126,10 @@ class GLEntry(Document):
 						self.against_voucher,
 					)
 
+	def on_submit(self):
+		if not self.is_cancelled:
+			update_account_balance_rollup([self])
+
 	def check_mandatory(self):
 		mandatory = ["account", "voucher_type", "voucher_no", "company"]
 		for k in mandatory:
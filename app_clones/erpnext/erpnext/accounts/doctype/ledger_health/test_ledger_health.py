@@ -4,7 +4,7 @@
 import frappe
 from frappe import qb
 from frappe.tests.utils import FrappeTestCase
-from frappe.utils import nowdate
+from frappe.utils import add_to_date, get_datetime, nowdate
 
 from erpnext.accounts.test.accounts_mixin import AccountsTestMixin
 from erpnext.accounts.utils import run_ledger_health_checks
@@ -107,3 +107,69 @@ class TestLedgerHealth(AccountsTestMixin, FrappeTestCase):
 		)
 		self.assertEqual(len(actual), 1)
 		self.assertEqual(expected, actual[0])
+
+	def test_incremental_checks(self):
+		self.create_journal()
+
+		# first run checks the monitored period and sets the watermark
+		run_ledger_health_checks()
+		checked_up_to = frappe.db.get_single_value("Ledger Health Monitor", "checked_up_to")
+		self.assertIsNotNone(checked_up_to)
+		self.assertEqual(frappe.db.count("Ledger Health"), 0)
+
+		# a voucher whose ledger entries changed since is checked in the next run
+		gle = frappe.db.get_all(
+			"GL Entry", filters={"voucher_no": self.je.name, "account": self.income_account}
+		)[0]
+		frappe.db.set_value("GL Entry", gle.name, "credit", 8000)
+
+		run_ledger_health_checks()
+		self.assertGreaterEqual(
+			frappe.db.get_single_value("Ledger Health Monitor", "checked_up_to"), checked_up_to
+		)
+		actual = frappe.db.get_all(
+			"Ledger Health",
+			filters={"voucher_no": self.je.name},
+			fields=["voucher_no", "debit_credit_mismatch"],
+		)
+		self.assertEqual(actual, [{"voucher_no": self.je.name, "debit_credit_mismatch": 1}])
+
+		# it is checked again while in the overlap between runs, but reported only once
+		run_ledger_health_checks()
+		self.assertEqual(frappe.db.count("Ledger Health"), 1)
+
+		# changing what is monitored checks the whole period again
+		monitor_settings = frappe.get_doc("Ledger Health Monitor")
+		monitor_settings.general_and_payment_ledger_mismatch = False
+		monitor_settings.save()
+		self.assertIsNone(frappe.db.get_single_value("Ledger Health Monitor", "checked_up_to"))
+
+	def test_periodic_full_check(self):
+		self.create_journal()
+		run_ledger_health_checks()
+		self.assertEqual(frappe.db.count("Ledger Health"), 0)
+
+		# a change that doesn't update `modified` is not found by incremental checks
+		gle = qb.DocType("GL Entry")
+		qb.update(gle).set(gle.credit, 8000).where(
+			(gle.voucher_no == self.je.name) & (gle.account == self.income_account)
+		).run()
+		run_ledger_health_checks()
+		self.assertEqual(frappe.db.count("Ledger Health"), 0)
+
+		# but by the next full check
+		last_full_check_on = frappe.db.get_single_value("Ledger Health Monitor", "last_full_check_on")
+		frappe.db.set_single_value(
+			"Ledger Health Monitor", "last_full_check_on", add_to_date(last_full_check_on, days=-1)
+		)
+		run_ledger_health_checks()
+		actual = frappe.db.get_all(
+			"Ledger Health",
+			filters={"voucher_no": self.je.name},
+			fields=["voucher_no", "debit_credit_mismatch"],
+		)
+		self.assertEqual(actual, [{"voucher_no": self.je.name, "debit_credit_mismatch": 1}])
+		self.assertGreater(
+			get_datetime(frappe.db.get_single_value("Ledger Health Monitor", "last_full_check_on")),
+			get_datetime(last_full_check_on),
+		)
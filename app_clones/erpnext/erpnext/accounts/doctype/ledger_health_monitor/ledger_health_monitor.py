@@ -1,7 +1,6 @@
 # Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
 
-# import frappe
 from frappe.model.document import Document
 
 
@@ -18,11 +17,32 @@ class LedgerHealthMonitor(Document):
 			LedgerHealthMonitorCompany,
 		)
 
+		checked_up_to: DF.Datetime | None
 		companies: DF.Table[LedgerHealthMonitorCompany]
 		debit_credit_mismatch: DF.Check
 		enable_health_monitor: DF.Check
 		general_and_payment_ledger_mismatch: DF.Check
+		last_full_check_on: DF.Datetime | None
 		monitor_for_last_x_days: DF.Int
 	# end: auto-generated types
 
-	pass
+	def validate(self):
+		self.reset_checked_up_to()
+
+	def reset_checked_up_to(self):
+		"""Check the whole monitored period again in the next run if what is monitored has changed"""
+		doc_before_save = self.get_doc_before_save()
+		if not doc_before_save:
+			return
+
+		fields = [
+			"enable_health_monitor",
+			"monitor_for_last_x_days",
+			"debit_credit_mismatch",
+			"general_and_payment_ledger_mismatch",
+		]
+		companies_changed = {x.company for x in self.companies} != {
+			x.company for x in doc_before_save.companies
+		}
+		if companies_changed or any(self.has_value_changed(field) for field in fields):
+			self.checked_up_to = None
@@ -434,9 +434,20 @@ class PaymentReconciliation(Document):
 		)
 
 		entries = []
+		invoices = args.get("invoices")
+		# invoices before `inv_idx` have been fully allocated by earlier payments and are not revisited,
+		# which keeps the FIFO allocation linear in the number of payments and invoices
+		inv_idx = 0
 		for pay in args.get("payments"):
 			pay.update({"unreconciled_amount": pay.get("amount")})
-			for inv in args.get("invoices"):
+			while inv_idx < len(invoices) and invoices[inv_idx].get("outstanding_amount") == 0:
+				inv_idx += 1
+
+			for idx in range(inv_idx, len(invoices)):
+				inv = invoices[idx]
+				if inv.get("outstanding_amount") == 0:
+					continue
+
 				if pay.get("amount") >= inv.get("outstanding_amount"):
 					res = self.get_allocated_entry(pay, inv, inv["outstanding_amount"])
 					pay["amount"] = flt(pay.get("amount")) - flt(inv.get("outstanding_amount"))
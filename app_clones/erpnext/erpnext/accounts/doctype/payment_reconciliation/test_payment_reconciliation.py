@@ -1,6 +1,7 @@
 # Copyright (c) 2021, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
+from unittest.mock import patch
 
 import frappe
 from frappe import qb
@@ -2145,6 +2146,76 @@ class TestPaymentReconciliation(FrappeTestCase):
 		self.assertEqual(len(pr.get("payments")), 0)
 		self.assertEqual(pr.get("invoices")[0].get("outstanding_amount"), 200)
 
+	def test_fifo_allocation_of_multiple_payments(self):
+		for _i in range(3):
+			self.create_sales_invoice(qty=1, rate=100)
+		for _i in range(2):
+			self.create_payment_entry(amount=150).save().submit()
+
+		pr = self.create_payment_reconciliation()
+		pr.get_unreconciled_entries()
+		invoices = [x.as_dict() for x in pr.get("invoices")]
+		payments = [x.as_dict() for x in pr.get("payments")]
+		pr.allocate_entries(frappe._dict({"invoices": invoices, "payments": payments}))
+
+		# the second payment is split across the invoice left partly paid by the first one and the next invoice
+		self.assertEqual(len(pr.allocation), 4)
+		allocated_per_invoice, allocated_per_payment = {}, {}
+		for row in pr.allocation:
+			allocated_per_invoice.setdefault(row.invoice_number, 0)
+			allocated_per_invoice[row.invoice_number] += row.allocated_amount
+			allocated_per_payment.setdefault(row.reference_name, 0)
+			allocated_per_payment[row.reference_name] += row.allocated_amount
+		self.assertEqual(sorted(allocated_per_invoice.values()), [100, 100, 100])
+		self.assertEqual(sorted(allocated_per_payment.values()), [150, 150])
+
+		pr.reconcile()
+		self.assertEqual(pr.get("invoices"), [])
+		self.assertEqual(pr.get("payments"), [])
+
+	def test_process_payment_reconciliation_in_chunks(self):
+		from erpnext.accounts.doctype.process_payment_reconciliation import (
+			process_payment_reconciliation as process_pr,
+		)
+
+		invoices = [self.create_sales_invoice(qty=1, rate=100) for _i in range(3)]
+		for _i in range(3):
+			self.create_payment_entry(amount=100).save().submit()
+
+		ppr = frappe.get_doc(
+			{
+				"doctype": "Process Payment Reconciliation",
+				"company": self.company,
+				"party_type": "Customer",
+				"party": self.customer,
+				"receivable_payable_account": self.debit_to,
+				"default_advance_account": self.advance_receivable_account,
+			}
+		).submit()
+
+		with patch.object(process_pr, "ENTRIES_PER_CHUNK", 2):
+			process_pr.reconcile_based_on_filters(ppr.name)
+			log = frappe.get_doc("Process Payment Reconciliation Log", {"process_pr": ppr.name})
+
+			# first chunk of 2 invoices and payments, the next one is fetched once these are reconciled
+			process_pr.fetch_and_allocate(ppr.name)
+			log.reload()
+			self.assertEqual((log.fetched_chunks, log.total_allocations, log.fetch_next_chunk), (1, 2, 1))
+
+			process_pr.reconcile(ppr.name)
+			log.reload()
+			self.assertEqual((log.reconciled_entries, log.allocated), (2, 0))
+
+			process_pr.fetch_and_allocate(ppr.name)
+			process_pr.reconcile(ppr.name)
+			log.reload()
+			self.assertEqual((log.fetched_chunks, log.total_allocations, log.reconciled_entries), (2, 3, 3))
+			self.assertTrue(log.reconciled)
+			self.assertEqual(frappe.db.get_value(ppr.doctype, ppr.name, "status"), "Completed")
+
+		for si in invoices:
+			self.assertEqual(frappe.db.get_value("Sales Invoice", si.name, "outstanding_amount"), 0)
+
 
 def make_customer(customer_name, currency=None):
 	if not frappe.db.exists("Customer", customer_name):
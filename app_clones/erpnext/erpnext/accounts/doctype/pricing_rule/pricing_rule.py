@@ -340,6 +340,7 @@ def apply_pricing_rule(args, doc=None):
 	        "ignore_pricing_rule": "something"
 	}
 	"""
+	from erpnext.accounts.doctype.pricing_rule.utils import get_pricing_rule_index
 
 	if isinstance(args, str):
 		args = json.loads(args)
@@ -369,11 +370,23 @@ def apply_pricing_rule(args, doc=None):
 	for item_code, val in query_items:
 		serialized_items.setdefault(item_code, val)
 
+	items_args = []
 	for item in item_list:
 		args_copy = copy.deepcopy(args)
 		args_copy.update(item)
-		data = get_pricing_rule_for_item(args_copy, doc=doc)
-		out.append(data)
+		items_args.append(args_copy)
+
+	frappe.flags.pricing_rule_index = (
+		get_pricing_rule_index(items_args, ignore_pricing_rule=args.ignore_pricing_rule)
+		if len(items_args) > 1
+		else None
+	)
+	try:
+		for args_copy in items_args:
+			data = get_pricing_rule_for_item(args_copy, doc=doc)
+			out.append(data)
+	finally:
+		frappe.flags.pricing_rule_index = None
 
 	return out
 
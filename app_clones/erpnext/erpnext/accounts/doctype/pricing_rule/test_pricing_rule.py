@@ -3,6 +3,7 @@
 
 
 import unittest
+from unittest.mock import patch
 
 import frappe
 from frappe.tests.utils import FrappeTestCase, change_settings
@@ -1520,6 +1521,60 @@ class TestPricingRule(FrappeTestCase):
 		debit_note.delete()
 		pi.cancel()
 
+	def test_pricing_rule_index(self):
+		from erpnext.accounts.doctype.pricing_rule.pricing_rule import update_args_for_pricing_rule
+		from erpnext.accounts.doctype.pricing_rule.utils import PricingRuleIndex, get_pricing_rules
+
+		for apply_on, value, priority in (
+			("Item Code", "_Test Item", 1),
+			("Item Group", "_Test Item Group", 2),
+			("Item Group", "All Item Groups", 3),
+		):
+			make_pricing_rule(
+				title=f"_Test Pricing Rule {value}",
+				selling=1,
+				apply_on=apply_on,
+				**{frappe.scrub(apply_on): value},
+				discount_percentage=priority * 5,
+				priority=priority,
+				apply_multiple_pricing_rules=1,
+			)
+
+		items_args = []
+		for item_code in ("_Test Item", "_Test Item 2", "_Test Item Home Desktop 100"):
+			args = frappe._dict(
+				item_code=item_code,
+				company="_Test Company",
+				doctype="Sales Invoice",
+				transaction_type="selling",
+				currency="INR",
+				qty=1,
+				stock_qty=1,
+			)
+			update_args_for_pricing_rule(args)
+			items_args.append(args)
+
+		expected = [get_pricing_rules(frappe._dict(args)) for args in items_args]
+
+		frappe.flags.pricing_rule_index = PricingRuleIndex(items_args)
+		try:
+			self.assertEqual([get_pricing_rules(frappe._dict(args)) for args in items_args], expected)
+			self.assertTrue(frappe.flags.pricing_rule_index.pricing_rules)
+		finally:
+			frappe.flags.pricing_rule_index = None
+
+	def test_pricing_rule_index_only_built_if_needed(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import PricingRuleIndex, get_pricing_rule_index
+
+		make_pricing_rule(title="_Test Pricing Rule Index", selling=1, discount_percentage=5)
+		items_args = [frappe._dict(item_code="_Test Item", company="_Test Company")]
+
+		self.assertIsInstance(get_pricing_rule_index(items_args), PricingRuleIndex)
+		self.assertIsNone(get_pricing_rule_index(items_args, ignore_pricing_rule=1))
+
+		with patch.object(frappe.db, "exists", return_value=None):
+			self.assertIsNone(get_pricing_rule_index(items_args))
+
 
 test_dependencies = ["Campaign"]
 
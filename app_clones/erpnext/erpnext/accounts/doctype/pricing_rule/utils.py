@@ -10,7 +10,7 @@ import math
 
 import frappe
 from frappe import _, bold
-from frappe.utils import cint, flt, fmt_money, get_link_to_form, getdate, today
+from frappe.utils import cint, cstr, flt, fmt_money, get_link_to_form, getdate, today
 
 from erpnext.setup.doctype.item_group.item_group import get_child_item_groups
 from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
@@ -143,6 +143,11 @@ def _get_pricing_rules(apply_on, args, values):
 	conditions += " and ifnull(`tabPricing Rule`.for_price_list, '') in (%(price_list)s, '')"
 	values["price_list"] = args.get("price_list")
 
+	if frappe.flags.pricing_rule_index:
+		pricing_rules = frappe.flags.pricing_rule_index.get_pricing_rules(apply_on, args, conditions, values)
+		if pricing_rules is not None:
+			return pricing_rules
+
 	pricing_rules = (
 		frappe.db.sql(
 			"""select `tabPricing Rule`.*,
@@ -191,29 +196,7 @@ def _get_tree_conditions(args, parenttype, table, allow_blank=True):
 		if key in frappe.flags.tree_conditions:
 			return frappe.flags.tree_conditions[key]
 
-		try:
-			lft, rgt = frappe.db.get_value(parenttype, args.get(field), ["lft", "rgt"])
-		except TypeError:
-			frappe.throw(_("Invalid {0}").format(args.get(field)))
-
-		parent_groups = frappe.db.sql_list(
-			"""select name from `tab{}`
-			where lft<={} and rgt>={}""".format(parenttype, "%s", "%s"),
-			(lft, rgt),
-		)
-
-		if parenttype in ["Customer Group", "Item Group", "Territory"]:
-			parent_field = f"parent_{frappe.scrub(parenttype)}"
-			root_name = frappe.db.get_list(
-				parenttype,
-				{"is_group": 1, parent_field: ("is", "not set")},
-				"name",
-				as_list=1,
-				ignore_permissions=True,
-			)
-
-			if root_name and root_name[0][0]:
-				parent_groups.append(root_name[0][0])
+		parent_groups = get_tree_ancestors(parenttype, args.get(field))
 
 		if parent_groups:
 			if allow_blank:
@@ -230,6 +213,184 @@ def _get_tree_conditions(args, parenttype, table, allow_blank=True):
 	return condition
 
 
+def get_tree_ancestors(parenttype, name):
+	"""Returns the node and its ancestors, and the root group for group trees."""
+	try:
+		lft, rgt = frappe.db.get_value(parenttype, name, ["lft", "rgt"])
+	except TypeError:
+		frappe.throw(_("Invalid {0}").format(name))
+
+	parent_groups = frappe.db.sql_list(
+		"""select name from `tab{}`
+		where lft<={} and rgt>={}""".format(parenttype, "%s", "%s"),
+		(lft, rgt),
+	)
+
+	if parenttype in ["Customer Group", "Item Group", "Territory"]:
+		parent_field = f"parent_{frappe.scrub(parenttype)}"
+		root_name = frappe.db.get_list(
+			parenttype,
+			{"is_group": 1, parent_field: ("is", "not set")},
+			"name",
+			as_list=1,
+			ignore_permissions=True,
+		)
+
+		if root_name and root_name[0][0]:
+			parent_groups.append(root_name[0][0])
+
+	return parent_groups
+
+
+def get_pricing_rule_index(items_args, ignore_pricing_rule=False):
+	"""Returns a `PricingRuleIndex` for the items, `None` if pricing rules won't be looked up."""
+	if ignore_pricing_rule or not frappe.db.exists("Pricing Rule", {"disable": 0}):
+		return None
+
+	return PricingRuleIndex(items_args)
+
+
+class PricingRuleIndex:
+	"""Pricing rules that can apply to the items of a transaction.
+
+	Instead of querying pricing rules for every item and `apply_on`, rules for all the items
+	are fetched with a query per `apply_on` (for the same transaction level conditions), and
+	rules of an item are picked from them with the item level conditions of `_get_pricing_rules`.
+	Items that weren't known when the index was built are left to `_get_pricing_rules`.
+
+	Set as `frappe.flags.pricing_rule_index` while items of a transaction are processed.
+	"""
+
+	def __init__(self, items_args):
+		# keys of indexed values, mapped to the values
+		self.values = {field: {} for field in ("item_code", "item_group", "brand")}
+		self.other_values = {field: {} for field in ("item_code", "item_group", "brand")}
+		self.pricing_rules = {}
+		self.ancestors = {}
+
+		for args in items_args:
+			if not args.get("item_code"):
+				continue
+
+			item = frappe.get_cached_value(
+				"Item", args.get("item_code"), ("item_group", "brand", "variant_of"), as_dict=True
+			)
+			if not item:
+				continue
+
+			# same as `update_args_for_pricing_rule`
+			if args.get("item_group") and args.get("brand"):
+				item_group, brand = args.get("item_group"), args.get("brand")
+			else:
+				item_group, brand = item.item_group, item.brand
+
+			variant_of = args.get("variant_of") if "variant_of" in args else item.variant_of
+
+			self.add_values("item_code", [args.get("item_code"), variant_of], args.get("item_code"))
+			self.add_values("brand", [brand], brand)
+			if item_group and frappe.db.exists("Item Group", item_group, cache=True):
+				self.add_values("item_group", self.get_ancestors("Item Group", item_group), item_group)
+
+	def add_values(self, field, values, other_value):
+		for value in values:
+			if value:
+				self.values[field][get_index_key(value)] = value
+
+		if other_value:
+			self.other_values[field][get_index_key(other_value)] = other_value
+
+	def get_ancestors(self, parenttype, name):
+		key = (parenttype, name)
+		if key not in self.ancestors:
+			self.ancestors[key] = get_tree_ancestors(parenttype, name)
+		return self.ancestors[key]
+
+	def get_pricing_rules(self, apply_on, args, conditions, values):
+		"""Returns the same pricing rules as `_get_pricing_rules`, `None` if the item isn't indexed."""
+		field = frappe.scrub(apply_on)
+		value = get_index_key(args.get(field))
+		variant_of = get_index_key(args.variant_of) if field == "item_code" and args.variant_of else None
+
+		if field == "item_group":
+			item_values = {get_index_key(d) for d in self.get_ancestors("Item Group", args.get(field))}
+		else:
+			item_values = {value, variant_of} - {None}
+
+		if not item_values.issubset(self.values[field]) or value not in self.other_values[field]:
+			return None
+
+		warehouses = {""}
+		if warehouse := args.get("warehouse"):
+			warehouses.update(get_index_key(d) for d in self.get_ancestors("Warehouse", warehouse))
+
+		uom = get_index_key(args.get("uom"))
+		other_field = f"other_{field}"
+
+		pricing_rules = []
+		indexed_pricing_rules = self.get_indexed_pricing_rules(
+			apply_on, args.transaction_type, conditions, values
+		)
+		for pricing_rule in indexed_pricing_rules:
+			if get_index_key(pricing_rule.warehouse) not in warehouses:
+				continue
+
+			rule_value = get_index_key(pricing_rule.get(field))
+			if field == "item_group":
+				applies_to_item = rule_value in item_values
+			else:
+				applies_to_item = rule_value == value
+
+			if applies_to_item and uom and field != "brand":
+				applies_to_item = get_index_key(pricing_rule.uom) in (uom, "")
+
+			if (
+				applies_to_item
+				or (
+					pricing_rule.apply_rule_on_other is not None
+					and get_index_key(pricing_rule.get(other_field)) == value
+				)
+				or (variant_of and rule_value == variant_of)
+			):
+				pricing_rules.append(pricing_rule.copy())
+
+		return pricing_rules
+
+	def get_indexed_pricing_rules(self, apply_on, transaction_type, conditions, values):
+		field = frappe.scrub(apply_on)
+		transaction_values = {k: v for k, v in values.items() if k not in self.values and k != "variant_of"}
+		key = (apply_on, transaction_type, conditions, tuple(sorted(transaction_values.items())))
+
+		if key not in self.pricing_rules:
+			child_doc = f"`tabPricing Rule {apply_on}`"
+			self.pricing_rules[key] = frappe.db.sql(
+				f"""select `tabPricing Rule`.*,
+					{child_doc}.{field}, {child_doc}.uom
+				from `tabPricing Rule`, {child_doc}
+				where ({child_doc}.{field} in %(index_values)s
+					or (`tabPricing Rule`.apply_rule_on_other is not null
+					and `tabPricing Rule`.other_{field} in %(index_other_values)s))
+					and {child_doc}.parent = `tabPricing Rule`.name
+					and `tabPricing Rule`.disable = 0 and
+					`tabPricing Rule`.{transaction_type} = 1 {conditions}
+				order by `tabPricing Rule`.priority desc,
+					`tabPricing Rule`.name desc""",
+				{
+					**transaction_values,
+					"index_values": tuple(self.values[field].values()) or ("",),
+					"index_other_values": tuple(self.other_values[field].values()) or ("",),
+				},
+				as_dict=1,
+			)
+
+		return self.pricing_rules[key]
+
+
+def get_index_key(value):
+	# MariaDB compares names case insensitively
+	value = cstr(value)
+	return value.casefold() if frappe.db.db_type == "mariadb" else value
+
+
 def get_other_conditions(conditions, values, args):
 	for field in ["company", "customer", "supplier", "campaign", "sales_partner"]:
 		if args.get(field):
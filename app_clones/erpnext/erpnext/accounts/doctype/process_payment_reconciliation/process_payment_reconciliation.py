@@ -6,9 +6,14 @@ import json
 import frappe
 from frappe import _, qb
 from frappe.model.document import Document
-from frappe.utils import get_link_to_form
+from frappe.utils import cint, flt, get_link_to_form, now, time_diff_in_seconds
 from frappe.utils.scheduler import is_scheduler_inactive
 
+# Invoices and Payments fetched and allocated at a time
+ENTRIES_PER_CHUNK = 1000
+# Payments reconciled by a single background job before the next one is enqueued
+RECONCILIATION_BATCH_SIZE = 25
+
 
 class ProcessPaymentReconciliation(Document):
 	# begin: auto-generated types
@@ -112,8 +117,8 @@ def get_pr_instance(doc: str):
 	for field in fields:
 		d[field] = process_payment_reconciliation.get(field)
 	pr.update(d)
-	pr.invoice_limit = 1000
-	pr.payment_limit = 1000
+	pr.invoice_limit = ENTRIES_PER_CHUNK
+	pr.payment_limit = ENTRIES_PER_CHUNK
 	return pr
 
 
@@ -334,6 +339,9 @@ def get_next_allocation(log: str) -> list:
 def fetch_and_allocate(doc: str) -> None:
 	"""
 	Fetch Invoices and Payments based on filters applied. FIFO ordering is used for allocation.
+
+	Entries are fetched in chunks of the PR instance's limits. Once a chunk is reconciled, the next one
+	is fetched and allocated, until a chunk allocates nothing or doesn't hit the limits.
 	"""
 
 	if doc:
@@ -345,27 +353,45 @@ def fetch_and_allocate(doc: str) -> None:
 				pr = get_pr_instance(doc)
 				pr.get_unreconciled_entries()
 
+				allocations = []
 				if len(pr.invoices) > 0 and len(pr.payments) > 0:
 					invoices = [x.as_dict() for x in pr.invoices]
 					payments = [x.as_dict() for x in pr.payments]
 					pr.allocate_entries(frappe._dict({"invoices": invoices, "payments": payments}))
 
 					for x in pr.get("allocation"):
-						reconcile_log.append(
-							"allocations",
-							x.as_dict().update(
-								{
-									"parenttype": "Process Payment Reconciliation Log",
-									"parent": reconcile_log.name,
-									"name": None,
-									"reconciled": False,
-								}
-							),
+						allocations.append(
+							reconcile_log.append(
+								"allocations",
+								x.as_dict().update(
+									{
+										"parenttype": "Process Payment Reconciliation Log",
+										"parent": reconcile_log.name,
+										"name": None,
+										"idx": None,
+										"reconciled": False,
+									}
+								),
+							)
 						)
-				reconcile_log.allocated = True
-				reconcile_log.total_allocations = len(reconcile_log.get("allocations"))
-				reconcile_log.reconciled_entries = 0
-				reconcile_log.save()
+
+				# allocations of earlier chunks are already saved, only the new ones are inserted
+				for allocation in allocations:
+					allocation.db_insert()
+
+				frappe.db.set_value(
+					"Process Payment Reconciliation Log",
+					log,
+					{
+						"allocated": True,
+						"total_allocations": len(reconcile_log.get("allocations")),
+						"reconciled_entries": cint(reconcile_log.reconciled_entries),
+						"fetched_chunks": cint(reconcile_log.fetched_chunks) + 1,
+						"fetch_next_chunk": bool(allocations)
+						and (len(pr.invoices) >= pr.invoice_limit or len(pr.payments) >= pr.payment_limit),
+						"started_on": reconcile_log.started_on or now(),
+					},
+				)
 
 				# generate reconcile job name
 				allocation = get_next_allocation(log)
@@ -388,59 +414,114 @@ def fetch_and_allocate(doc: str) -> None:
 					)
 
 
+def get_reconciliation_progress(log: str) -> tuple[int, int]:
+	res = frappe.get_all(
+		"Process Payment Reconciliation Log",
+		filters={"name": log},
+		fields=["reconciled_entries", "total_allocations"],
+		as_list=1,
+		limit=1,
+	)
+	return res[0]
+
+
+def reconcile_payment_allocations(doc: str, log: str, allocations: list) -> None:
+	"""
+	Reconcile the allocations of a single payment and mark them as reconciled in the log
+	"""
+	pr = get_pr_instance(doc)
+
+	# pass allocation to PR instance
+	for x in allocations:
+		pr.append("allocation", x)
+
+	# reconcile
+	pr.reconcile_allocations(skip_ref_details_update_for_pe=True)
+
+	# If Payment Entry, update details only for newly linked references
+	# This is for performance
+	if allocations[0].reference_type == "Payment Entry":
+		references = [(x.invoice_type, x.invoice_number) for x in allocations]
+		pe = frappe.get_doc(allocations[0].reference_type, allocations[0].reference_name)
+		pe.flags.ignore_validate_update_after_submit = True
+		pe.set_missing_ref_details(update_ref_details_only_for=references)
+		pe.save()
+
+	# Update reconciled flag
+	allocation_names = [x.name for x in allocations]
+	ppa = qb.DocType("Process Payment Reconciliation Log Allocations")
+	qb.update(ppa).set(ppa.reconciled, True).where(ppa.name.isin(allocation_names)).run()
+
+	# Update reconciled count and throughput
+	reconciled_count = frappe.db.count(
+		"Process Payment Reconciliation Log Allocations",
+		filters={"parent": log, "reconciled": True},
+	)
+	started_on = frappe.db.get_value("Process Payment Reconciliation Log", log, "started_on")
+	minutes = time_diff_in_seconds(now(), started_on) / 60 if started_on else 0
+	frappe.db.set_value(
+		"Process Payment Reconciliation Log",
+		log,
+		{
+			"reconciled_entries": reconciled_count,
+			"reconciled_per_minute": flt(reconciled_count / minutes, 2) if minutes else 0,
+		},
+	)
+
+
+def complete_reconciliation(doc: str, log: str) -> None:
+	"""
+	Mark the process as completed, or fetch and allocate the next chunk of entries if there may be more
+	"""
+	if frappe.db.get_value("Process Payment Reconciliation Log", log, "fetch_next_chunk"):
+		frappe.db.set_value(
+			"Process Payment Reconciliation Log", log, {"allocated": False, "fetch_next_chunk": False}
+		)
+
+		job_name = f"process_{doc}_fetch_and_allocate"
+		if not is_job_running(job_name):
+			frappe.enqueue(
+				method="erpnext.accounts.doctype.process_payment_reconciliation.process_payment_reconciliation.fetch_and_allocate",
+				queue="long",
+				timeout="3600",
+				is_async=True,
+				job_name=job_name,
+				enqueue_after_commit=True,
+				doc=doc,
+			)
+		return
+
+	frappe.db.set_value("Process Payment Reconciliation Log", log, "status", "Reconciled")
+	frappe.db.set_value("Process Payment Reconciliation Log", log, "reconciled", True)
+	frappe.db.set_value("Process Payment Reconciliation", doc, "status", "Completed")
+
+
 def reconcile(doc: None | str = None) -> None:
 	if doc:
 		log = frappe.db.get_value("Process Payment Reconciliation Log", filters={"process_pr": doc})
 		if log:
-			res = frappe.get_all(
-				"Process Payment Reconciliation Log",
-				filters={"name": log},
-				fields=["reconciled_entries", "total_allocations"],
-				as_list=1,
-				limit=1,
-			)
-
-			reconciled_entries, total_allocations = res[0]
+			reconciled_entries, total_allocations = get_reconciliation_progress(log)
 			if reconciled_entries != total_allocations:
 				try:
-					# Fetch next allocation
-					allocations = get_next_allocation(log)
-
-					pr = get_pr_instance(doc)
-
-					# pass allocation to PR instance
-					for x in allocations:
-						pr.append("allocation", x)
-
-					# reconcile
-					pr.reconcile_allocations(skip_ref_details_update_for_pe=True)
-
-					# If Payment Entry, update details only for newly linked references
-					# This is for performance
-					if allocations[0].reference_type == "Payment Entry":
-						references = [(x.invoice_type, x.invoice_number) for x in allocations]
-						pe = frappe.get_doc(allocations[0].reference_type, allocations[0].reference_name)
-						pe.flags.ignore_validate_update_after_submit = True
-						pe.set_missing_ref_details(update_ref_details_only_for=references)
-						pe.save()
-
-					# Update reconciled flag
-					allocation_names = [x.name for x in allocations]
-					ppa = qb.DocType("Process Payment Reconciliation Log Allocations")
-					qb.update(ppa).set(ppa.reconciled, True).where(ppa.name.isin(allocation_names)).run()
-
-					# Update reconciled count
-					reconciled_count = frappe.db.count(
-						"Process Payment Reconciliation Log Allocations",
-						filters={"parent": log, "reconciled": True},
-					)
-					frappe.db.set_value(
-						"Process Payment Reconciliation Log", log, "reconciled_entries", reconciled_count
-					)
+					# Reconcile a batch of payments in a single job, committing after each payment so that
+					# a failure or a pause only loses the payment being reconciled
+					for _payment in range(RECONCILIATION_BATCH_SIZE):
+						# Fetch next allocation
+						allocations = get_next_allocation(log)
+						if not allocations:
+							break
+
+						reconcile_payment_allocations(doc, log, allocations)
+						if not frappe.flags.in_test:
+							frappe.db.commit()  # nosemgrep
+
+						if frappe.db.get_value("Process Payment Reconciliation", doc, "status") == "Paused":
+							break
 
 				except Exception:
 					# Update the parent doc about the exception
 					frappe.db.rollback()
+					reconciled_entries, total_allocations = get_reconciliation_progress(log)
 
 					traceback = frappe.get_traceback(with_context=True)
 					if traceback:
@@ -471,10 +552,9 @@ def reconcile(doc: None | str = None) -> None:
 							"Failed",
 						)
 				finally:
+					reconciled_entries, total_allocations = get_reconciliation_progress(log)
 					if reconciled_entries == total_allocations:
-						frappe.db.set_value("Process Payment Reconciliation Log", log, "status", "Reconciled")
-						frappe.db.set_value("Process Payment Reconciliation Log", log, "reconciled", True)
-						frappe.db.set_value("Process Payment Reconciliation", doc, "status", "Completed")
+						complete_reconciliation(doc, log)
 					else:
 						if not (
 							frappe.db.get_value("Process Payment Reconciliation", doc, "status") == "Paused"
@@ -498,9 +578,7 @@ def reconcile(doc: None | str = None) -> None:
 									doc=doc,
 								)
 			else:
-				frappe.db.set_value("Process Payment Reconciliation Log", log, "status", "Reconciled")
-				frappe.db.set_value("Process Payment Reconciliation Log", log, "reconciled", True)
-				frappe.db.set_value("Process Payment Reconciliation", doc, "status", "Completed")
+				complete_reconciliation(doc, log)
 
 
 @frappe.whitelist()
@@ -21,9 +21,13 @@ class ProcessPaymentReconciliationLog(Document):
 		allocated: DF.Check
 		allocations: DF.Table[ProcessPaymentReconciliationLogAllocations]
 		error_log: DF.LongText | None
+		fetch_next_chunk: DF.Check
+		fetched_chunks: DF.Int
 		process_pr: DF.Link
 		reconciled: DF.Check
 		reconciled_entries: DF.Int
+		reconciled_per_minute: DF.Float
+		started_on: DF.Datetime | None
 		status: DF.Literal["Running", "Paused", "Reconciled", "Partially Reconciled", "Failed", "Cancelled"]
 		total_allocations: DF.Int
 	# end: auto-generated types
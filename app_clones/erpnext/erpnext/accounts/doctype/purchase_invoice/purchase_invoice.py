@@ -6,10 +6,13 @@ import frappe
 from frappe import _, qb, throw
 from frappe.model.mapper import get_mapped_doc
 from frappe.query_builder.functions import Sum
-from frappe.utils import cint, cstr, flt, formatdate, get_link_to_form, getdate, nowdate
+from frappe.utils import cint, cstr, flt, formatdate, get_link_to_form, getdate, now, nowdate
 
 import erpnext
 from erpnext.accounts.deferred_revenue import validate_service_stop_date
+from erpnext.accounts.doctype.account_balance_rollup.account_balance_rollup import (
+	remove_vouchers_from_account_balance_rollup,
+)
 from erpnext.accounts.doctype.repost_accounting_ledger.repost_accounting_ledger import (
 	validate_docs_for_deferred_accounting,
 	validate_docs_for_voucher_types,
@@ -826,9 +829,13 @@ class PurchaseInvoice(BuyingController):
 		if rows:
 			# cancel gl entries
 			gle = qb.DocType("GL Entry")
+			remove_vouchers_from_account_balance_rollup(
+				"Purchase Receipt", list(purchase_receipts), voucher_detail_nos=list(rows)
+			)
 			gle_update_query = (
 				qb.update(gle)
 				.set(gle.is_cancelled, 1)
+				.set(gle.modified, now())
 				.where(
 					(gle.voucher_type == "Purchase Receipt")
 					& (gle.voucher_no.isin(purchase_receipts))
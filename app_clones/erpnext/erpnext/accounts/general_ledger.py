@@ -10,6 +10,10 @@ from frappe.model.meta import get_field_precision
 from frappe.utils import cint, flt, formatdate, get_link_to_form, getdate, now
 
 import erpnext
+from erpnext.accounts.doctype.account_balance_rollup.account_balance_rollup import (
+	remove_vouchers_from_account_balance_rollup,
+	update_account_balance_rollup,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 )
@@ -688,6 +692,7 @@ def make_reverse_gl_entries(
 
 				if not immutable_ledger_enabled:
 					query = query.set(gle.is_cancelled, True)
+					update_account_balance_rollup([x], cancel=True)
 
 				query.run()
 		else:
@@ -698,6 +703,9 @@ def make_reverse_gl_entries(
 				if not all(gle_names):
 					set_as_cancel(gl_entries[0]["voucher_type"], gl_entries[0]["voucher_no"])
 				else:
+					update_account_balance_rollup(
+						[x for x in gl_entries if not x.get("is_cancelled")], cancel=True
+					)
 					frappe.db.sql(
 						"""UPDATE `tabGL Entry` SET is_cancelled = 1,
 						modified=%s, modified_by=%s
@@ -780,6 +788,7 @@ def set_as_cancel(voucher_type, voucher_no):
 	"""
 	Set is_cancelled=1 in all original gl entries for the voucher
 	"""
+	remove_vouchers_from_account_balance_rollup(voucher_type, voucher_no)
 	frappe.db.sql(
 		"""UPDATE `tabGL Entry` SET is_cancelled = 1,
 		modified=%s, modified_by=%s
@@ -2,7 +2,11 @@
 # License: GNU General Public License v3. See license.txt
 
 
+import copy
+import itertools
+import multiprocessing
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
 import frappe
 from frappe import _, qb, query_builder, scrub
@@ -35,6 +39,12 @@ from erpnext.accounts.utils import (
 #  8. Invoice details like Sales Persons, Delivery Notes are also fetched comma separated
 #  9. Report amounts are in party currency if in_party_currency is selected, otherwise company currency
 # 10. This report is based on Payment Ledger Entries
+# 11. With the "Party-wise Stream" fetch method, ledger entries are processed a chunk of parties at a time
+#     (optionally in parallel processes), so only the balances of those parties are held in memory
+
+PARTY_CHUNK_SIZE = 1000
+# prepared once for the report and shared with the processes building chunks of parties
+SHARED_REPORT_DATA = ("sales_person_records", "future_payments", "return_entries", "err_journals")
 
 
 def execute(filters=None):
@@ -69,6 +79,8 @@ class ReceivablePayableReport:
 		self.advance_payment_doctypes = get_advance_payment_doctypes()
 
 	def run(self, args):
+		self.args = args
+		self.initial_filters = copy.deepcopy(self.filters)
 		self.filters.update(args)
 		self.set_defaults()
 		self.party_naming_by = frappe.db.get_value(args.get("naming_by")[0], None, args.get("naming_by")[1])
@@ -104,25 +116,18 @@ class ReceivablePayableReport:
 				self.skip_total_row = 1
 
 	def get_data(self):
-		self.get_sales_invoices_or_customers_based_on_sales_person()
-
-		# Get invoice details like bill_no, due_date etc for all invoices
-		self.get_invoice_details()
-
-		# fetch future payments against invoices
-		self.get_future_payments()
-
-		# Get return entries
-		if not self.filters.party_type or self.filters.party_type in ["Customer", "Supplier"]:
-			self.get_return_entries()
+		if self.ple_fetch_method != "Party-wise Stream":
+			# Get invoice details like bill_no, due_date etc for all invoices
+			self.get_invoice_details()
 
-		# Get Exchange Rate Revaluations
-		self.get_exchange_rate_revaluations()
-
-		self.prepare_ple_query()
+		self.prepare()
 		self.data = []
 		self.voucher_balance = OrderedDict()
 
+		if self.ple_fetch_method == "Party-wise Stream":
+			self.build_data_by_party()
+			return
+
 		if self.ple_fetch_method == "Buffered Cursor":
 			self.fetch_ple_in_buffered_cursor()
 		elif self.ple_fetch_method == "UnBuffered Cursor":
@@ -133,6 +138,21 @@ class ReceivablePayableReport:
 
 		self.build_data()
 
+	def prepare(self):
+		self.get_sales_invoices_or_customers_based_on_sales_person()
+
+		# fetch future payments against invoices
+		self.get_future_payments()
+
+		# Get return entries
+		if not self.filters.party_type or self.filters.party_type in ["Customer", "Supplier"]:
+			self.get_return_entries()
+
+		# Get Exchange Rate Revaluations
+		self.get_exchange_rate_revaluations()
+
+		self.prepare_ple_query()
+
 	def fetch_ple_in_buffered_cursor(self):
 		query, param = self.ple_query
 		self.ple_entries = frappe.db.sql(query, param, as_dict=True)
@@ -159,6 +179,91 @@ class ReceivablePayableReport:
 			self.update_voucher_balance(ple)
 		delattr(self, "ple_entries")
 
+	def build_data_by_party(self):
+		"""Build rows a chunk of parties at a time. A voucher's balance only depends on ledger
+		entries of its party, so a chunk's balances are final once its entries are processed."""
+		parties = self.get_parties()
+		chunks = [parties[i : i + PARTY_CHUNK_SIZE] for i in range(0, len(parties), PARTY_CHUNK_SIZE)]
+
+		processes = 0
+		# processes are not spawned by web workers, only e.g. for prepared reports run in background jobs
+		if not frappe.request:
+			processes = min(
+				cint(frappe.db.get_single_value("Accounts Settings", "receivable_payable_stream_processes")),
+				len(chunks),
+			)
+
+		if processes > 1:
+			rows_by_chunk = self.get_rows_in_processes(chunks, processes)
+		else:
+			rows_by_chunk = (self.get_rows_for_parties(chunk) for chunk in chunks)
+
+		rows = itertools.chain.from_iterable(rows_by_chunk)
+		if not self.filters.get("group_by_party"):
+			# chunks are in order of parties, rows are shown in order of posting date (then party)
+			rows = sorted(rows, key=lambda row: getdate(row.posting_date))
+
+		for row in rows:
+			self.add_row(row)
+
+		self.append_total_rows()
+
+	def get_parties(self):
+		query = self.apply_ple_filters(qb.from_(self.ple).select(self.ple.party).distinct())
+		query, param = query.walk()
+
+		match_conditions = build_match_conditions("Payment Ledger Entry")
+		if match_conditions:
+			query += " AND " + match_conditions
+
+		query += f" ORDER BY `{self.ple.party.name}`"
+		return [d[0] for d in frappe.db.sql(query, param)]
+
+	def get_rows_for_parties(self, parties):
+		"""Rows of vouchers of `parties`, ready to be added to the report."""
+		self.voucher_balance = OrderedDict()
+		self.invoices = set()
+
+		party_filter = self.ple.party.isin(parties)
+		if None in parties:
+			party_filter |= self.ple.party.isnull()
+
+		query, param = self.get_ple_query(self.ple_qb_query.where(party_filter))
+		ple_entries = frappe.db.sql(query, param, as_dict=True)
+
+		for ple in ple_entries:
+			self.init_voucher_balance(ple)
+
+		for ple in ple_entries:
+			self.update_voucher_balance(ple)
+
+		del ple_entries
+
+		self.get_invoice_details(voucher_nos=[key[-2] for key in self.voucher_balance])
+		self.build_delivery_note_map()
+
+		rows = []
+		for row in self.get_voucher_rows():
+			self.prepare_row(row)
+			rows.append(row)
+
+		return rows
+
+	def get_rows_in_processes(self, chunks, processes):
+		context = multiprocessing.get_context("spawn")
+		with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+			yield from executor.map(
+				get_rows_for_parties,
+				[frappe.local.site] * len(chunks),
+				[frappe.local.sites_path] * len(chunks),
+				[frappe.session.user] * len(chunks),
+				[self.initial_filters] * len(chunks),
+				[self.args] * len(chunks),
+				[{attr: getattr(self, attr) for attr in SHARED_REPORT_DATA if hasattr(self, attr)}]
+				* len(chunks),
+				chunks,
+			)
+
 	def build_voucher_dict(self, ple):
 		return frappe._dict(
 			voucher_type=ple.voucher_type,
@@ -335,6 +440,12 @@ class ReceivablePayableReport:
 			self.update_sub_total_row(sub_total_row, "Total")
 
 	def build_data(self):
+		for row in self.get_voucher_rows():
+			self.append_row(row)
+
+		self.append_total_rows()
+
+	def get_voucher_rows(self):
 		# set outstanding for all the accumulated balances
 		# as we can use this to filter out invoices without outstanding
 		for _key, row in self.voucher_balance.items():
@@ -373,26 +484,33 @@ class ReceivablePayableReport:
 						# make separate rows for each payment term
 						for d in row.payment_terms:
 							if d.outstanding > 0:
-								self.append_row(d)
+								yield d
 
 						# if there is overpayment, add another row
-						self.allocate_extra_payments_or_credits(row)
+						if additional_row := self.allocate_extra_payments_or_credits(row):
+							yield additional_row
 					else:
-						self.append_row(row)
+						yield row
 				else:
-					self.append_row(row)
+					yield row
 
+	def append_total_rows(self):
 		if self.filters.get("group_by_party"):
 			self.append_subtotal_row(self.previous_party)
 			if self.data:
 				self.data.append(self.total_row_map.get("Total", {}))
 
 	def append_row(self, row):
+		self.prepare_row(row)
+		self.add_row(row)
+
+	def prepare_row(self, row):
 		self.allocate_future_payments(row)
 		self.set_invoice_details(row)
 		self.set_party_details(row)
 		self.set_ageing(row)
 
+	def add_row(self, row):
 		if self.filters.get("group_by_party"):
 			self.update_sub_total_row(row, row.party)
 			if self.previous_party and (self.previous_party != row.party):
@@ -456,17 +574,24 @@ class ReceivablePayableReport:
 			for d in dn_against_si:
 				self.delivery_notes.setdefault(d.against_sales_invoice, set()).add(d.parent)
 
-	def get_invoice_details(self):
+	def get_invoice_details(self, voucher_nos=None):
+		"""Details of all invoices, or only of `voucher_nos` if passed."""
 		self.invoice_details = frappe._dict()
+		filters = {
+			"posting_date": ("<=", self.filters.report_date),
+			"company": self.filters.company,
+			"docstatus": 1,
+		}
+		if voucher_nos is not None:
+			if not voucher_nos:
+				return
+			filters["name"] = ("in", voucher_nos)
+
 		if self.account_type == "Receivable":
 			# nosemgrep
 			si_list = frappe.get_list(
 				"Sales Invoice",
-				filters={
-					"posting_date": ("<=", self.filters.report_date),
-					"company": self.filters.company,
-					"docstatus": 1,
-				},
+				filters=filters,
 				fields=["name", "due_date", "po_no"],
 			)
 			for d in si_list:
@@ -474,13 +599,15 @@ class ReceivablePayableReport:
 
 			# Get Sales Team
 			if self.filters.show_sales_person:
+				conditions = "and parent in %(voucher_nos)s" if voucher_nos else ""
 				# nosemgrep
 				sales_team = frappe.db.sql(
-					"""
+					f"""
 					select parent, sales_person
 					from `tabSales Team`
-					where parenttype = 'Sales Invoice'
+					where parenttype = 'Sales Invoice' {conditions}
 				""",
+					{"voucher_nos": voucher_nos},
 					as_dict=1,
 				)
 				for d in sales_team:
@@ -492,11 +619,7 @@ class ReceivablePayableReport:
 			# nosemgrep
 			invoices = frappe.get_list(
 				"Purchase Invoice",
-				filters={
-					"posting_date": ("<=", self.filters.report_date),
-					"company": self.filters.company,
-					"docstatus": 1,
-				},
+				filters=filters,
 				fields=["name", "due_date", "bill_no", "bill_date"],
 			)
 
@@ -507,11 +630,7 @@ class ReceivablePayableReport:
 		# nosemgrep
 		journal_entries = frappe.get_list(
 			"Journal Entry",
-			filters={
-				"posting_date": ("<=", self.filters.report_date),
-				"company": self.filters.company,
-				"docstatus": 1,
-			},
+			filters=filters,
 			fields=["name", "due_date", "bill_no", "bill_date"],
 		)
 
@@ -635,7 +754,8 @@ class ReceivablePayableReport:
 			additional_row.outstanding = (
 				additional_row.invoiced - additional_row.paid - additional_row.credit_note
 			)
-			self.append_row(additional_row)
+
+		return additional_row
 
 	def get_future_payments(self):
 		if self.filters.show_future_payments:
@@ -830,28 +950,23 @@ class ReceivablePayableReport:
 			self.qb_selection_filter.append(self.ple.posting_date.lte(self.filters.report_date))
 
 		ple = qb.DocType("Payment Ledger Entry")
-		query = (
-			qb.from_(ple)
-			.select(
-				ple.name,
-				ple.account,
-				ple.voucher_type,
-				ple.voucher_no,
-				ple.against_voucher_type,
-				ple.against_voucher_no,
-				ple.party_type,
-				ple.cost_center,
-				ple.party,
-				ple.posting_date,
-				ple.due_date,
-				ple.account_currency,
-				ple.amount,
-				ple.amount_in_account_currency,
-			)
-			.where(ple.delinked == 0)
-			.where(Criterion.all(self.qb_selection_filter))
-			.where(Criterion.any(self.or_filters))
+		query = qb.from_(ple).select(
+			ple.name,
+			ple.account,
+			ple.voucher_type,
+			ple.voucher_no,
+			ple.against_voucher_type,
+			ple.against_voucher_no,
+			ple.party_type,
+			ple.cost_center,
+			ple.party,
+			ple.posting_date,
+			ple.due_date,
+			ple.account_currency,
+			ple.amount,
+			ple.amount_in_account_currency,
 		)
+		query = self.apply_ple_filters(query)
 
 		if self.filters.get("show_remarks"):
 			if remarks_length := frappe.db.get_single_value(
@@ -861,6 +976,17 @@ class ReceivablePayableReport:
 			else:
 				query = query.select(ple.remarks)
 
+		self.ple_qb_query = query
+		self.ple_query = self.get_ple_query(query)
+
+	def apply_ple_filters(self, query):
+		return (
+			query.where(self.ple.delinked == 0)
+			.where(Criterion.all(self.qb_selection_filter))
+			.where(Criterion.any(self.or_filters))
+		)
+
+	def get_ple_query(self, query):
 		query, param = query.walk()
 
 		match_conditions = build_match_conditions("Payment Ledger Entry")
@@ -872,7 +998,7 @@ class ReceivablePayableReport:
 		else:
 			query += f" ORDER BY `{self.ple.posting_date.name}`, `{self.ple.party.name}`"
 
-		self.ple_query = (query, param)
+		return query, param
 
 	def get_sales_invoices_or_customers_based_on_sales_person(self):
 		if self.filters.get("sales_person"):
@@ -1236,7 +1362,27 @@ class ReceivablePayableReport:
 			)
 			.run()
 		)
-		self.err_journals = [x[0] for x in results] if results else []
+		self.err_journals = {x[0] for x in results} if results else set()
+
+
+def get_rows_for_parties(site, sites_path, user, filters, args, shared_data, parties):
+	"""Rows of vouchers of `parties`, built in a separate process by `build_data_by_party`.
+	Data that doesn't depend on the parties (`SHARED_REPORT_DATA`) is passed by the parent."""
+	frappe.init(site=site, sites_path=sites_path)
+	frappe.connect()
+	try:
+		frappe.set_user(user)
+		report = ReceivablePayableReport(filters)
+		report.filters.update(args)
+		report.set_defaults()
+		report.party_naming_by = frappe.db.get_value(args.get("naming_by")[0], None, args.get("naming_by")[1])
+		for attr, value in shared_data.items():
+			setattr(report, attr, value)
+
+		report.prepare_ple_query()
+		return report.get_rows_for_parties(parties)
+	finally:
+		frappe.destroy()
 
 
 def get_customer_group_with_children(customer_groups):
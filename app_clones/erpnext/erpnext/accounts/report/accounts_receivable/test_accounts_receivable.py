@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import frappe
 from frappe import qb
 from frappe.tests.utils import FrappeTestCase, change_settings
@@ -1064,3 +1066,58 @@ class TestAccountsReceivable(AccountsTestMixin, FrappeTestCase):
 		self.assertEqual(len(report[1]), 1)
 		row = report[1][0]
 		self.assertEqual(expected_data_after_payment, [row.voucher_no, row.cost_center, row.outstanding])
+
+	def test_party_wise_stream(self):
+		si = self.create_sales_invoice()
+		self.create_payment_entry(si.name)
+		self.create_credit_note(si.name)
+		self.create_sales_invoice(no_payment_schedule=True)
+
+		filters = {
+			"company": self.company,
+			"report_date": today(),
+			"range": "30, 60, 90, 120",
+			"based_on_payment_terms": 1,
+			"group_by_party": True,
+		}
+		fields = ["voucher_no", "party", "invoiced", "paid", "credit_note", "outstanding", "range1"]
+
+		expected = [[row.get(f) for f in fields] for row in execute(filters)[1]]
+		with change_settings("Accounts Settings", {"receivable_payable_fetch_method": "Party-wise Stream"}):
+			streamed = [[row.get(f) for f in fields] for row in execute(filters)[1]]
+
+		self.assertEqual(streamed, expected)
+
+	def test_party_wise_stream_posting_date_order(self):
+		customers = []
+		for customer_name in ["_Test AR Stream Customer A", "_Test AR Stream Customer B"]:
+			self.create_customer(customer_name)
+			customers.append(self.customer)
+
+		# the later party has the earlier invoices, so party order and posting date order differ
+		for customer, days in [(customers[0], -1), (customers[1], -3), (customers[0], -2), (customers[1], 0)]:
+			create_sales_invoice(
+				item=self.item,
+				company=self.company,
+				customer=customer,
+				debit_to=self.debit_to,
+				posting_date=add_days(today(), days),
+				cost_center=self.cost_center,
+				rate=100,
+			)
+
+		filters = {"company": self.company, "report_date": today(), "range": "30, 60, 90, 120"}
+		fields = ["posting_date", "party", "voucher_no", "outstanding"]
+
+		expected = [[row.get(f) for f in fields] for row in execute(filters)[1]]
+		with (
+			change_settings("Accounts Settings", {"receivable_payable_fetch_method": "Party-wise Stream"}),
+			patch("erpnext.accounts.report.accounts_receivable.accounts_receivable.PARTY_CHUNK_SIZE", 1),
+		):
+			streamed = [[row.get(f) for f in fields] for row in execute(filters)[1]]
+
+		self.assertEqual(streamed, expected)
+		self.assertEqual([row[0] for row in streamed], sorted(row[0] for row in streamed))
+		self.assertEqual(
+			[row[1] for row in streamed], [customers[1], customers[0], customers[0], customers[1]]
+		)
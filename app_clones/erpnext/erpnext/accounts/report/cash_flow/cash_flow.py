@@ -6,6 +6,7 @@ import frappe
 from frappe import _
 from frappe.utils import cstr
 
+from erpnext.accounts.doctype.account_balance_rollup.account_balance_rollup import get_balance_doctype
 from erpnext.accounts.report.financial_statements import (
 	get_columns,
 	get_cost_centers_with_children,
@@ -203,12 +204,17 @@ def get_account_type_based_gl_data(company, filters=None):
 		filters.cost_center = get_cost_centers_with_children(filters.cost_center)
 		cond += " and cost_center in %(cost_center)s"
 
+	balance_doctype = get_balance_doctype()
+	if balance_doctype == "GL Entry":
+		cond += " and voucher_type != 'Period Closing Voucher'"
+	else:
+		cond += " and is_period_closing_voucher_entry = 0"
+
 	gl_sum = frappe.db.sql_list(
 		f"""
 		select sum(credit) - sum(debit)
-		from `tabGL Entry`
+		from `tab{balance_doctype}`
 		where company=%(company)s and posting_date >= %(start_date)s and posting_date <= %(end_date)s
-			and voucher_type != 'Period Closing Voucher'
 			and account in ( SELECT name FROM tabAccount WHERE account_type = %(account_type)s) {cond}
 	""",
 		filters,
@@ -62,6 +62,9 @@ class General_Payment_Ledger_Comparison:
 				if self.filters.voucher_no:
 					filter_criterion.append(gle.voucher_no == self.filters.voucher_no)
 
+				if self.filters.voucher_nos:
+					filter_criterion.append(gle.voucher_no.isin(self.filters.voucher_nos))
+
 				if self.filters.period_start_date:
 					filter_criterion.append(gle.posting_date.gte(self.filters.period_start_date))
 
@@ -105,6 +108,9 @@ class General_Payment_Ledger_Comparison:
 				if self.filters.voucher_no:
 					filter_criterion.append(ple.voucher_no == self.filters.voucher_no)
 
+				if self.filters.voucher_nos:
+					filter_criterion.append(ple.voucher_no.isin(self.filters.voucher_nos))
+
 				if self.filters.period_start_date:
 					filter_criterion.append(ple.posting_date.gte(self.filters.period_start_date))
 
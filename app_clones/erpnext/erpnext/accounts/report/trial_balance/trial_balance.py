@@ -8,6 +8,7 @@ from frappe.query_builder.functions import Sum
 from frappe.utils import add_days, cstr, flt, formatdate, getdate
 
 import erpnext
+from erpnext.accounts.doctype.account_balance_rollup.account_balance_rollup import get_balance_doctype
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimension_with_children,
@@ -162,6 +163,7 @@ def get_rootwise_opening_balances(filters, report_type, ignore_is_opening):
 		)
 
 	accounting_dimensions = get_accounting_dimensions(as_list=False)
+	balance_doctype = get_balance_doctype()
 
 	if last_period_closing_voucher:
 		gle = get_opening_balance(
@@ -177,7 +179,7 @@ def get_rootwise_opening_balances(filters, report_type, ignore_is_opening):
 		if getdate(last_period_closing_voucher[0].period_end_date) < getdate(add_days(filters.from_date, -1)):
 			start_date = add_days(last_period_closing_voucher[0].period_end_date, 1)
 			gle += get_opening_balance(
-				"GL Entry",
+				balance_doctype,
 				filters,
 				report_type,
 				accounting_dimensions,
@@ -186,7 +188,7 @@ def get_rootwise_opening_balances(filters, report_type, ignore_is_opening):
 			)
 	else:
 		gle = get_opening_balance(
-			"GL Entry", filters, report_type, accounting_dimensions, ignore_is_opening=ignore_is_opening
+			balance_doctype, filters, report_type, accounting_dimensions, ignore_is_opening=ignore_is_opening
 		)
 
 	opening = frappe._dict()
@@ -265,15 +267,15 @@ def get_opening_balance(
 	if (
 		not filters.show_unclosed_fy_pl_balances
 		and report_type == "Profit and Loss"
-		and doctype == "GL Entry"
+		and doctype != "Account Closing Balance"
 	):
 		opening_balance = opening_balance.where(closing_balance.posting_date >= filters.year_start_date)
 
 	if not flt(filters.with_period_closing_entry_for_opening):
-		if doctype == "Account Closing Balance":
-			opening_balance = opening_balance.where(closing_balance.is_period_closing_voucher_entry == 0)
-		else:
+		if doctype == "GL Entry":
 			opening_balance = opening_balance.where(closing_balance.voucher_type != "Period Closing Voucher")
+		else:
+			opening_balance = opening_balance.where(closing_balance.is_period_closing_voucher_entry == 0)
 
 	if filters.cost_center:
 		lft, rgt = frappe.db.get_value("Cost Center", filters.cost_center, ["lft", "rgt"])
@@ -58,6 +58,8 @@ def apply_filters(query, filters, gle):
 		query = query.where(gle.company == filters.company)
 	if filters.get("voucher_type"):
 		query = query.where(gle.voucher_type == filters.voucher_type)
+	if filters.get("voucher_nos"):
+		query = query.where(gle.voucher_no.isin(filters.voucher_nos))
 	if filters.get("from_date"):
 		query = query.where(gle.posting_date >= filters.from_date)
 	if filters.get("to_date"):
@@ -2,6 +2,7 @@
 # License: GNU General Public License v3. See license.txt
 
 
+from collections import defaultdict
 from json import loads
 from typing import TYPE_CHECKING, Optional
 
@@ -14,6 +15,7 @@ from frappe.query_builder.functions import Count, Max, Sum
 from frappe.query_builder.utils import DocType
 from frappe.utils import (
 	add_days,
+	add_to_date,
 	cint,
 	create_batch,
 	cstr,
@@ -32,6 +34,10 @@ import erpnext
 
 # imported to enable erpnext.accounts.utils.get_account_currency
 from erpnext.accounts.doctype.account.account import get_account_currency
+from erpnext.accounts.doctype.account_balance_rollup.account_balance_rollup import (
+	get_balance_doctype,
+	remove_vouchers_from_account_balance_rollup,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import get_dimensions
 from erpnext.stock import get_warehouse_account_map
 from erpnext.stock.utils import get_stock_value_on
@@ -49,6 +55,11 @@ class PaymentEntryUnlinkError(frappe.ValidationError):
 
 
 GL_REPOSTING_CHUNK = 100
+LEDGER_HEALTH_CHECK_BATCH_SIZE = 1000
+# Ledger entries modified shortly before the previous run may have been committed after it
+LEDGER_HEALTH_CHECK_OVERLAP_MINUTES = 10
+# Changes not caught by `modified` (deleted entries, bulk updates, later commits) are found by a full check
+LEDGER_HEALTH_FULL_CHECK_INTERVAL_HOURS = 24
 
 
 @frappe.whitelist()
@@ -196,7 +207,10 @@ def get_balance_on(
 	if not cost_center and frappe.form_dict.get("cost_center"):
 		cost_center = frappe.form_dict.get("cost_center")
 
-	cond = ["is_cancelled=0"]
+	# party balances are not rolled up
+	balance_doctype = "GL Entry" if party_type and party else get_balance_doctype()
+
+	cond = ["is_cancelled=0"] if balance_doctype == "GL Entry" else []
 	if start_date:
 		cond.append("posting_date >= %s" % frappe.db.escape(cstr(start_date)))
 	if date:
@@ -293,8 +307,8 @@ def get_balance_on(
 		bal = frappe.db.sql(
 			"""
 			SELECT {}
-			FROM `tabGL Entry` gle
-			WHERE {}""".format(select_field, " and ".join(cond)),
+			FROM `tab{}` gle
+			WHERE {}""".format(select_field, balance_doctype, " and ".join(cond)),
 			(precision, precision),
 		)[0][0]
 		# if bal is None, return 0
@@ -1109,11 +1123,11 @@ def fix_total_debit_credit():
 			dr_or_cr = d.voucher_type == "Sales Invoice" and "credit" or "debit"
 
 			frappe.db.sql(
-				"""update `tabGL Entry` set {} = {} + {}
+				"""update `tabGL Entry` set {} = {} + {}, modified = {}
 				where voucher_type = {} and voucher_no = {} and {} > 0 limit 1""".format(
-					dr_or_cr, dr_or_cr, "%s", "%s", "%s", dr_or_cr
+					dr_or_cr, dr_or_cr, "%s", "%s", "%s", "%s", dr_or_cr
 				),
-				(d.diff, d.voucher_type, d.voucher_no),
+				(d.diff, now(), d.voucher_type, d.voucher_no),
 			)
 
 
@@ -1459,6 +1473,8 @@ def repost_gle_for_stock_vouchers(
 	for stock_vouchers_chunk in create_batch(stock_vouchers, GL_REPOSTING_CHUNK):
 		gle = get_voucherwise_gl_entries(stock_vouchers_chunk, posting_date)
 
+		vouchers_to_delete = []
+		vouchers_to_repost = []
 		for voucher_type, voucher_no in stock_vouchers_chunk:
 			existing_gle = gle.get((voucher_type, voucher_no), [])
 			voucher_obj = frappe.get_doc(voucher_type, voucher_no)
@@ -1469,10 +1485,16 @@ def repost_gle_for_stock_vouchers(
 				if not existing_gle or not compare_existing_and_expected_gle(
 					existing_gle, expected_gle, precision
 				):
-					_delete_accounting_ledger_entries(voucher_type, voucher_no)
-					voucher_obj.make_gl_entries(gl_entries=expected_gle, from_repost=True)
+					vouchers_to_delete.append((voucher_type, voucher_no))
+					vouchers_to_repost.append((voucher_obj, expected_gle))
 			else:
-				_delete_accounting_ledger_entries(voucher_type, voucher_no)
+				vouchers_to_delete.append((voucher_type, voucher_no))
+
+		# entries made with `from_repost` aren't validated against other vouchers' entries,
+		# so entries of the whole chunk can be deleted before making the new ones
+		_delete_accounting_ledger_entries_of_vouchers(vouchers_to_delete)
+		for voucher_obj, expected_gle in vouchers_to_repost:
+			voucher_obj.make_gl_entries(gl_entries=expected_gle, from_repost=True)
 
 		if not frappe.flags.in_test:
 			frappe.db.commit()
@@ -1490,6 +1512,7 @@ def _delete_pl_entries(voucher_type, voucher_no):
 
 
 def _delete_gl_entries(voucher_type, voucher_no):
+	remove_vouchers_from_account_balance_rollup(voucher_type, voucher_no)
 	gle = qb.DocType("GL Entry")
 	qb.from_(gle).delete().where((gle.voucher_type == voucher_type) & (gle.voucher_no == voucher_no)).run()
 
@@ -1502,6 +1525,24 @@ def _delete_accounting_ledger_entries(voucher_type, voucher_no):
 	_delete_pl_entries(voucher_type, voucher_no)
 
 
+def _delete_accounting_ledger_entries_of_vouchers(vouchers: list[tuple[str, str]]):
+	"""
+	Remove entries from both General and Payment Ledger for specified Vouchers, with a query per
+	voucher type and ledger
+	"""
+	voucher_nos_by_type = defaultdict(list)
+	for voucher_type, voucher_no in vouchers:
+		voucher_nos_by_type[voucher_type].append(voucher_no)
+
+	for voucher_type, voucher_nos in voucher_nos_by_type.items():
+		remove_vouchers_from_account_balance_rollup(voucher_type, voucher_nos)
+		for ledger in ("GL Entry", "Payment Ledger Entry"):
+			table = qb.DocType(ledger)
+			qb.from_(table).delete().where(
+				(table.voucher_type == voucher_type) & (table.voucher_no.isin(voucher_nos))
+			).run()
+
+
 def sort_stock_vouchers_by_posting_date(
 	stock_vouchers: list[tuple[str, str]], company=None
 ) -> list[tuple[str, str]]:
@@ -2281,37 +2322,111 @@ def run_ledger_health_checks():
 
 		run_date = get_datetime()
 
+		# Once the monitored period has been checked, only vouchers whose ledger entries were written or
+		# modified since the last run are checked again, until the next full check is due
+		changed_since, changed_vouchers = None, None
+		if health_monitor_settings.checked_up_to:
+			changed_since = add_to_date(
+				health_monitor_settings.checked_up_to, minutes=-LEDGER_HEALTH_CHECK_OVERLAP_MINUTES
+			)
+
+		full_check = not changed_since or not health_monitor_settings.last_full_check_on
+		if not full_check:
+			full_check_due = add_to_date(
+				health_monitor_settings.last_full_check_on, hours=LEDGER_HEALTH_FULL_CHECK_INTERVAL_HOURS
+			)
+			full_check = get_datetime(full_check_due) <= run_date
+
+		if not full_check:
+			changed_vouchers = get_vouchers_with_changed_ledger_entries(changed_since, run_date)
+
 		# Debit-Credit mismatch report
 		if health_monitor_settings.debit_credit_mismatch:
 			for x in health_monitor_settings.companies:
-				filters = {"company": x.company, "from_date": period_start, "to_date": period_end}
-				voucher_wise = frappe.get_doc("Report", "Voucher-wise Balance")
-				res = voucher_wise.execute_script_report(filters=filters)
-				for x in res[1]:
-					doc = frappe.new_doc("Ledger Health")
-					doc.voucher_type = x.voucher_type
-					doc.voucher_no = x.voucher_no
-					doc.debit_credit_mismatch = True
-					doc.checked_on = run_date
-					doc.save()
+				for voucher_nos in get_vouchers_to_check(x.company, changed_vouchers):
+					filters = {"company": x.company, "from_date": period_start, "to_date": period_end}
+					if voucher_nos:
+						filters = {"company": x.company, "voucher_nos": voucher_nos}
+					voucher_wise = frappe.get_doc("Report", "Voucher-wise Balance")
+					res = voucher_wise.execute_script_report(filters=filters)
+					for voucher in res[1]:
+						make_ledger_health(voucher, "debit_credit_mismatch", run_date, changed_since)
 
 		# General Ledger and Payment Ledger discrepancy
 		if health_monitor_settings.general_and_payment_ledger_mismatch:
 			for x in health_monitor_settings.companies:
-				filters = {
-					"company": x.company,
-					"period_start_date": period_start,
-					"period_end_date": period_end,
-				}
-				gl_pl_comparison = frappe.get_doc("Report", "General and Payment Ledger Comparison")
-				res = gl_pl_comparison.execute_script_report(filters=filters)
-				for x in res[1]:
-					doc = frappe.new_doc("Ledger Health")
-					doc.voucher_type = x.voucher_type
-					doc.voucher_no = x.voucher_no
-					doc.general_and_payment_ledger_mismatch = True
-					doc.checked_on = run_date
-					doc.save()
+				for voucher_nos in get_vouchers_to_check(x.company, changed_vouchers):
+					filters = {
+						"company": x.company,
+						"period_start_date": period_start,
+						"period_end_date": period_end,
+					}
+					if voucher_nos:
+						filters = {"company": x.company, "voucher_nos": voucher_nos}
+					gl_pl_comparison = frappe.get_doc("Report", "General and Payment Ledger Comparison")
+					res = gl_pl_comparison.execute_script_report(filters=filters)
+					for voucher in res[1]:
+						make_ledger_health(
+							voucher, "general_and_payment_ledger_mismatch", run_date, changed_since
+						)
+
+		frappe.db.set_single_value("Ledger Health Monitor", "checked_up_to", run_date)
+		if full_check:
+			frappe.db.set_single_value("Ledger Health Monitor", "last_full_check_on", run_date)
+
+
+def get_vouchers_with_changed_ledger_entries(from_datetime, to_datetime) -> dict:
+	"""
+	Vouchers, by company, with GL or Payment Ledger Entries written or modified in the given time range.
+	Uses the indexed `modified` column. Writes that don't update it and deleted entries are only found
+	by the periodic full check.
+	"""
+	vouchers = defaultdict(set)
+	for doctype in ("GL Entry", "Payment Ledger Entry"):
+		ledger = qb.DocType(doctype)
+		entries = (
+			qb.from_(ledger)
+			.select(ledger.company, ledger.voucher_no)
+			.distinct()
+			.where((ledger.modified >= from_datetime) & (ledger.modified < to_datetime))
+			.run()
+		)
+		for company, voucher_no in entries:
+			vouchers[company].add(voucher_no)
+
+	return vouchers
+
+
+def get_vouchers_to_check(company, changed_vouchers=None):
+	"""
+	Batches of vouchers of a company to run ledger health checks for,
+	or a single `None` batch to check the whole monitored period
+	"""
+	if changed_vouchers is None:
+		return [None]
+
+	return create_batch(sorted(changed_vouchers.get(company, [])), LEDGER_HEALTH_CHECK_BATCH_SIZE)
+
+
+def make_ledger_health(voucher, mismatch, checked_on, reported_since=None):
+	# vouchers in the overlap between runs are checked twice, report them once
+	if reported_since and frappe.db.exists(
+		"Ledger Health",
+		{
+			"voucher_type": voucher.voucher_type,
+			"voucher_no": voucher.voucher_no,
+			mismatch: 1,
+			"checked_on": (">=", reported_since),
+		},
+	):
+		return
+
+	doc = frappe.new_doc("Ledger Health")
+	doc.voucher_type = voucher.voucher_type
+	doc.voucher_no = voucher.voucher_no
+	doc.set(mismatch, True)
+	doc.checked_on = checked_on
+	doc.save()
 
 
 def sync_auto_reconcile_config(auto_reconciliation_job_trigger: int = 15):
@@ -2,10 +2,55 @@
 # GPL v3 License. See license.txt
 
 import click
+import frappe
+from frappe.commands import pass_context
+from frappe.exceptions import SiteNotSpecifiedError
 
 
 def call_command(cmd, context):
 	return click.Context(cmd, obj=context).forward(cmd)
 
 
-commands = []
+@click.command("rebuild-account-balance-rollup")
+@click.option("--company", help="Only rebuild or verify the rollup of this company")
+@click.option("--verify", is_flag=True, default=False, help="Compare the rollup with GL Entries instead")
+@pass_context
+def rebuild_account_balance_rollup(context, company=None, verify=False):
+	"Rebuild Account Balance Rollup from GL Entries, or verify it against them"
+	from erpnext.accounts.doctype.account_balance_rollup.account_balance_rollup import (
+		rebuild_account_balance_rollup,
+		verify_account_balance_rollup,
+	)
+
+	exit_code = 0
+	for site in context.sites:
+		try:
+			frappe.init(site=site)
+			frappe.connect()
+
+			if not verify:
+				rebuild_account_balance_rollup(company)
+				frappe.db.commit()
+				continue
+
+			for rollup_company in [company] if company else frappe.get_all("Company", pluck="name"):
+				mismatches = verify_account_balance_rollup(rollup_company)
+				click.echo(f"{site}: {rollup_company}: {len(mismatches)} mismatched balance(s)")
+				for mismatch in mismatches:
+					click.echo(
+						f"  {mismatch.posting_date} {mismatch.account} {mismatch.fieldname}: "
+						f"expected {mismatch.expected}, found {mismatch.actual}"
+					)
+				if mismatches:
+					exit_code = 1
+		finally:
+			frappe.destroy()
+
+	if not context.sites:
+		raise SiteNotSpecifiedError
+
+	if exit_code:
+		raise click.exceptions.Exit(exit_code)
+
+
+commands = [rebuild_account_balance_rollup]
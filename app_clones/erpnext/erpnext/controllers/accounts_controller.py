@@ -70,6 +70,7 @@ from erpnext.stock.get_item_details import (
 	get_item_details,
 	get_item_tax_map,
 	get_item_warehouse,
+	prefetch_items_details,
 )
 from erpnext.utilities.regional import temporary_flag
 from erpnext.utilities.transaction_base import TransactionBase
@@ -395,6 +396,9 @@ class AccountsController(TransactionBase):
 			).run()
 
 	def on_trash(self):
+		from erpnext.accounts.doctype.account_balance_rollup.account_balance_rollup import (
+			remove_vouchers_from_account_balance_rollup,
+		)
 		from erpnext.accounts.utils import delete_exchange_gain_loss_journal
 
 		self._remove_advance_payment_ledger_entries()
@@ -417,6 +421,7 @@ class AccountsController(TransactionBase):
 					== 1
 				)
 			).run()
+			remove_vouchers_from_account_balance_rollup(self.doctype, self.name)
 			gle = frappe.qb.DocType("GL Entry")
 			frappe.qb.from_(gle).delete().where(
 				(gle.voucher_type == self.doctype) & (gle.voucher_no == self.name)
@@ -928,25 +933,25 @@ class AccountsController(TransactionBase):
 		"""set missing item values"""
 		from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
 
-		if hasattr(self, "items"):
-			parent_dict = {}
-			for fieldname in self.meta.get_valid_columns():
-				parent_dict[fieldname] = self.get(fieldname)
+		if not hasattr(self, "items"):
+			return
 
-			if self.doctype in ["Quotation", "Sales Order", "Delivery Note", "Sales Invoice"]:
-				document_type = f"{self.doctype} Item"
-				parent_dict.update({"document_type": document_type})
+		parent_dict = {}
+		for fieldname in self.meta.get_valid_columns():
+			parent_dict[fieldname] = self.get(fieldname)
 
-			# party_name field used for customer in quotation
-			if (
-				self.doctype == "Quotation"
-				and self.quotation_to == "Customer"
-				and parent_dict.get("party_name")
-			):
-				parent_dict.update({"customer": parent_dict.get("party_name")})
+		if self.doctype in ["Quotation", "Sales Order", "Delivery Note", "Sales Invoice"]:
+			document_type = f"{self.doctype} Item"
+			parent_dict.update({"document_type": document_type})
+
+		# party_name field used for customer in quotation
+		if self.doctype == "Quotation" and self.quotation_to == "Customer" and parent_dict.get("party_name"):
+			parent_dict.update({"customer": parent_dict.get("party_name")})
 
-			self.pricing_rules = []
+		self.pricing_rules = []
 
+		items_args = [{**parent_dict, **item.as_dict()} for item in self.get("items")]
+		with prefetch_items_details(items_args, ignore_pricing_rule=self.get("ignore_pricing_rule")):
 			for item in self.get("items"):
 				if item.get("item_code"):
 					args = parent_dict.copy()
@@ -1049,8 +1054,8 @@ class AccountsController(TransactionBase):
 						or 1
 					)
 
-			if self.doctype == "Purchase Invoice":
-				self.set_expense_account(for_validate)
+		if self.doctype == "Purchase Invoice":
+			self.set_expense_account(for_validate)
 
 	def apply_pricing_rule_on_items(self, item, pricing_rule_args):
 		if not pricing_rule_args.get("validate_applied_rule", 0):
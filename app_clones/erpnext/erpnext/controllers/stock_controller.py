@@ -1379,9 +1379,10 @@ class StockController(AccountsController):
 					voucher_type=self.doctype,
 					voucher_no=self.name,
 					via_landed_cost_voucher=via_landed_cost_voucher,
+					incremental_gl_reposting=True,
 				)
 			else:
-				create_repost_item_valuation_entry(args)
+				create_repost_item_valuation_entry({**args, "incremental_gl_reposting": 1})
 
 	def add_gl_entry(
 		self,
@@ -1778,12 +1779,17 @@ def create_repost_item_valuation_entry(args):
 	repost_entry.flags.ignore_links = True
 	repost_entry.flags.ignore_permissions = True
 	repost_entry.via_landed_cost_voucher = args.via_landed_cost_voucher
+	repost_entry.incremental_gl_reposting = args.incremental_gl_reposting
 	repost_entry.save()
 	repost_entry.submit()
 
 
 def create_item_wise_repost_entries(
-	voucher_type, voucher_no, allow_zero_rate=False, via_landed_cost_voucher=False
+	voucher_type,
+	voucher_no,
+	allow_zero_rate=False,
+	via_landed_cost_voucher=False,
+	incremental_gl_reposting=False,
 ):
 	"""Using a voucher create repost item valuation records for all item-warehouse pairs."""
 
@@ -1809,6 +1815,7 @@ def create_item_wise_repost_entries(
 		repost_entry.flags.ignore_links = True
 		repost_entry.flags.ignore_permissions = True
 		repost_entry.via_landed_cost_voucher = via_landed_cost_voucher
+		repost_entry.incremental_gl_reposting = incremental_gl_reposting
 		repost_entry.submit()
 		repost_entries.append(repost_entry)
 
@@ -21,6 +21,9 @@ from erpnext.controllers.accounts_controller import (
 from erpnext.stock.get_item_details import _get_item_tax_template, get_item_tax_map
 from erpnext.utilities.regional import temporary_flag
 
+# documents with at least these many items (and taxes) have their taxes calculated tax by tax
+TAXES_BY_COLUMN_MIN_ITEMS = 50
+
 
 class calculate_taxes_and_totals:
 	def __init__(self, doc: Document):
@@ -141,12 +144,16 @@ class calculate_taxes_and_totals:
 						)
 
 	def update_item_tax_map(self):
+		item_tax_maps = {}
 		for item in self.doc.items:
-			item.item_tax_rate = get_item_tax_map(
-				company=self.doc.get("company"),
-				item_tax_template=item.item_tax_template,
-				as_json=True,
-			)
+			if item.item_tax_template not in item_tax_maps:
+				item_tax_maps[item.item_tax_template] = get_item_tax_map(
+					company=self.doc.get("company"),
+					item_tax_template=item.item_tax_template,
+					as_json=True,
+				)
+
+			item.item_tax_rate = item_tax_maps[item.item_tax_template]
 
 	def validate_conversion_rate(self):
 		# validate conversion rate
@@ -273,23 +280,20 @@ class calculate_taxes_and_totals:
 		if not any(cint(tax.included_in_print_rate) for tax in self.doc.get("taxes")):
 			return
 
+		# tax fractions only depend on the item tax rates, so they are computed once for every
+		# distinct `item_tax_rate` (and set on the taxes for the last item, as if for every item)
+		tax_fractions = {}
 		for item in self.doc.items:
-			item_tax_map = self._load_item_tax_rate(item.item_tax_rate)
+			if item.item_tax_rate not in tax_fractions:
+				tax_fractions[item.item_tax_rate] = self.get_tax_fractions(item.item_tax_rate)
+
 			cumulated_tax_fraction = 0
 			total_inclusive_tax_amount_per_qty = 0
-			for i, tax in enumerate(self.doc.get("taxes")):
-				(
-					tax.tax_fraction_for_current_item,
-					inclusive_tax_amount_per_qty,
-				) = self.get_current_tax_fraction(tax, item_tax_map)
-
-				if i == 0:
-					tax.grand_total_fraction_for_current_item = 1 + tax.tax_fraction_for_current_item
-				else:
-					tax.grand_total_fraction_for_current_item = (
-						self.doc.get("taxes")[i - 1].grand_total_fraction_for_current_item
-						+ tax.tax_fraction_for_current_item
-					)
+			for tax, (tax_fraction, grand_total_fraction, inclusive_tax_amount_per_qty) in zip(
+				self.doc.get("taxes"), tax_fractions[item.item_tax_rate], strict=True
+			):
+				tax.tax_fraction_for_current_item = tax_fraction
+				tax.grand_total_fraction_for_current_item = grand_total_fraction
 
 				cumulated_tax_fraction += tax.tax_fraction_for_current_item
 				total_inclusive_tax_amount_per_qty += inclusive_tax_amount_per_qty * flt(item.qty)
@@ -309,6 +313,35 @@ class calculate_taxes_and_totals:
 
 				self._set_in_company_currency(item, ["net_rate", "net_amount"])
 
+	def get_tax_fractions(self, item_tax_rate):
+		"""Returns tax fraction, grand total fraction and inclusive tax amount per qty of every tax
+		for items with `item_tax_rate`."""
+		item_tax_map = self._load_item_tax_rate(item_tax_rate)
+		tax_fractions = []
+		for i, tax in enumerate(self.doc.get("taxes")):
+			(
+				tax.tax_fraction_for_current_item,
+				inclusive_tax_amount_per_qty,
+			) = self.get_current_tax_fraction(tax, item_tax_map)
+
+			if i == 0:
+				tax.grand_total_fraction_for_current_item = 1 + tax.tax_fraction_for_current_item
+			else:
+				tax.grand_total_fraction_for_current_item = (
+					self.doc.get("taxes")[i - 1].grand_total_fraction_for_current_item
+					+ tax.tax_fraction_for_current_item
+				)
+
+			tax_fractions.append(
+				(
+					tax.tax_fraction_for_current_item,
+					tax.grand_total_fraction_for_current_item,
+					inclusive_tax_amount_per_qty,
+				)
+			)
+
+		return tax_fractions
+
 	def _load_item_tax_rate(self, item_tax_rate):
 		return json.loads(item_tax_rate) if item_tax_rate else {}
 
@@ -390,6 +423,44 @@ class calculate_taxes_and_totals:
 			]
 		)
 
+		if len(self._items) >= TAXES_BY_COLUMN_MIN_ITEMS and self.can_calculate_taxes_by_column():
+			self.calculate_taxes_by_column(actual_tax_dict)
+		else:
+			self.calculate_taxes_by_item(actual_tax_dict)
+
+		discount_amount_applied = self.discount_amount_applied
+		if doc.apply_discount_on == "Grand Total" and (
+			discount_amount_applied or doc.discount_amount or doc.additional_discount_percentage
+		):
+			tax_amount_precision = doc.taxes[0].precision("tax_amount")
+
+			for i, tax in enumerate(doc.taxes):
+				if discount_amount_applied:
+					tax.tax_amount_after_discount_amount = flt(
+						tax.tax_amount_after_discount_amount, tax_amount_precision
+					)
+
+				self.set_cumulative_total(i, tax)
+
+			if not discount_amount_applied:
+				self.grand_total_for_distributing_discount = doc.taxes[-1].total
+			else:
+				self.grand_total_diff = flt(
+					self.grand_total_for_distributing_discount - doc.discount_amount - doc.taxes[-1].total,
+					doc.precision("grand_total"),
+				)
+
+		for i, tax in enumerate(doc.taxes):
+			self.round_off_totals(tax)
+			self._set_in_company_currency(tax, ["tax_amount", "tax_amount_after_discount_amount"])
+
+			self.round_off_base_values(tax)
+			self.set_cumulative_total(i, tax)
+
+			self._set_in_company_currency(tax, ["total"])
+
+	def calculate_taxes_by_item(self, actual_tax_dict):
+		doc = self.doc
 		for n, item in enumerate(self._items):
 			item_tax_map = self._load_item_tax_rate(item.item_tax_rate)
 			for i, tax in enumerate(doc.taxes):
@@ -430,36 +501,113 @@ class calculate_taxes_and_totals:
 						doc.taxes[i - 1].grand_total_for_current_item + current_tax_amount
 					)
 
-		discount_amount_applied = self.discount_amount_applied
-		if doc.apply_discount_on == "Grand Total" and (
-			discount_amount_applied or doc.discount_amount or doc.additional_discount_percentage
-		):
-			tax_amount_precision = doc.taxes[0].precision("tax_amount")
+	def can_calculate_taxes_by_column(self):
+		"""Taxes can be calculated tax by tax if they only depend on previous taxes (and the tax
+		amount of an item isn't calculated differently by an overridden `get_current_tax_amount`)."""
+		if type(self).get_current_tax_amount is not calculate_taxes_and_totals.get_current_tax_amount:
+			return False
 
-			for i, tax in enumerate(doc.taxes):
-				if discount_amount_applied:
-					tax.tax_amount_after_discount_amount = flt(
-						tax.tax_amount_after_discount_amount, tax_amount_precision
-					)
+		if [tax.idx for tax in self.doc.taxes] != list(range(1, len(self.doc.taxes) + 1)):
+			return False
 
-				self.set_cumulative_total(i, tax)
+		return all(
+			0 < cint(tax.row_id) < tax.idx
+			for tax in self.doc.taxes
+			if tax.charge_type in ("On Previous Row Amount", "On Previous Row Total")
+		)
 
-			if not discount_amount_applied:
-				self.grand_total_for_distributing_discount = doc.taxes[-1].total
-			else:
-				self.grand_total_diff = flt(
-					self.grand_total_for_distributing_discount - doc.discount_amount - doc.taxes[-1].total,
-					doc.precision("grand_total"),
-				)
+	def calculate_taxes_by_column(self, actual_tax_dict):
+		"""Same as `calculate_taxes_by_item`, but calculates a tax for all the items before the next
+		tax, with the item tax rates and the amounts of the previous taxes held as columns.
 
-		for i, tax in enumerate(doc.taxes):
-			self.round_off_totals(tax)
-			self._set_in_company_currency(tax, ["tax_amount", "tax_amount_after_discount_amount"])
+		Tax amounts are added up in the same (item) order, so the results are exactly the same."""
+		doc = self.doc
+		items = self._items
+		last_row = len(items) - 1
+		round_row_wise_tax = frappe.flags.round_row_wise_tax
+		recompute_tax = not doc.get("is_consolidated")
+		discount_on_grand_total = self.discount_amount_applied and doc.apply_discount_on == "Grand Total"
+
+		item_tax_maps = {}
+		for item in items:
+			if item.item_tax_rate not in item_tax_maps:
+				item_tax_maps[item.item_tax_rate] = self._load_item_tax_rate(item.item_tax_rate)
+
+		net_amounts = [item.net_amount for item in items]
+		# tax amount and grand total of every item, for every tax
+		tax_amount_columns = []
+		grand_total_columns = []
 
-			self.round_off_base_values(tax)
-			self.set_cumulative_total(i, tax)
+		for tax in doc.taxes:
+			tax_rates = {
+				item_tax_rate: self._get_tax_rate(tax, item_tax_map)
+				for item_tax_rate, item_tax_map in item_tax_maps.items()
+			}
+			tax_precision = tax.precision("tax_amount")
+			set_item_wise_tax = recompute_tax and not tax.get("dont_recompute_tax")
+			accumulate_tax_amount = tax.charge_type != "Actual" and not discount_on_grand_total
 
-			self._set_in_company_currency(tax, ["total"])
+			if tax.charge_type == "Actual":
+				actual = flt(tax.tax_amount, tax_precision)
+				apply_tds = tax.get("is_tax_withholding_account") and items[0].meta.get_field("apply_tds")
+			elif tax.charge_type == "On Previous Row Amount":
+				previous_row_column = tax_amount_columns[cint(tax.row_id) - 1]
+			elif tax.charge_type == "On Previous Row Total":
+				previous_row_column = grand_total_columns[cint(tax.row_id) - 1]
+
+			tax_amount_column = []
+			grand_total_column = []
+			previous_grand_total_column = grand_total_columns[-1] if grand_total_columns else net_amounts
+
+			for n, item in enumerate(items):
+				tax_rate = tax_rates[item.item_tax_rate]
+				current_tax_amount = 0.0
+
+				# same as `get_current_tax_amount`
+				if tax.charge_type == "Actual":
+					if apply_tds:
+						if not item.get("apply_tds") or not doc.tax_withholding_net_total:
+							current_tax_amount = 0.0
+						else:
+							current_tax_amount = net_amounts[n] * actual / doc.tax_withholding_net_total
+					else:
+						current_tax_amount = net_amounts[n] * actual / doc.net_total if doc.net_total else 0.0
+				elif tax.charge_type == "On Net Total":
+					current_tax_amount = (tax_rate / 100.0) * net_amounts[n]
+				elif tax.charge_type in ("On Previous Row Amount", "On Previous Row Total"):
+					current_tax_amount = (tax_rate / 100.0) * previous_row_column[n]
+				elif tax.charge_type == "On Item Quantity":
+					current_tax_amount = tax_rate * item.qty
+
+				if set_item_wise_tax:
+					self.set_item_wise_tax(item, tax, tax_rate, current_tax_amount)
+
+				if round_row_wise_tax:
+					current_tax_amount = flt(current_tax_amount, tax_precision)
+
+				# Adjust divisional loss to the last item
+				if tax.charge_type == "Actual":
+					actual_tax_dict[tax.idx] -= current_tax_amount
+					if n == last_row:
+						current_tax_amount += actual_tax_dict[tax.idx]
+
+				if accumulate_tax_amount:
+					tax.tax_amount += current_tax_amount
+
+				tax.tax_amount_after_discount_amount += current_tax_amount
+				tax_amount_column.append(current_tax_amount)
+
+				current_tax_amount = self.get_tax_amount_if_for_valuation_or_deduction(
+					current_tax_amount, tax
+				)
+				grand_total_column.append(flt(previous_grand_total_column[n] + current_tax_amount))
+
+			tax_amount_columns.append(tax_amount_column)
+			grand_total_columns.append(grand_total_column)
+
+			# as left by `calculate_taxes_by_item`
+			tax.tax_amount_for_current_item = tax_amount_column[-1]
+			tax.grand_total_for_current_item = grand_total_column[-1]
 
 	def get_tax_amount_if_for_valuation_or_deduction(self, tax_amount, tax):
 		# if just for valuation, do not add the tax amount in total
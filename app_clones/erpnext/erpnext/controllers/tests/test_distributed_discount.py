@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from frappe.tests.utils import FrappeTestCase
 
 from erpnext.accounts.test.accounts_mixin import AccountsTestMixin
@@ -59,3 +61,81 @@ class TestTaxesAndTotals(AccountsTestMixin, FrappeTestCase):
 		self.assertEqual(so.total, 1500)
 		self.assertAlmostEqual(so.net_total, 1272.73, places=2)
 		self.assertEqual(so.grand_total, 1400)
+
+	def test_taxes_by_column(self):
+		def make_order(taxes, **kwargs):
+			so = make_sales_order(do_not_save=1)
+			so.update(kwargs)
+			for i in range(59):
+				so.append("items", {**so.items[0].as_dict(), "qty": i % 7 + 1, "rate": 10 + i * 3.37})
+			for tax in taxes:
+				so.append("taxes", {"cost_center": "_Test Cost Center - _TC", "description": "Tax", **tax})
+			return so
+
+		def get_totals(doc):
+			return (
+				[doc.get(f) for f in ("net_total", "grand_total", "base_grand_total", "rounding_adjustment")],
+				[
+					(d.net_amount, d.net_rate, d.base_net_amount, d.distributed_discount_amount)
+					for d in doc.items
+				],
+				[
+					(d.tax_amount, d.tax_amount_after_discount_amount, d.total, d.item_wise_tax_detail)
+					for d in doc.taxes
+				],
+			)
+
+		exclusive_taxes = [
+			{"charge_type": "On Net Total", "account_head": "_Test Account VAT - _TC", "rate": 12.5},
+			{
+				"charge_type": "Actual",
+				"account_head": "_Test Account Shipping Charges - _TC",
+				"tax_amount": 99.99,
+			},
+			{
+				"charge_type": "On Previous Row Amount",
+				"account_head": "_Test Account Education Cess - _TC",
+				"rate": 3,
+				"row_id": 1,
+			},
+			{
+				"charge_type": "On Previous Row Total",
+				"account_head": "_Test Account Service Tax - _TC",
+				"rate": 7.25,
+				"row_id": 3,
+			},
+			{
+				"charge_type": "On Item Quantity",
+				"account_head": "_Test Account Excise Duty - _TC",
+				"rate": 0.35,
+			},
+		]
+		inclusive_taxes = [
+			{
+				"charge_type": "On Net Total",
+				"account_head": "_Test Account VAT - _TC",
+				"rate": 18,
+				"included_in_print_rate": 1,
+			},
+			{
+				"charge_type": "On Previous Row Total",
+				"account_head": "_Test Account Service Tax - _TC",
+				"rate": 2.5,
+				"row_id": 1,
+				"included_in_print_rate": 1,
+			},
+		]
+
+		for taxes, kwargs in (
+			(exclusive_taxes, {}),
+			(exclusive_taxes, {"apply_discount_on": "Grand Total", "discount_amount": 333.33}),
+			(inclusive_taxes, {"apply_discount_on": "Net Total", "additional_discount_percentage": 3.5}),
+		):
+			by_item, by_column = make_order(taxes, **kwargs), make_order(taxes, **kwargs)
+
+			with patch("erpnext.controllers.taxes_and_totals.TAXES_BY_COLUMN_MIN_ITEMS", 1000):
+				calculate_taxes_and_totals(by_item)
+			with patch("erpnext.controllers.taxes_and_totals.TAXES_BY_COLUMN_MIN_ITEMS", 1):
+				calculate_taxes_and_totals(by_column)
+
+			self.assertEqual(get_totals(by_column), get_totals(by_item))
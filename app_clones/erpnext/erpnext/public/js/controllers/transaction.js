@@ -579,61 +579,54 @@ erpnext.TransactionController = class TransactionController extends erpnext.taxe
 				this.frm.fields_dict["items"].grid.grid_rows[item.idx - 1].remove();
 			} else {
 				item.pricing_rules = ''
-				return this.frm.call({
-					method: "erpnext.stock.get_item_details.get_item_details",
-					child: item,
-					args: {
-						doc: me.frm.doc,
-						args: {
-							item_code: item.item_code,
-							barcode: item.barcode,
-							serial_no: item.serial_no,
-							batch_no: item.batch_no,
-							set_warehouse: me.frm.doc.set_warehouse,
-							warehouse: item.warehouse,
-							customer: me.frm.doc.customer || me.frm.doc.party_name,
-							quotation_to: me.frm.doc.quotation_to,
-							supplier: me.frm.doc.supplier,
-							currency: me.frm.doc.currency,
-							is_internal_supplier: me.frm.doc.is_internal_supplier,
-							is_internal_customer: me.frm.doc.is_internal_customer,
-							update_stock: update_stock,
-							conversion_rate: me.frm.doc.conversion_rate,
-							price_list: me.frm.doc.selling_price_list || me.frm.doc.buying_price_list,
-							price_list_currency: me.frm.doc.price_list_currency,
-							plc_conversion_rate: me.frm.doc.plc_conversion_rate,
-							company: me.frm.doc.company,
-							order_type: me.frm.doc.order_type,
-							is_pos: cint(me.frm.doc.is_pos),
-							is_return: cint(me.frm.doc.is_return),
-							is_subcontracted: me.frm.doc.is_subcontracted,
-							ignore_pricing_rule: me.frm.doc.ignore_pricing_rule,
-							doctype: me.frm.doc.doctype,
-							name: me.frm.doc.name,
-							project: item.project || me.frm.doc.project,
-							qty: item.qty || 1,
-							net_rate: item.rate,
-							base_net_rate: item.base_net_rate,
-							stock_qty: item.stock_qty,
-							conversion_factor: item.conversion_factor,
-							weight_per_unit: item.weight_per_unit,
-							uom: item.uom,
-							weight_uom: item.weight_uom,
-							manufacturer: item.manufacturer,
-							stock_uom: item.stock_uom,
-							pos_profile: cint(me.frm.doc.is_pos) ? me.frm.doc.pos_profile : '',
-							cost_center: item.cost_center,
-							tax_category: me.frm.doc.tax_category,
-							item_tax_template: item.item_tax_template,
-							child_doctype: item.doctype,
-							child_docname: item.name,
-							is_old_subcontracting_flow: me.frm.doc.is_old_subcontracting_flow,
-							use_serial_batch_fields: item.use_serial_batch_fields,
-							serial_and_batch_bundle: item.serial_and_batch_bundle,
-						}
+				return this.get_item_details(item, {
+					item_code: item.item_code,
+					barcode: item.barcode,
+					serial_no: item.serial_no,
+					batch_no: item.batch_no,
+					set_warehouse: me.frm.doc.set_warehouse,
+					warehouse: item.warehouse,
+					customer: me.frm.doc.customer || me.frm.doc.party_name,
+					quotation_to: me.frm.doc.quotation_to,
+					supplier: me.frm.doc.supplier,
+					currency: me.frm.doc.currency,
+					is_internal_supplier: me.frm.doc.is_internal_supplier,
+					is_internal_customer: me.frm.doc.is_internal_customer,
+					update_stock: update_stock,
+					conversion_rate: me.frm.doc.conversion_rate,
+					price_list: me.frm.doc.selling_price_list || me.frm.doc.buying_price_list,
+					price_list_currency: me.frm.doc.price_list_currency,
+					plc_conversion_rate: me.frm.doc.plc_conversion_rate,
+					company: me.frm.doc.company,
+					order_type: me.frm.doc.order_type,
+					is_pos: cint(me.frm.doc.is_pos),
+					is_return: cint(me.frm.doc.is_return),
+					is_subcontracted: me.frm.doc.is_subcontracted,
+					ignore_pricing_rule: me.frm.doc.ignore_pricing_rule,
+					doctype: me.frm.doc.doctype,
+					name: me.frm.doc.name,
+					project: item.project || me.frm.doc.project,
+					qty: item.qty || 1,
+					net_rate: item.rate,
+					base_net_rate: item.base_net_rate,
+					stock_qty: item.stock_qty,
+					conversion_factor: item.conversion_factor,
+					weight_per_unit: item.weight_per_unit,
+					uom: item.uom,
+					weight_uom: item.weight_uom,
+					manufacturer: item.manufacturer,
+					stock_uom: item.stock_uom,
+					pos_profile: cint(me.frm.doc.is_pos) ? me.frm.doc.pos_profile : '',
+					cost_center: item.cost_center,
+					tax_category: me.frm.doc.tax_category,
+					item_tax_template: item.item_tax_template,
+					child_doctype: item.doctype,
+					child_docname: item.name,
+					is_old_subcontracting_flow: me.frm.doc.is_old_subcontracting_flow,
+					use_serial_batch_fields: item.use_serial_batch_fields,
+					serial_and_batch_bundle: item.serial_and_batch_bundle,
 					},
-
-					callback: function(r) {
+					function(r) {
 						if(!r.exc) {
 							frappe.run_serially([
 								() => {
@@ -726,11 +719,66 @@ erpnext.TransactionController = class TransactionController extends erpnext.taxe
 							]);
 						}
 					}
-				});
+				);
 			}
 		}
 	}
 
+	get_item_details(item, args, callback) {
+		// details of rows whose item code is set together (e.g. rows pasted in the grid)
+		// are fetched with one call to `get_items_details`
+		var me = this;
+		this.item_details_queue = this.item_details_queue || [];
+
+		return new Promise((resolve) => {
+			me.item_details_queue.push({item, args, callback, resolve});
+			if (me.item_details_queue.length > 1) return;
+
+			setTimeout(() => {
+				let queue = me.item_details_queue;
+				me.item_details_queue = [];
+
+				if (queue.length === 1) {
+					me.frm.call({
+						method: "erpnext.stock.get_item_details.get_item_details",
+						child: item,
+						args: {doc: me.frm.doc, args: args},
+						callback: (r) => resolve(callback(r)),
+						error: () => resolve(),
+					});
+					return;
+				}
+
+				frappe.call({
+					method: "erpnext.stock.get_item_details.get_items_details",
+					args: {
+						items: queue.map((d) => d.args),
+						ctx: {},
+						doc: me.frm.doc,
+					},
+					callback: (r) => {
+						let std_fields = ["doctype"].concat(frappe.model.std_fields_list, frappe.model.child_table_field_list);
+						queue.forEach((d, i) => {
+							let details = r.message && r.message[i];
+							// row may have been deleted meanwhile
+							let row = locals[d.item.doctype][d.item.name];
+							if (details && row) {
+								for (let key in details) {
+									if (!std_fields.includes(key)) row[key] = details[key];
+								}
+							}
+						});
+						new Set(queue.map((d) => d.item.parentfield)).forEach((parentfield) => {
+							me.frm.refresh_field(parentfield);
+						});
+						queue.forEach((d, i) => d.resolve(d.callback({message: r.message && r.message[i]})));
+					},
+					error: () => queue.forEach((d) => d.resolve()),
+				});
+			}, 0);
+		});
+	}
+
 	price_list_rate(doc, cdt, cdn) {
 		var item = frappe.get_doc(cdt, cdn);
 		frappe.model.round_floats_in(item, ["price_list_rate", "discount_percentage"]);
@@ -89,6 +89,25 @@ frappe.ui.form.on("Repost Item Valuation", {
 		if (frm.doc.status === "Queued" && frm.doc.docstatus === 1) {
 			frm.trigger("execute_reposting");
 		}
+
+		if (["Queued", "In Progress"].includes(frm.doc.status) && frm.doc.docstatus === 1) {
+			frm.trigger("show_reposting_backlog");
+		}
+	},
+
+	show_reposting_backlog(frm) {
+		frappe.call({
+			method: "erpnext.stock.doctype.repost_item_valuation.repost_item_valuation.get_reposting_backlog",
+			callback: function (r) {
+				if (!r.message) return;
+
+				let message = __("{0} reposts pending", [r.message.pending]);
+				if (r.message.eta) {
+					message += ", " + __("estimated time to complete: {0}", [r.message.eta]);
+				}
+				frm.dashboard.set_headline(message);
+			},
+		});
 	},
 
 	execute_reposting(frm) {
@@ -1,14 +1,24 @@
 # Copyright (c) 2020, Frappe Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
 
+import hashlib
+
 import frappe
 from frappe import _
 from frappe.desk.form.load import get_attachments
 from frappe.exceptions import QueryDeadlockError, QueryTimeoutError
 from frappe.model.document import Document
 from frappe.query_builder import DocType, Interval
-from frappe.query_builder.functions import Max, Now
-from frappe.utils import cint, get_link_to_form, get_weekday, getdate, now, nowtime
+from frappe.query_builder.functions import Count, Max, Now
+from frappe.utils import (
+	cint,
+	format_duration,
+	get_link_to_form,
+	get_weekday,
+	getdate,
+	now,
+	nowtime,
+)
 from frappe.utils.user import get_users_with_role
 from rq.timeouts import JobTimeoutException
 
@@ -17,9 +27,11 @@ from erpnext.accounts.general_ledger import validate_accounting_period
 from erpnext.accounts.utils import get_future_stock_vouchers, repost_gle_for_stock_vouchers
 from erpnext.stock.stock_ledger import (
 	get_affected_transactions,
+	get_changed_transactions,
 	get_items_to_be_repost,
 	repost_future_sle,
 )
+from erpnext.stock.utils import get_combine_datetime
 
 RecoverableErrors = (JobTimeoutException, QueryDeadlockError, QueryTimeoutError)
 
@@ -38,16 +50,19 @@ class RepostItemValuation(Document):
 		allow_zero_rate: DF.Check
 		amended_from: DF.Link | None
 		based_on: DF.Literal["Transaction", "Item and Warehouse"]
+		changed_transactions: DF.Code | None
 		company: DF.Link | None
 		current_index: DF.Int
 		distinct_item_and_warehouse: DF.Code | None
 		error_log: DF.LongText | None
 		gl_reposting_index: DF.Int
+		incremental_gl_reposting: DF.Check
 		item_code: DF.Link | None
 		items_to_be_repost: DF.Code | None
 		posting_date: DF.Date
 		posting_time: DF.Time | None
 		recreate_stock_ledgers: DF.Check
+		repost_footprint: DF.Code | None
 		reposting_data_file: DF.Attach | None
 		status: DF.Literal["Queued", "In Progress", "Completed", "Skipped", "Failed"]
 		total_reposting_count: DF.Int
@@ -376,17 +391,39 @@ def repost_gl_entries(doc):
 	if not cint(erpnext.is_perpetual_inventory_enabled(doc.company)):
 		return
 
-	# directly modified transactions
-	directly_dependent_transactions = _get_directly_dependent_vouchers(doc)
-	repost_affected_transaction = get_affected_transactions(doc)
+	# reposts created manually, e.g. to fix a difference between stock and account balances, repost
+	# GL entries of all dependent vouchers
+	if doc.incremental_gl_reposting and frappe.db.get_single_value(
+		"Stock Reposting Settings", "incremental_gl_reposting"
+	):
+		stock_vouchers = _get_changed_vouchers(doc)
+	else:
+		# directly modified transactions
+		directly_dependent_transactions = _get_directly_dependent_vouchers(doc)
+		repost_affected_transaction = get_affected_transactions(doc)
+		stock_vouchers = directly_dependent_transactions + list(repost_affected_transaction)
+
 	repost_gle_for_stock_vouchers(
-		directly_dependent_transactions + list(repost_affected_transaction),
+		stock_vouchers,
 		doc.posting_date,
 		doc.company,
 		repost_doc=doc,
 	)
 
 
+def _get_changed_vouchers(doc):
+	"""Get stock vouchers whose stock value difference was changed while reposting stock ledger
+	entries, and the transaction being reposted (its ledger entries may have been recreated)."""
+	changed_vouchers = get_changed_transactions(doc)
+
+	if doc.based_on == "Transaction" and (
+		frappe.db.get_value(doc.voucher_type, doc.voucher_no, "docstatus") == 1
+	):
+		changed_vouchers.add((doc.voucher_type, doc.voucher_no))
+
+	return list(changed_vouchers)
+
+
 def _get_directly_dependent_vouchers(doc):
 	"""Get stock vouchers that are directly affected by reposting
 	i.e. any one item-warehouse is present in the stock transaction"""
@@ -458,6 +495,13 @@ def repost_entries():
 
 	riv_entries = get_repost_item_valuation_entries()
 
+	parallel_reposting_jobs = cint(
+		frappe.db.get_single_value("Stock Reposting Settings", "parallel_reposting_jobs")
+	)
+	if parallel_reposting_jobs > 1:
+		enqueue_repost_partitions(riv_entries, parallel_reposting_jobs)
+		return
+
 	for row in riv_entries:
 		doc = frappe.get_doc("Repost Item Valuation", row.name)
 		if doc.status in ("Queued", "In Progress"):
@@ -469,6 +513,245 @@ def repost_entries():
 		return
 
 
+def enqueue_repost_partitions(riv_entries, jobs):
+	"""Enqueue reposts in up to `jobs` background jobs, reposts that share items in the same job.
+
+	Nothing is enqueued while jobs enqueued earlier are still running, the remaining entries are
+	partitioned again in the next run."""
+	from frappe.utils.background_jobs import is_job_enqueued
+
+	job_ids = [f"repost_item_valuation::partition::{i}" for i in range(jobs)]
+	if any(is_job_enqueued(job_id) for job_id in job_ids):
+		return
+
+	# largest partitions first, each to the job with the fewest reposts
+	jobs_entries = [[] for _ in job_ids]
+	for partition in sorted(get_repost_partitions(riv_entries), key=len, reverse=True):
+		min(jobs_entries, key=len).extend(partition)
+
+	for job_id, names in zip(job_ids, jobs_entries, strict=True):
+		if names:
+			frappe.enqueue(
+				repost_partition,
+				queue="long",
+				timeout=4 * 3600,
+				job_id=job_id,
+				deduplicate=True,
+				names=names,
+			)
+
+
+def get_repost_partitions(riv_entries):
+	"""Returns names of `riv_entries` partitioned so that reposts in different partitions don't
+	share any item (see `get_repost_footprint`), each partition in the order of the entries.
+
+	A repost whose footprint isn't known conflicts with every other repost, so it is returned alone
+	if it is the first entry, else it and the entries after it are left for a later run."""
+	parents = {}
+
+	def find(key):
+		while parents.setdefault(key, key) != key:
+			parents[key] = parents[parents[key]]
+			key = parents[key]
+		return key
+
+	entry_keys = {}
+	for row in riv_entries:
+		doc = frappe.get_doc("Repost Item Valuation", row.name)
+		footprint = get_repost_footprint(doc)
+		if footprint is None:
+			if not entry_keys:
+				return [[row.name]]
+			break
+
+		keys = [("item", item_code) for item_code in footprint] or [("entry", row.name)]
+		entry_keys[row.name] = keys[0]
+		for key in keys[1:]:
+			parents[find(key)] = find(keys[0])
+
+	partitions = {}
+	for name, key in entry_keys.items():
+		partitions.setdefault(find(key), []).append(name)
+
+	return list(partitions.values())
+
+
+def get_repost_footprint(doc, refresh=False, max_depth=10):
+	"""Returns items whose valuation or GL entries a repost can change, `None` if not known.
+
+	The valuation of items of the repost can change, and so can that of items made from them in
+	later manufacture, repack or subcontracting entries (up to `max_depth` levels). GL entries of
+	later stock transactions with any of those items are reposted, so their other items are
+	included too.
+
+	The footprint is saved on the repost and returned as is unless `refresh` is set, which looks
+	for items linked by transactions made since it was saved."""
+	saved = frappe.parse_json(doc.repost_footprint) if doc.repost_footprint else None
+	if saved and not refresh:
+		return set(saved.get("items"))
+
+	if saved:
+		new_valued_items = set(saved.get("valued_items"))
+	elif doc.based_on == "Transaction":
+		new_valued_items = {
+			d.item_code for d in get_items_to_be_repost(doc.voucher_type, doc.voucher_no, doc=doc)
+		}
+	else:
+		new_valued_items = {doc.item_code}
+
+	posting_datetime = get_combine_datetime(doc.posting_date, doc.posting_time or "00:00:00")
+	valued_items, items = set(), set()
+	for _depth in range(max_depth):
+		if not new_valued_items:
+			break
+
+		valued_items.update(new_valued_items)
+		items.update(get_later_voucher_items(new_valued_items, posting_datetime))
+		new_valued_items = (
+			set(get_later_voucher_items(new_valued_items, posting_datetime, made_from=True)) - valued_items
+		)
+
+	if new_valued_items:
+		return None
+
+	items.update(valued_items)
+	doc.db_set(
+		"repost_footprint",
+		frappe.as_json({"valued_items": sorted(valued_items), "items": sorted(items)}, indent=None),
+		update_modified=False,
+	)
+	return items
+
+
+def get_later_voucher_items(item_codes, posting_datetime, made_from=False):
+	"""Returns items of stock transactions posted from `posting_datetime` with any of `item_codes`.
+	With `made_from`, only items made from `item_codes` in manufacture, repack or subcontracting."""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	voucher_sle = frappe.qb.DocType("Stock Ledger Entry").as_("voucher_sle")
+
+	voucher_conditions = (
+		voucher_sle.item_code.isin(list(item_codes))
+		& (voucher_sle.posting_datetime >= posting_datetime)
+		& (voucher_sle.is_cancelled == 0)
+	)
+	item_conditions = (sle.posting_datetime >= posting_datetime) & (sle.is_cancelled == 0)
+
+	if made_from:
+		stock_entry = frappe.qb.DocType("Stock Entry")
+		purchase_receipt = frappe.qb.DocType("Purchase Receipt")
+		voucher_conditions &= (voucher_sle.actual_qty < 0) & (
+			(voucher_sle.voucher_type == "Subcontracting Receipt")
+			| (
+				(voucher_sle.voucher_type == "Stock Entry")
+				& voucher_sle.voucher_no.isin(
+					frappe.qb.from_(stock_entry)
+					.select(stock_entry.name)
+					.where(stock_entry.purpose.isin(["Manufacture", "Repack"]))
+				)
+			)
+			| (
+				(voucher_sle.voucher_type == "Purchase Receipt")
+				& voucher_sle.voucher_no.isin(
+					frappe.qb.from_(purchase_receipt)
+					.select(purchase_receipt.name)
+					.where(purchase_receipt.is_subcontracted == 1)
+				)
+			)
+		)
+		item_conditions &= sle.actual_qty > 0
+
+	vouchers = frappe.qb.from_(voucher_sle).select(voucher_sle.voucher_no).where(voucher_conditions)
+	return (
+		frappe.qb.from_(sle)
+		.select(sle.item_code)
+		.distinct()
+		.where(sle.voucher_no.isin(vouchers) & item_conditions)
+	).run(pluck=True)
+
+
+def repost_partition(names):
+	"""Repost entries of a partition in order, each while holding advisory locks on the items of its
+	footprint. Stops at an entry whose items are locked by another job, so that the remaining entries
+	are reposted in order in the next run."""
+	for name in names:
+		doc = frappe.get_doc("Repost Item Valuation", name)
+		if doc.docstatus != 1 or doc.status not in ("Queued", "In Progress"):
+			continue
+
+		# items may have been added to the footprint since the entries were partitioned
+		footprint = get_repost_footprint(doc, refresh=True)
+		lock_names = ["all"] if footprint is None else [f"item::{item_code}" for item_code in footprint]
+		if not acquire_reposting_locks(lock_names):
+			break
+
+		try:
+			repost(doc)
+			doc.deduplicate_similar_repost()
+		finally:
+			release_reposting_locks(lock_names)
+
+
+def get_reposting_lock_key(lock_name):
+	key = hashlib.sha256(f"{frappe.local.site}::repost_item_valuation::{lock_name}".encode()).digest()
+	if frappe.db.db_type == "postgres":
+		return int.from_bytes(key[:8], "big", signed=True)
+	return key.hex()[:64]
+
+
+def acquire_reposting_locks(lock_names):
+	"""Acquire database advisory locks, without waiting. Locks are released when the connection
+	closes, so a job that dies doesn't leave them behind."""
+	acquired = []
+	for lock_name in lock_names:
+		if frappe.db.db_type == "postgres":
+			query = "select pg_try_advisory_lock(%s)"
+		else:
+			query = "select get_lock(%s, 0)"
+
+		if not frappe.db.sql(query, get_reposting_lock_key(lock_name))[0][0]:
+			release_reposting_locks(acquired)
+			return False
+
+		acquired.append(lock_name)
+
+	return True
+
+
+def release_reposting_locks(lock_names):
+	for lock_name in lock_names:
+		if frappe.db.db_type == "postgres":
+			frappe.db.sql("select pg_advisory_unlock(%s)", get_reposting_lock_key(lock_name))
+		else:
+			frappe.db.sql("select release_lock(%s)", get_reposting_lock_key(lock_name))
+
+
+@frappe.whitelist()
+def get_reposting_backlog():
+	"""Returns the number of reposts in queue and the time it would take to repost them, estimated
+	from the number of reposts completed in the last day."""
+	frappe.has_permission("Repost Item Valuation", throw=True)
+
+	riv = frappe.qb.DocType("Repost Item Valuation")
+	pending = (
+		frappe.qb.from_(riv)
+		.select(Count("*"))
+		.where((riv.docstatus == 1) & riv.status.isin(["Queued", "In Progress"]))
+	).run()[0][0]
+	completed_last_day = (
+		frappe.qb.from_(riv)
+		.select(Count("*"))
+		.where(
+			(riv.docstatus == 1) & (riv.status == "Completed") & (riv.modified >= Now() - Interval(days=1))
+		)
+	).run()[0][0]
+
+	eta = None
+	if pending and completed_last_day:
+		eta = format_duration(pending * 24 * 3600 / completed_last_day)
+
+	return {"pending": pending, "completed_last_day": completed_last_day, "eta": eta}
+
+
 def get_repost_item_valuation_entries():
 	return frappe.db.sql(
 		""" SELECT name from `tabRepost Item Valuation`
@@ -2,7 +2,7 @@
 # See license.txt
 
 
-from unittest.mock import MagicMock, call
+from unittest.mock import MagicMock, call, patch
 
 import frappe
 from frappe.tests.utils import FrappeTestCase, change_settings
@@ -14,6 +14,8 @@ from erpnext.controllers.stock_controller import create_item_wise_repost_entries
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.purchase_receipt.test_purchase_receipt import make_purchase_receipt
 from erpnext.stock.doctype.repost_item_valuation.repost_item_valuation import (
+	get_repost_footprint,
+	get_repost_partitions,
 	in_configured_timeslot,
 )
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
@@ -178,6 +180,50 @@ class TestRepostItemValuation(FrappeTestCase, StockTestMixin):
 		riv4.set_status("Skipped")
 		riv3.set_status("Skipped")
 
+	def test_repost_partitions(self):
+		item_a = make_item(properties={"is_stock_item": 1}).name
+		item_b = make_item(properties={"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+
+		for item_code in (item_a, item_b):
+			make_purchase_receipt(item_code=item_code, warehouse=warehouse, qty=5, rate=100)
+
+		rivs = []
+		for item_code in (item_a, item_b):
+			riv = frappe.get_doc(
+				doctype="Repost Item Valuation",
+				based_on="Item and Warehouse",
+				item_code=item_code,
+				warehouse=warehouse,
+				posting_date=add_days(today(), -1),
+				posting_time="00:00:01",
+			)
+			riv.flags.dont_run_in_test = True
+			riv.submit()
+			rivs.append(frappe._dict(name=riv.name))
+
+		# unrelated items are reposted separately
+		self.assertEqual(get_repost_partitions(rivs), [[rivs[0].name], [rivs[1].name]])
+
+		# a later transaction with both items connects them, once footprints are refreshed
+		pr = make_purchase_receipt(item_code=item_a, warehouse=warehouse, qty=5, rate=100, do_not_submit=True)
+		pr.append("items", {**pr.items[0].as_dict(), "name": None, "item_code": item_b})
+		pr.submit()
+
+		self.assertEqual(get_repost_partitions(rivs), [[rivs[0].name], [rivs[1].name]])
+
+		riv_a = frappe.get_doc("Repost Item Valuation", rivs[0].name)
+		self.assertEqual(get_repost_footprint(riv_a, refresh=True), {item_a, item_b})
+		# valuation of the other item of the receipt doesn't change
+		self.assertEqual(frappe.parse_json(riv_a.repost_footprint).valued_items, [item_a])
+
+		for riv in rivs:
+			get_repost_footprint(frappe.get_doc("Repost Item Valuation", riv.name), refresh=True)
+		self.assertEqual(get_repost_partitions(rivs), [[rivs[0].name, rivs[1].name]])
+
+		for riv in rivs:
+			frappe.get_doc("Repost Item Valuation", riv.name).set_status("Skipped")
+
 	def test_stock_freeze_validation(self):
 		today = nowdate()
 
@@ -300,6 +346,69 @@ class TestRepostItemValuation(FrappeTestCase, StockTestMixin):
 			gle_filters={"account": "Stock In Hand - TCP1"},
 		)
 
+	@change_settings("Stock Reposting Settings", {"incremental_gl_reposting": 1})
+	def test_incremental_gl_reposting(self):
+		item = self.make_item().name
+		company = "_Test Company with perpetual inventory"
+
+		receipts = [
+			make_stock_entry(item=item, company=company, qty=1, rate=10, target="Stores - TCP1")
+			for _ in range(3)
+		]
+		consumption = make_stock_entry(item=item, company=company, qty=1, source="Stores - TCP1")
+
+		# backdated receipt only changes the value of consumption
+		with patch(
+			"erpnext.stock.doctype.repost_item_valuation.repost_item_valuation.repost_gle_for_stock_vouchers",
+			wraps=repost_gle_for_stock_vouchers,
+		) as repost_gle:
+			make_stock_entry(
+				item=item,
+				company=company,
+				qty=1,
+				rate=50,
+				target="Stores - TCP1",
+				posting_date=add_to_date(today(), days=-1),
+			)
+
+		reposted_vouchers = {voucher_no for _voucher_type, voucher_no in repost_gle.call_args.args[0]}
+		self.assertIn(consumption.name, reposted_vouchers)
+		self.assertFalse(reposted_vouchers & {d.name for d in receipts})
+
+		self.assertGLEs(
+			consumption,
+			[{"credit": 50, "debit": 0}],
+			gle_filters={"account": "Stock In Hand - TCP1"},
+		)
+
+	@change_settings("Stock Reposting Settings", {"incremental_gl_reposting": 1})
+	def test_manual_repost_reposts_all_gl_entries(self):
+		item = self.make_item().name
+		company = "_Test Company with perpetual inventory"
+
+		receipt = make_stock_entry(item=item, company=company, qty=1, rate=10, target="Stores - TCP1")
+		consumption = make_stock_entry(item=item, company=company, qty=1, source="Stores - TCP1")
+
+		riv = frappe.get_doc(
+			doctype="Repost Item Valuation",
+			based_on="Item and Warehouse",
+			item_code=item,
+			warehouse="Stores - TCP1",
+			company=company,
+			posting_date=add_to_date(today(), days=-1),
+			posting_time="00:00:01",
+		)
+		with patch(
+			"erpnext.stock.doctype.repost_item_valuation.repost_item_valuation.repost_gle_for_stock_vouchers",
+			wraps=repost_gle_for_stock_vouchers,
+		) as repost_gle:
+			riv.submit()
+
+		# nothing changed in the stock ledger, but GL entries of all the vouchers are reposted
+		self.assertFalse(riv.incremental_gl_reposting)
+		reposted_vouchers = {voucher_no for _voucher_type, voucher_no in repost_gle.call_args.args[0]}
+		self.assertEqual(reposted_vouchers, {receipt.name, consumption.name})
+
 	def test_duplicate_ple_on_repost(self):
 		from erpnext.accounts import utils
 
@@ -17,12 +17,14 @@ class StockRepostingSettings(Document):
 		from frappe.types import DF
 
 		end_time: DF.Time | None
+		incremental_gl_reposting: DF.Check
 		item_based_reposting: DF.Check
 		limit_reposting_timeslot: DF.Check
 		limits_dont_apply_on: DF.Literal[
 			"", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"
 		]
 		notify_reposting_error_to_role: DF.Link | None
+		parallel_reposting_jobs: DF.Int
 		start_time: DF.Time | None
 	# end: auto-generated types
 
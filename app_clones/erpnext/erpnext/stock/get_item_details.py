@@ -3,6 +3,8 @@
 
 
 import json
+from collections import defaultdict
+from contextlib import contextmanager
 
 import frappe
 from frappe import _, throw
@@ -137,6 +139,358 @@ def get_item_details(args, doc=None, for_validate=False, overwrite_warehouse=Tru
 	return out
 
 
+@frappe.whitelist()
+def get_items_details(items, ctx, doc=None, for_validate=False, overwrite_warehouse=True):
+	"""Returns `get_item_details` of each of `items`, in the same order.
+
+	:param items: list of item level args (`item_code`, `qty`, `uom`, `warehouse`...)
+	:param ctx: transaction level args, shared by all the items (see `get_item_details`)
+
+	Item Prices, Bins, UOM conversion factors and pricing rules of all the items are fetched
+	together instead of for every item.
+	"""
+	items = parse_json(items)
+	ctx = parse_json(ctx) or {}
+	if isinstance(doc, str):
+		doc = json.loads(doc)
+
+	items_args = [{**ctx, **item} for item in items]
+	with prefetch_items_details(
+		items_args, ignore_pricing_rule=all(args.get("ignore_pricing_rule") for args in items_args)
+	):
+		return [
+			get_item_details(args, doc, for_validate=for_validate, overwrite_warehouse=overwrite_warehouse)
+			for args in items_args
+		]
+
+
+@contextmanager
+def prefetch_items_details(items_args, ignore_pricing_rule=False):
+	"""Sets `ItemDetailsPrefetch` and `PricingRuleIndex` of the items as flags within the block."""
+	from erpnext.accounts.doctype.pricing_rule.utils import get_pricing_rule_index
+
+	# may be called while details of another set of items are being fetched
+	previous_prefetch = frappe.flags.item_details_prefetch
+	previous_index = frappe.flags.pricing_rule_index
+
+	frappe.flags.item_details_prefetch = ItemDetailsPrefetch(items_args)
+	frappe.flags.pricing_rule_index = get_pricing_rule_index(
+		items_args, ignore_pricing_rule=ignore_pricing_rule
+	)
+	try:
+		yield
+	finally:
+		frappe.flags.item_details_prefetch = previous_prefetch
+		frappe.flags.pricing_rule_index = previous_index
+
+
+class ItemDetailsPrefetch:
+	"""Item Prices, Bins and UOM conversion factors of the items of a transaction.
+
+	Instead of querying them for every item, rows of all the items are fetched with a query per
+	table, and `get_item_price`, `get_bin_details` and `get_conversion_factor` pick the rows of an
+	item from them with the same conditions and order. Lookups for items, price lists, parties or
+	warehouses that weren't known when the rows were fetched return `None` and are left to the query.
+
+	Items that aren't in the document cache yet are fetched along with their child tables
+	(Item Defaults, Item Taxes...) with a query per table, and cached for `get_cached_doc`.
+
+	Set as `frappe.flags.item_details_prefetch` while items of a transaction are processed.
+	"""
+
+	def __init__(self, items_args):
+		from erpnext.accounts.doctype.pricing_rule.utils import get_index_key
+
+		# keys of prefetched values, mapped to the values
+		self.item_codes = {}
+		self.price_lists = {}
+		self.customers = {}
+		self.suppliers = {}
+		self.warehouses = {}
+		self.variant_of = {}
+		self.child_warehouses = {}
+
+		self.item_prices = defaultdict(list)
+		self.bins = {}
+		self.conversion_factors = defaultdict(list)
+		self.company_total_stock = {}
+
+		items = self.get_items([args.get("item_code") for args in items_args])
+		items |= self.get_items([item.variant_of for item in items.values()])
+
+		for args in items_args:
+			item_code = args.get("item_code")
+			if not (item := items.get(get_index_key(item_code or ""))):
+				continue
+
+			self.item_codes[get_index_key(item_code)] = item_code
+			self.variant_of[get_index_key(item_code)] = item.variant_of
+			if item.variant_of:
+				self.item_codes[get_index_key(item.variant_of)] = item.variant_of
+
+			# same as `process_args`
+			price_list = (
+				args.get("price_list") or args.get("selling_price_list") or args.get("buying_price_list")
+			)
+			if price_list:
+				self.price_lists[get_index_key(price_list)] = price_list
+
+			for party_type, values in (("customer", self.customers), ("supplier", self.suppliers)):
+				if args.get(party_type):
+					values[get_index_key(args.get(party_type))] = args.get(party_type)
+
+			warehouses = [args.get(f) for f in ("warehouse", "set_warehouse", "from_warehouse")]
+			warehouses += [
+				d.default_warehouse for d in item.item_defaults if d.company == args.get("company")
+			]
+			for warehouse in filter(None, warehouses):
+				self.add_warehouse(warehouse)
+
+		if not self.item_codes:
+			return
+
+		if self.price_lists:
+			self.fetch_item_prices()
+		if self.warehouses:
+			self.fetch_bins()
+		self.fetch_conversion_factors()
+
+	def get_items(self, item_codes):
+		"""Items by index key, from the document cache or fetched with a query per table"""
+		from erpnext.accounts.doctype.pricing_rule.utils import get_index_key
+
+		items, missing = {}, {}
+		for item_code in dict.fromkeys(filter(None, item_codes)):
+			if item := frappe.cache.get_value(frappe.get_document_cache_key("Item", item_code)):
+				items[get_index_key(item_code)] = item
+			else:
+				missing.setdefault(get_index_key(item_code), []).append(item_code)
+
+		if not missing:
+			return items
+
+		# same as `Document.load_from_db`, for all the items
+		item_codes = [item_codes[0] for item_codes in missing.values()]
+		rows = frappe.db.get_values("Item", {"name": ("in", item_codes)}, "*", as_dict=True, order_by=None)
+		if not rows:
+			return items
+
+		children = defaultdict(lambda: defaultdict(list))
+		for df in frappe.get_meta("Item").get_table_fields():
+			for row in frappe.db.get_values(
+				df.options,
+				{
+					"parent": ("in", [row.name for row in rows]),
+					"parenttype": "Item",
+					"parentfield": df.fieldname,
+				},
+				"*",
+				as_dict=True,
+				order_by="idx asc",
+			):
+				children[row.parent][df.fieldname].append(row)
+
+		for row in rows:
+			item = frappe.get_doc({**row, "doctype": "Item", **children[row.name]})
+			for item_code in missing.get(get_index_key(row.name), []):
+				frappe.cache.set_value(frappe.get_document_cache_key("Item", item_code), item)
+			items[get_index_key(row.name)] = item
+
+		return items
+
+	def add_warehouse(self, warehouse):
+		from erpnext.accounts.doctype.pricing_rule.utils import get_index_key
+		from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
+
+		if get_index_key(warehouse) in self.child_warehouses:
+			return
+
+		# bins are fetched with child warehouses, see `update_bin_details`
+		child_warehouses = get_child_warehouses(warehouse)
+		self.child_warehouses[get_index_key(warehouse)] = child_warehouses
+		for child_warehouse in child_warehouses:
+			self.warehouses[get_index_key(child_warehouse)] = child_warehouse
+
+	def fetch_item_prices(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import get_index_key
+
+		ip = frappe.qb.DocType("Item Price")
+		party_condition = (IfNull(ip.customer, "") == "") & (IfNull(ip.supplier, "") == "")
+		if self.customers:
+			party_condition |= ip.customer.isin(list(self.customers.values()))
+		if self.suppliers:
+			party_condition |= ip.supplier.isin(list(self.suppliers.values()))
+
+		# same order as `get_item_price`, kept for the rows of every item and price list
+		item_prices = (
+			frappe.qb.from_(ip)
+			.select(
+				ip.name,
+				ip.price_list_rate,
+				ip.uom,
+				ip.item_code,
+				ip.price_list,
+				ip.batch_no,
+				ip.customer,
+				ip.supplier,
+				ip.valid_from,
+				ip.valid_upto,
+			)
+			.where(
+				ip.item_code.isin(list(self.item_codes.values()))
+				& ip.price_list.isin(list(self.price_lists.values()))
+				& party_condition
+			)
+			.orderby(ip.valid_from, order=frappe.qb.desc)
+			.orderby(IfNull(ip.batch_no, ""), order=frappe.qb.desc)
+			.orderby(ip.uom, order=frappe.qb.desc)
+		).run(as_dict=True)
+
+		for row in item_prices:
+			self.item_prices[(get_index_key(row.item_code), get_index_key(row.price_list))].append(row)
+
+	def fetch_bins(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import get_index_key
+
+		bin = frappe.qb.DocType("Bin")
+		bins = (
+			frappe.qb.from_(bin)
+			.select(bin.item_code, bin.warehouse, bin.projected_qty, bin.actual_qty, bin.reserved_qty)
+			.where(
+				bin.item_code.isin(list(self.item_codes.values()))
+				& bin.warehouse.isin(list(self.warehouses.values()))
+			)
+		).run(as_dict=True)
+
+		for row in bins:
+			self.bins[(get_index_key(row.item_code), get_index_key(row.warehouse))] = row
+
+	def fetch_conversion_factors(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import get_index_key
+
+		ucd = frappe.qb.DocType("UOM Conversion Detail")
+		conversion_factors = (
+			frappe.qb.from_(ucd)
+			.select(ucd.parent, ucd.uom, ucd.conversion_factor)
+			.where(ucd.parent.isin(list(self.item_codes.values())))
+		).run(as_dict=True)
+
+		for row in conversion_factors:
+			self.conversion_factors[(get_index_key(row.parent), get_index_key(row.uom))].append(row)
+
+	def has_item(self, item_code):
+		from erpnext.accounts.doctype.pricing_rule.utils import get_index_key
+
+		return get_index_key(item_code) in self.item_codes
+
+	def get_item_price(self, args, item_code, ignore_party=False, force_batch_no=False):
+		"""Returns the same rows as `get_item_price`, `None` if they weren't prefetched."""
+		from erpnext.accounts.doctype.pricing_rule.utils import get_index_key
+
+		customer, supplier, batch_no = args.get("customer"), args.get("supplier"), args.get("batch_no")
+		if (
+			ignore_party
+			or (force_batch_no and not batch_no)
+			or not self.has_item(item_code)
+			or get_index_key(args.get("price_list")) not in self.price_lists
+			or (customer and get_index_key(customer) not in self.customers)
+			or (not customer and supplier and get_index_key(supplier) not in self.suppliers)
+		):
+			return None
+
+		uoms = ("", get_index_key(args.get("uom")))
+		batches = (get_index_key(batch_no),) if force_batch_no else ("", get_index_key(batch_no))
+
+		transaction_date = getdate(args["transaction_date"]) if args.get("transaction_date") else None
+		min_date, max_date = getdate("2000-01-01"), getdate("2500-12-31")
+
+		item_price = []
+		for row in self.item_prices[(get_index_key(item_code), get_index_key(args.get("price_list")))]:
+			if get_index_key(row.uom) not in uoms or get_index_key(row.batch_no) not in batches:
+				continue
+
+			if customer:
+				if not row.customer or get_index_key(row.customer) != get_index_key(customer):
+					continue
+			elif supplier:
+				if not row.supplier or get_index_key(row.supplier) != get_index_key(supplier):
+					continue
+			elif row.customer or row.supplier:
+				continue
+
+			if transaction_date and not (
+				(row.valid_from or min_date) <= transaction_date <= (row.valid_upto or max_date)
+			):
+				continue
+
+			item_price.append((row.name, row.price_list_rate, row.uom))
+
+		return tuple(item_price)
+
+	def get_bin_details(self, item_code, warehouse, include_child_warehouses=False):
+		"""Returns the same quantities as `get_bin_details`, `None` if they weren't prefetched."""
+		from erpnext.accounts.doctype.pricing_rule.utils import get_index_key
+
+		if not self.has_item(item_code):
+			return None
+
+		if include_child_warehouses:
+			warehouses = self.child_warehouses.get(get_index_key(warehouse))
+		elif get_index_key(warehouse) in self.warehouses:
+			warehouses = [warehouse]
+		else:
+			warehouses = None
+
+		if warehouses is None:
+			return None
+
+		bin_details = frappe._dict({"projected_qty": 0, "actual_qty": 0, "reserved_qty": 0})
+		for bin_warehouse in warehouses:
+			if bin := self.bins.get((get_index_key(item_code), get_index_key(bin_warehouse))):
+				for fieldname in bin_details:
+					bin_details[fieldname] += bin[fieldname] or 0
+
+		return bin_details
+
+	def get_company_total_stock(self, item_code, company):
+		from erpnext.accounts.doctype.pricing_rule.utils import get_index_key
+
+		if company not in self.company_total_stock:
+			bin = frappe.qb.DocType("Bin")
+			wh = frappe.qb.DocType("Warehouse")
+
+			self.company_total_stock[company] = {
+				get_index_key(item): actual_qty
+				for item, actual_qty in (
+					frappe.qb.from_(bin)
+					.inner_join(wh)
+					.on(bin.warehouse == wh.name)
+					.select(bin.item_code, Sum(bin.actual_qty))
+					.where((wh.company == company) & bin.item_code.isin(list(self.item_codes.values())))
+					.groupby(bin.item_code)
+				).run()
+			}
+
+		return self.company_total_stock[company].get(get_index_key(item_code))
+
+	def get_conversion_factor(self, item_code, uom):
+		"""Returns the conversion factor of the only UOM Conversion Detail of the item (or its
+		template) for `uom`, `None` if it wasn't prefetched or there are more of them."""
+		from erpnext.accounts.doctype.pricing_rule.utils import get_index_key
+
+		if not self.has_item(item_code):
+			return None
+
+		variant_of = self.variant_of.get(get_index_key(item_code))
+		rows = [
+			row
+			for parent in filter(None, (item_code, variant_of))
+			for row in self.conversion_factors.get((get_index_key(parent), get_index_key(uom)), [])
+		]
+
+		return rows[0].conversion_factor if len(rows) == 1 else None
+
+
 def remove_standard_fields(details):
 	for key in child_table_fields + default_fields:
 		details.pop(key, None)
@@ -1028,6 +1382,12 @@ def get_item_price(args, item_code, ignore_party=False, force_batch_no=False) ->
 	:param item_code: str, Item Doctype field item_code
 	"""
 
+	prefetch = frappe.flags.item_details_prefetch
+	if prefetch:
+		item_price = prefetch.get_item_price(args, item_code, ignore_party, force_batch_no)
+		if item_price is not None:
+			return item_price
+
 	ip = frappe.qb.DocType("Item Price")
 	query = (
 		frappe.qb.from_(ip)
@@ -1282,12 +1642,17 @@ def get_pos_profile(company, pos_profile=None, user=None):
 
 @frappe.whitelist()
 def get_conversion_factor(item_code, uom):
-	variant_of = frappe.db.get_value("Item", item_code, "variant_of", cache=True)
-	filters = {"parent": item_code, "uom": uom}
+	prefetch = frappe.flags.item_details_prefetch
+	conversion_factor = prefetch and prefetch.get_conversion_factor(item_code, uom)
+
+	if not conversion_factor:
+		variant_of = frappe.db.get_value("Item", item_code, "variant_of", cache=True)
+		filters = {"parent": item_code, "uom": uom}
+
+		if variant_of:
+			filters["parent"] = ("in", (item_code, variant_of))
+		conversion_factor = frappe.db.get_value("UOM Conversion Detail", filters, "conversion_factor")
 
-	if variant_of:
-		filters["parent"] = ("in", (item_code, variant_of))
-	conversion_factor = frappe.db.get_value("UOM Conversion Detail", filters, "conversion_factor")
 	if not conversion_factor:
 		stock_uom = frappe.db.get_value("Item", item_code, "stock_uom")
 		conversion_factor = get_uom_conv_factor(uom, stock_uom)
@@ -1307,8 +1672,15 @@ def get_projected_qty(item_code, warehouse):
 @frappe.whitelist()
 def get_bin_details(item_code, warehouse, company=None, include_child_warehouses=False):
 	bin_details = {"projected_qty": 0, "actual_qty": 0, "reserved_qty": 0}
+	prefetch = frappe.flags.item_details_prefetch
+	prefetched = (
+		warehouse and prefetch and prefetch.get_bin_details(item_code, warehouse, include_child_warehouses)
+	)
 
-	if warehouse:
+	if prefetched:
+		bin_details = prefetched
+
+	elif warehouse:
 		from frappe.query_builder.functions import Coalesce, Sum
 
 		from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
@@ -1333,6 +1705,10 @@ def get_bin_details(item_code, warehouse, company=None, include_child_warehouses
 
 
 def get_company_total_stock(item_code, company):
+	prefetch = frappe.flags.item_details_prefetch
+	if prefetch and prefetch.has_item(item_code):
+		return prefetch.get_company_total_stock(item_code, company)
+
 	bin = frappe.qb.DocType("Bin")
 	wh = frappe.qb.DocType("Warehouse")
 
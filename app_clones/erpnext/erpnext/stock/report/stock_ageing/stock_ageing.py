@@ -2,6 +2,7 @@
 # License: GNU General Public License v3. See license.txt
 
 
+from collections import deque
 from collections.abc import Iterator
 from operator import itemgetter
 
@@ -283,6 +284,9 @@ class FIFOSlots:
 			# Note that stock_ledger_entries is an iterator, you can not reuse it like a list
 			del stock_ledger_entries
 
+		for row in self.item_details.values():
+			row["fifo_queue"] = list(row["fifo_queue"])
+
 		if not self.filters.get("show_warehouse_wise_stock"):
 			# (Item 1, WH 1), (Item 1, WH 2) => (Item 1)
 			self.item_details = self.__aggregate_details_by_item(self.item_details)
@@ -293,15 +297,18 @@ class FIFOSlots:
 		"Initialise keys and FIFO Queue."
 
 		key = (row.name, row.warehouse)
-		self.item_details.setdefault(key, {"details": row, "fifo_queue": []})
+		if key not in self.item_details:
+			# slots are consumed from the head, deque keeps it O(1)
+			self.item_details[key] = {"details": row, "fifo_queue": deque()}
 		fifo_queue = self.item_details[key]["fifo_queue"]
 
 		transferred_item_key = (row.voucher_no, row.name, row.warehouse)
-		self.transferred_item_details.setdefault(transferred_item_key, [])
+		if transferred_item_key not in self.transferred_item_details:
+			self.transferred_item_details[transferred_item_key] = deque()
 
 		return key, fifo_queue, transferred_item_key
 
-	def __compute_incoming_stock(self, row: dict, fifo_queue: list, transfer_key: tuple, serial_nos: list):
+	def __compute_incoming_stock(self, row: dict, fifo_queue: deque, transfer_key: tuple, serial_nos: list):
 		"Update FIFO Queue on inward stock."
 
 		transfer_data = self.transferred_item_details.get(transfer_key)
@@ -333,10 +340,13 @@ class FIFOSlots:
 					self.serial_no_batch_purchase_details.setdefault(serial_no, row.posting_date)
 					fifo_queue.append([serial_no, row.posting_date, valuation])
 
-	def __compute_outgoing_stock(self, row: dict, fifo_queue: list, transfer_key: tuple, serial_nos: list):
+	def __compute_outgoing_stock(self, row: dict, fifo_queue: deque, transfer_key: tuple, serial_nos: list):
 		"Update FIFO Queue on outward stock."
 		if serial_nos:
-			fifo_queue[:] = [serial_no for serial_no in fifo_queue if serial_no[0] not in serial_nos]
+			serial_nos = set(serial_nos)
+			remaining_slots = [serial_no for serial_no in fifo_queue if serial_no[0] not in serial_nos]
+			fifo_queue.clear()
+			fifo_queue.extend(remaining_slots)
 			return
 
 		qty_to_pop = abs(row.actual_qty)
@@ -349,7 +359,7 @@ class FIFOSlots:
 				# if +ve and not enough or exactly same balance in current slot, consume whole slot
 				qty_to_pop -= flt(slot[0])
 				stock_value -= flt(slot[2])
-				self.transferred_item_details[transfer_key].append(fifo_queue.pop(0))
+				self.transferred_item_details[transfer_key].append(fifo_queue.popleft())
 			elif not fifo_queue:
 				# negative stock, no balance but qty yet to consume
 				fifo_queue.append([-(qty_to_pop), row.posting_date, -(stock_value)])
@@ -367,7 +377,7 @@ class FIFOSlots:
 				qty_to_pop = 0
 				stock_value = 0
 
-	def __adjust_incoming_transfer_qty(self, transfer_data: dict, fifo_queue: list, row: dict):
+	def __adjust_incoming_transfer_qty(self, transfer_data: deque, fifo_queue: deque, row: dict):
 		"Add previously removed stock back to FIFO Queue."
 		transfer_qty_to_pop = flt(row.actual_qty)
 		stock_value = flt(row.stock_value_difference)
@@ -386,7 +396,7 @@ class FIFOSlots:
 				# bucket qty is not enough, consume whole
 				transfer_qty_to_pop -= transfer_data[0][0]
 				stock_value -= transfer_data[0][2]
-				add_to_fifo_queue(transfer_data.pop(0))
+				add_to_fifo_queue(transfer_data.popleft())
 			elif not transfer_data:
 				# transfer bucket is empty, extra incoming qty
 				add_to_fifo_queue([transfer_qty_to_pop, row.posting_date, stock_value])
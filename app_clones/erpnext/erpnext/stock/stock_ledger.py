@@ -259,6 +259,7 @@ def repost_future_sle(
 
 	distinct_item_warehouses = get_distinct_item_warehouse(args, doc, reposting_data=reposting_data)
 	affected_transactions = get_affected_transactions(doc, reposting_data=reposting_data)
+	changed_transactions = get_changed_transactions(doc, reposting_data=reposting_data)
 
 	i = get_current_index(doc) or 0
 	while i < len(args):
@@ -279,6 +280,7 @@ def repost_future_sle(
 			via_landed_cost_voucher=via_landed_cost_voucher,
 		)
 		affected_transactions.update(obj.affected_transactions)
+		changed_transactions.update(obj.changed_transactions)
 
 		key = (args[i].get("item_code"), args[i].get("warehouse"))
 		if distinct_item_warehouses.get(key):
@@ -299,7 +301,7 @@ def repost_future_sle(
 
 		if doc:
 			update_args_in_repost_item_valuation(
-				doc, i, args, distinct_item_warehouses, affected_transactions
+				doc, i, args, distinct_item_warehouses, affected_transactions, changed_transactions
 			)
 
 
@@ -340,7 +342,9 @@ def validate_item_warehouse(args):
 			frappe.throw(_(validation_msg))
 
 
-def update_args_in_repost_item_valuation(doc, index, args, distinct_item_warehouses, affected_transactions):
+def update_args_in_repost_item_valuation(
+	doc, index, args, distinct_item_warehouses, affected_transactions, changed_transactions=None
+):
 	if not doc.items_to_be_repost:
 		file_name = ""
 		if doc.reposting_data_file:
@@ -352,6 +356,7 @@ def update_args_in_repost_item_valuation(doc, index, args, distinct_item_warehou
 				"items_to_be_repost": args,
 				"distinct_item_and_warehouse": {str(k): v for k, v in distinct_item_warehouses.items()},
 				"affected_transactions": affected_transactions,
+				"changed_transactions": changed_transactions or set(),
 			},
 			doc,
 			file_name,
@@ -374,6 +379,7 @@ def update_args_in_repost_item_valuation(doc, index, args, distinct_item_warehou
 				),
 				"current_index": index,
 				"affected_transactions": frappe.as_json(affected_transactions),
+				"changed_transactions": frappe.as_json(changed_transactions or set()),
 			}
 		)
 
@@ -514,6 +520,21 @@ def get_affected_transactions(doc, reposting_data=None) -> set[tuple[str, str]]:
 	return {tuple(transaction) for transaction in transactions}
 
 
+def get_changed_transactions(doc, reposting_data=None) -> set[tuple[str, str]]:
+	"""Transactions whose stock value difference was changed by the repost."""
+	if not reposting_data and doc and doc.reposting_data_file:
+		reposting_data = get_reposting_data(doc.reposting_data_file)
+
+	if reposting_data and reposting_data.changed_transactions:
+		return {tuple(transaction) for transaction in reposting_data.changed_transactions}
+
+	if not doc or not doc.get("changed_transactions"):
+		return set()
+
+	transactions = frappe.parse_json(doc.changed_transactions)
+	return {tuple(transaction) for transaction in transactions}
+
+
 def get_current_index(doc=None):
 	if doc and doc.current_index:
 		return doc.current_index
@@ -563,6 +584,7 @@ class update_entries_after:
 		self.new_items_found = False
 		self.distinct_item_warehouses = args.get("distinct_item_warehouses", frappe._dict())
 		self.affected_transactions: set[tuple[str, str]] = set()
+		self.changed_transactions: set[tuple[str, str]] = set()
 		self.reserved_stock = self.get_reserved_stock()
 
 		self.data = frappe._dict()
@@ -803,6 +825,7 @@ class update_entries_after:
 
 		self.validate_previous_sle_qty(sle)
 		self.affected_transactions.add((sle.voucher_type, sle.voucher_no))
+		previous_stock_value_difference = flt(sle.stock_value_difference, self.currency_precision)
 
 		if (sle.serial_no and not self.via_landed_cost_voucher) or not cint(self.allow_negative_stock):
 			# validate negative stock for serialized items, fifo valuation
@@ -918,6 +941,9 @@ class update_entries_after:
 				* -1
 			)
 
+		if flt(sle.stock_value_difference, self.currency_precision) != previous_stock_value_difference:
+			self.changed_transactions.add((sle.voucher_type, sle.voucher_no))
+
 		sle.doctype = "Stock Ledger Entry"
 		frappe.get_doc(sle).db_update()
 
@@ -1401,6 +1427,17 @@ class update_entries_after:
 				if not allow_zero_valuation_rate:
 					self.wh_data.valuation_rate = self.get_fallback_rate(sle)
 
+	def get_valuation_queue(self):
+		"""Valuation queue of current warehouse, reused across entries while its state is untouched."""
+		valuation_queue, state = self.wh_data.get("valuation_queue") or (None, None)
+		if valuation_queue is not None and state is self.wh_data.stock_queue:
+			return valuation_queue
+
+		if self.valuation_method == "LIFO":
+			return LIFOValuation(self.wh_data.stock_queue)
+		else:
+			return FIFOValuation(self.wh_data.stock_queue)
+
 	def update_queue_values(self, sle):
 		incoming_rate = flt(sle.incoming_rate)
 		actual_qty = flt(sle.actual_qty)
@@ -1410,10 +1447,7 @@ class update_entries_after:
 			self.wh_data.qty_after_transaction + actual_qty
 		)
 
-		if self.valuation_method == "LIFO":
-			stock_queue = LIFOValuation(self.wh_data.stock_queue)
-		else:
-			stock_queue = FIFOValuation(self.wh_data.stock_queue)
+		stock_queue = self.get_valuation_queue()
 
 		_prev_qty, prev_stock_value = stock_queue.get_total_stock_and_value()
 
@@ -1445,6 +1479,10 @@ class update_entries_after:
 			self.wh_data.stock_queue.append(
 				[0, sle.incoming_rate or sle.outgoing_rate or self.wh_data.valuation_rate]
 			)
+			# queue is updated outside the valuation object, rebuild it for next entry
+			self.wh_data.valuation_queue = None
+		else:
+			self.wh_data.valuation_queue = (stock_queue, self.wh_data.stock_queue)
 
 		if self.wh_data.qty_after_transaction:
 			self.wh_data.valuation_rate = self.wh_data.stock_value / self.wh_data.qty_after_transaction
@@ -1521,7 +1559,17 @@ class update_entries_after:
 
 	def get_sle_after_datetime(self, args):
 		"""get Stock Ledger Entries after a particular datetime, for reposting"""
-		return get_stock_ledger_entries(args, ">", "asc", for_update=True, check_serial_no=False)
+		# stock queue of every entry being reposted is rebuilt from the previous entry's queue,
+		# don't load (potentially huge) queues that are going to be overwritten
+		fields = [
+			f"`{column}`"
+			for column in frappe.db.get_table_columns("Stock Ledger Entry")
+			if column != "stock_queue"
+		]
+
+		return get_stock_ledger_entries(
+			args, ">", "asc", for_update=True, check_serial_no=False, fields=", ".join(fields)
+		)
 
 	def raise_exceptions(self):
 		msg_list = []
@@ -1666,6 +1714,7 @@ def get_stock_ledger_entries(
 	debug=False,
 	check_serial_no=True,
 	extra_cond=None,
+	fields="*",
 ):
 	"""get stock ledger entries filtered by specific posting datetime conditions"""
 	conditions = f" and posting_datetime {operator} %(posting_datetime)s"
@@ -1711,13 +1760,14 @@ def get_stock_ledger_entries(
 	# nosemgrep
 	return frappe.db.sql(
 		"""
-		select *, posting_datetime as "timestamp"
+		select {fields}, posting_datetime as "timestamp"
 		from `tabStock Ledger Entry`
 		where item_code = %(item_code)s
 		and is_cancelled = 0
 		{conditions}
 		order by posting_datetime {order}, creation {order}
 		{limit} {for_update}""".format(
+			fields=fields,
 			conditions=conditions,
 			limit=limit or "",
 			for_update=for_update and "for update" or "",
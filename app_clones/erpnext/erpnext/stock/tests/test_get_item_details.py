@@ -1,8 +1,10 @@
+from unittest.mock import patch
+
 import frappe
 from frappe.test_runner import make_test_records
 from frappe.tests.utils import FrappeTestCase
 
-from erpnext.stock.get_item_details import get_item_details
+from erpnext.stock.get_item_details import get_item_details, get_items_details
 
 test_ignore = ["BOM"]
 test_dependencies = ["Customer", "Supplier", "Item", "Price List", "Item Price"]
@@ -35,6 +37,78 @@ class TestGetItemDetail(FrappeTestCase):
 		details = get_item_details(args)
 		self.assertEqual(details.get("price_list_rate"), 100)
 
+	def test_get_items_details(self):
+		ctx = {
+			"company": "_Test Company",
+			"customer": "_Test Customer",
+			"conversion_rate": 1.0,
+			"price_list_currency": "INR",
+			"plc_conversion_rate": 1.0,
+			"doctype": "Sales Order",
+			"name": None,
+			"transaction_date": "2013-02-02",
+			"price_list": "_Test Price List",
+			"ignore_pricing_rule": 1,
+		}
+		items = [
+			{"item_code": "_Test Item", "qty": 5, "warehouse": "_Test Warehouse - _TC"},
+			{"item_code": "_Test Item 2", "qty": 1},
+			{"item_code": "_Test Item", "qty": 1, "uom": "_Test UOM 1"},
+		]
+
+		expected = [get_item_details({**ctx, **item}) for item in items]
+		self.assertEqual(get_items_details(items, ctx), expected)
+		self.assertIsNone(frappe.flags.item_details_prefetch)
+
+		# nested calls restore the prefetch of the outer call
+		outer_prefetch = frappe._dict()
+		frappe.flags.item_details_prefetch = outer_prefetch
+		try:
+			get_items_details(items[:1], ctx)
+			self.assertIs(frappe.flags.item_details_prefetch, outer_prefetch)
+		finally:
+			frappe.flags.item_details_prefetch = None
+
+	def test_get_items_details_with_pricing_rules(self):
+		from erpnext.accounts.doctype.pricing_rule.test_pricing_rule import make_pricing_rule
+
+		make_pricing_rule(selling=1, discount_percentage=10, title="_Test Items Details Rule")
+		ctx = {
+			"company": "_Test Company",
+			"customer": "_Test Customer",
+			"conversion_rate": 1.0,
+			"price_list_currency": "INR",
+			"plc_conversion_rate": 1.0,
+			"doctype": "Sales Order",
+			"name": None,
+			"transaction_date": "2013-02-02",
+			"price_list": "_Test Price List",
+		}
+		items = [
+			{"item_code": "_Test Item", "qty": 5, "warehouse": "_Test Warehouse - _TC"},
+			{"item_code": "_Test Item 2", "qty": 1},
+			{"item_code": "_Test Item", "qty": 1, "uom": "_Test UOM 1"},
+		]
+
+		expected = [get_item_details({**ctx, **item}) for item in items]
+		actual = get_items_details(items, ctx)
+		self.assertEqual(actual, expected)
+		self.assertEqual(actual[0].discount_percentage, 10)
+
+		def run_with_cold_item_cache(items):
+			frappe.clear_document_cache("Item")
+			with patch.object(frappe.db, "sql", wraps=frappe.db.sql) as sql:
+				get_items_details(items, ctx)
+			return sql.call_count
+
+		# more rows of the same items don't run more queries
+		queries = run_with_cold_item_cache(items)
+		with self.assertQueryCount(queries):
+			frappe.clear_document_cache("Item")
+			get_items_details(items * 10, ctx)
+
+		frappe.db.rollback()
+
 	# making this test in get_item_details test file as feat/fix is present in that method
 	def test_fetch_price_from_list_rate_on_doc_save(self):
 		# create item
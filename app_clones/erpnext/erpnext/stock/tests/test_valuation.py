@@ -107,6 +107,32 @@ class TestFIFOValuation(unittest.TestCase):
 		self.queue.remove_stock(1.0 - 1e-9)
 		self.assertTotalQty(0)
 
+	def test_state_is_preserved(self):
+		state = [[1, 10], [2, 20], [3, 30]]
+		self.queue = FIFOValuation(json.loads(json.dumps(state)))
+
+		self.assertIsInstance(self.queue.state, list)
+		self.assertEqual(self.queue.state, state)
+		self.assertEqual(self.queue.get_total_stock_and_value(), (6, 140))
+
+		self.queue.remove_stock(1, 20)
+		self.queue.remove_stock(1, 40)
+		self.assertEqual(json.loads(json.dumps(self.queue.state)), [[1, 20], [3, 30]])
+		self.assertEqual(FIFOValuation(self.queue.state).get_total_stock_and_value(), (4, 110))
+
+	def test_totals_depend_only_on_bins(self):
+		for qty, rate in [(0.1, 10.3), (0.2, 7.7), (0.7, 3.1), (1.3, 0.37)]:
+			self.queue.add_stock(qty, rate)
+			self.queue.get_total_stock_and_value()
+		self.queue.remove_stock(0.15)
+		self.queue.remove_stock(0.55, 7.7)
+
+		# same totals as a queue built from the same bins, to the last decimal
+		self.assertEqual(
+			self.queue.get_total_stock_and_value(),
+			FIFOValuation(self.queue.state).get_total_stock_and_value(),
+		)
+
 	def test_rounding_off_near_zero(self):
 		self.assertEqual(round_off_if_near_zero(0), 0)
 		self.assertEqual(round_off_if_near_zero(1), 1)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod, abstractproperty
+from collections import deque
 from collections.abc import Callable
 from typing import NewType
 
@@ -12,6 +13,15 @@ RATE = 1
 
 
 class BinWiseValuation(ABC):
+	"""Base class for bin wise valuation methods.
+
+	Total qty and value are computed from the bins the same way on every call, so they only
+	depend on the bins and not on how they got there. They are kept until bins change, since
+	they are usually read again (as the previous totals) before the next change.
+	"""
+
+	__slots__ = ["_totals"]
+
 	@abstractmethod
 	def add_stock(self, qty: float, rate: float) -> None:
 		pass
@@ -26,15 +36,25 @@ class BinWiseValuation(ABC):
 	def state(self) -> list[StockBin]:
 		pass
 
+	@abstractproperty
+	def bins(self) -> list[StockBin] | deque[StockBin]:
+		pass
+
 	def get_total_stock_and_value(self) -> tuple[float, float]:
-		total_qty = 0.0
-		total_value = 0.0
+		if self._totals is None:
+			total_qty = 0.0
+			total_value = 0.0
 
-		for qty, rate in self.state:
-			total_qty += flt(qty)
-			total_value += flt(qty) * flt(rate)
+			for qty, rate in self.bins:
+				total_qty += flt(qty)
+				total_value += flt(qty) * flt(rate)
 
-		return round_off_if_near_zero(total_qty), round_off_if_near_zero(total_value)
+			self._totals = round_off_if_near_zero(total_qty), round_off_if_near_zero(total_value)
+
+		return self._totals
+
+	def _clear_totals(self) -> None:
+		self._totals = None
 
 	def __repr__(self):
 		return str(self.state)
@@ -54,23 +74,64 @@ class FIFOValuation(BinWiseValuation):
 	New stock is added at end of the queue.
 	Qty consumption happens on First In First Out basis.
 
-	Queue is implemented using "bins" of [qty, rate].
+	Queue is implemented using "bins" of [qty, rate] stored in a deque, so consumption
+	from the head of the queue is O(1). Number of bins per rate is tracked to avoid
+	scanning the queue when outgoing rate is not present in it.
 
 	ref: https://en.wikipedia.org/wiki/FIFO_and_LIFO_accounting
 	"""
 
 	# specifying the attributes to save resources
 	# ref: https://docs.python.org/3/reference/datamodel.html#slots
-	__slots__ = ["queue"]
+	__slots__ = ["_rate_wise_bins", "queue"]
 
 	def __init__(self, state: list[StockBin] | None):
-		self.queue: list[StockBin] = state if state is not None else []
+		self.queue: deque[StockBin] = deque(state) if state is not None else deque()
+		self._rate_wise_bins: dict[float, int] = {}
+
+		for stock_bin in self.queue:
+			self._index_rate(stock_bin[RATE], 1)
+
+		self._clear_totals()
 
 	@property
 	def state(self) -> list[StockBin]:
 		"""Get current state of queue."""
+		return list(self.queue)
+
+	@property
+	def bins(self) -> deque[StockBin]:
 		return self.queue
 
+	def _index_rate(self, rate: float, count: int) -> None:
+		self._rate_wise_bins[rate] = self._rate_wise_bins.get(rate, 0) + count
+		if not self._rate_wise_bins[rate]:
+			del self._rate_wise_bins[rate]
+
+	def _append_bin(self, qty: float, rate: float) -> None:
+		self.queue.append([qty, rate])
+		self._index_rate(rate, 1)
+		self._clear_totals()
+
+	def _pop_bin(self, index: int) -> StockBin:
+		if index:
+			stock_bin = self.queue[index]
+			del self.queue[index]
+		else:
+			stock_bin = self.queue.popleft()
+
+		self._index_rate(stock_bin[RATE], -1)
+		self._clear_totals()
+		return stock_bin
+
+	def _find_bin_with_rate(self, rate: float) -> int | None:
+		if not self._rate_wise_bins.get(rate):
+			return None
+
+		for idx, fifo_bin in enumerate(self.queue):
+			if fifo_bin[RATE] == rate:
+				return idx
+
 	def add_stock(self, qty: float, rate: float) -> None:
 		"""Update fifo queue with new stock.
 
@@ -79,20 +140,23 @@ class FIFOValuation(BinWiseValuation):
 		        rate: incoming rate of new quantity"""
 
 		if not len(self.queue):
-			self.queue.append([0, 0])
+			self._append_bin(0, 0)
 
 		# last row has the same rate, merge new bin.
 		if self.queue[-1][RATE] == rate:
 			self.queue[-1][QTY] += qty
+			self._clear_totals()
 		else:
 			# Item has a positive balance qty, add new entry
 			if self.queue[-1][QTY] > 0:
-				self.queue.append([qty, rate])
+				self._append_bin(qty, rate)
 			else:  # negative balance qty
 				qty = self.queue[-1][QTY] + qty
 				if qty > 0:  # new balance qty is positive
-					self.queue[-1] = [qty, rate]
+					self._pop_bin(len(self.queue) - 1)
+					self._append_bin(qty, rate)
 				else:  # new balance qty is still negative, maintain same rate
+					self._clear_totals()
 					self.queue[-1][QTY] = qty
 
 	def remove_stock(
@@ -112,15 +176,12 @@ class FIFOValuation(BinWiseValuation):
 		while qty:
 			if not len(self.queue):
 				# rely on rate generator.
-				self.queue.append([0, rate_generator()])
+				self._append_bin(0, rate_generator())
 
 			index = None
 			if outgoing_rate > 0:
 				# Find the entry where rate matched with outgoing rate
-				for idx, fifo_bin in enumerate(self.queue):
-					if fifo_bin[RATE] == outgoing_rate:
-						index = idx
-						break
+				index = self._find_bin_with_rate(outgoing_rate)
 
 				# If no entry found with outgoing rate, consume as per FIFO
 				if index is None:  # nosemgrep
@@ -133,18 +194,20 @@ class FIFOValuation(BinWiseValuation):
 			if qty >= fifo_bin[QTY]:
 				# consume current bin
 				qty = round_off_if_near_zero(qty - fifo_bin[QTY])
-				to_consume = self.queue.pop(index)
+				to_consume = self._pop_bin(index)
 				consumed_bins.append(list(to_consume))
 
 				if not self.queue and qty:
 					# stock finished, qty still remains to be withdrawn
 					# negative stock, keep in as a negative bin
-					self.queue.append([-qty, outgoing_rate or fifo_bin[RATE]])
+					self._append_bin(-qty, outgoing_rate or fifo_bin[RATE])
 					consumed_bins.append([qty, outgoing_rate or fifo_bin[RATE]])
 					break
 			else:
 				# qty found in current bin consume it and exit
-				fifo_bin[QTY] = round_off_if_near_zero(fifo_bin[QTY] - qty)
+				remaining_qty = round_off_if_near_zero(fifo_bin[QTY] - qty)
+				self._clear_totals()
+				fifo_bin[QTY] = remaining_qty
 				consumed_bins.append([qty, fifo_bin[RATE]])
 				qty = 0
 
@@ -169,12 +232,26 @@ class LIFOValuation(BinWiseValuation):
 
 	def __init__(self, state: list[StockBin] | None):
 		self.stack: list[StockBin] = state if state is not None else []
+		self._clear_totals()
 
 	@property
 	def state(self) -> list[StockBin]:
 		"""Get current state of stack."""
 		return self.stack
 
+	@property
+	def bins(self) -> list[StockBin]:
+		return self.stack
+
+	def _append_bin(self, qty: float, rate: float) -> None:
+		self.stack.append([qty, rate])
+		self._clear_totals()
+
+	def _pop_bin(self) -> StockBin:
+		stock_bin = self.stack.pop()
+		self._clear_totals()
+		return stock_bin
+
 	def add_stock(self, qty: float, rate: float) -> None:
 		"""Update lifo stack with new stock.
 
@@ -185,20 +262,23 @@ class LIFOValuation(BinWiseValuation):
 		Behaviour of this is same as FIFO valuation.
 		"""
 		if not len(self.stack):
-			self.stack.append([0, 0])
+			self._append_bin(0, 0)
 
 		# last row has the same rate, merge new bin.
 		if self.stack[-1][RATE] == rate:
 			self.stack[-1][QTY] += qty
+			self._clear_totals()
 		else:
 			# Item has a positive balance qty, add new entry
 			if self.stack[-1][QTY] > 0:
-				self.stack.append([qty, rate])
+				self._append_bin(qty, rate)
 			else:  # negative balance qty
 				qty = self.stack[-1][QTY] + qty
 				if qty > 0:  # new balance qty is positive
-					self.stack[-1] = [qty, rate]
+					self._pop_bin()
+					self._append_bin(qty, rate)
 				else:  # new balance qty is still negative, maintain same rate
+					self._clear_totals()
 					self.stack[-1][QTY] = qty
 
 	def remove_stock(
@@ -218,27 +298,27 @@ class LIFOValuation(BinWiseValuation):
 		while qty:
 			if not len(self.stack):
 				# rely on rate generator.
-				self.stack.append([0, rate_generator()])
+				self._append_bin(0, rate_generator())
 
 			# start at the end.
-			index = -1
-
-			stock_bin = self.stack[index]
+			stock_bin = self.stack[-1]
 			if qty >= stock_bin[QTY]:
 				# consume current bin
 				qty = round_off_if_near_zero(qty - stock_bin[QTY])
-				to_consume = self.stack.pop(index)
+				to_consume = self._pop_bin()
 				consumed_bins.append(list(to_consume))
 
 				if not self.stack and qty:
 					# stock finished, qty still remains to be withdrawn
 					# negative stock, keep in as a negative bin
-					self.stack.append([-qty, outgoing_rate or stock_bin[RATE]])
+					self._append_bin(-qty, outgoing_rate or stock_bin[RATE])
 					consumed_bins.append([qty, outgoing_rate or stock_bin[RATE]])
 					break
 			else:
 				# qty found in current bin consume it and exit
-				stock_bin[QTY] = round_off_if_near_zero(stock_bin[QTY] - qty)
+				remaining_qty = round_off_if_near_zero(stock_bin[QTY] - qty)
+				self._clear_totals()
+				stock_bin[QTY] = remaining_qty
 				consumed_bins.append([qty, stock_bin[RATE]])
 				qty = 0
 
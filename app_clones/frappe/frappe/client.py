@@ -8,7 +8,7 @@ import frappe
 import frappe.model
 import frappe.utils
 from frappe import _
-from frappe.desk.reportview import validate_args
+from frappe.desk.reportview import execute, validate_args
 from frappe.model.db_query import check_parent_permission
 from frappe.model.utils import is_virtual_doctype
 from frappe.utils import get_safe_filters
@@ -37,6 +37,7 @@ def get_list(
 	debug: bool = False,
 	as_dict: bool = True,
 	or_filters=None,
+	cursor: str | None = None,
 ):
 	"""Returns a list of records by filters, fields, ordering and limit
 
@@ -45,7 +46,9 @@ def get_list(
 	:param filters: filter list by this dict
 	:param order_by: Order by this fieldname
 	:param limit_start: Start at this index
-	:param limit_page_length: Number of records to be returned (default 20)"""
+	:param limit_page_length: Number of records to be returned (default 20)
+	:param cursor: `next_cursor` from the response for the previous page, used instead of
+	        `limit_start`. Pass an empty string for the first page."""
 	if frappe.is_table(doctype):
 		check_parent_permission(parent, doctype)
 
@@ -61,10 +64,11 @@ def get_list(
 		limit_page_length=limit_page_length,
 		debug=debug,
 		as_list=not as_dict,
+		cursor=cursor,
 	)
 
 	validate_args(args)
-	return frappe.get_list(**args)
+	return execute(**args)
 
 
 @frappe.whitelist()
@@ -123,6 +123,57 @@ def clear_cache(context):
 		raise SiteNotSpecifiedError
 
 
+@click.command("warm-meta-cache")
+@click.option("--processes", type=int, help="Number of processes to use, defaults to number of CPUs")
+@pass_context
+def warm_meta_cache(context, processes=None):
+	"Compile and cache Meta of all DocTypes"
+	from concurrent.futures import ProcessPoolExecutor
+
+	for site in context.sites:
+		try:
+			frappe.init(site=site)
+			frappe.connect()
+			doctypes = frappe.get_all("DocType", pluck="name", order_by="name")
+		finally:
+			frappe.destroy()
+
+		processes = processes or os.cpu_count() or 1
+		chunks = [doctypes[i::processes] for i in range(processes)]
+
+		with ProcessPoolExecutor(max_workers=processes) as executor:
+			failed = [
+				doctype
+				for failures in executor.map(_warm_meta_cache, [site] * len(chunks), chunks)
+				for doctype in failures
+			]
+
+		print(f"Compiled meta for {len(doctypes) - len(failed)} DocTypes on {site}")
+		if failed:
+			click.secho(f"Failed to compile: {', '.join(failed)}", fg="yellow")
+
+	if not context.sites:
+		raise SiteNotSpecifiedError
+
+
+def _warm_meta_cache(site: str, doctypes: list[str]) -> list[str]:
+	from frappe.model.meta import get_compiled_meta
+
+	failed = []
+	try:
+		frappe.init(site=site)
+		frappe.connect()
+		for doctype in doctypes:
+			try:
+				get_compiled_meta(doctype)
+			except Exception:
+				failed.append(doctype)
+	finally:
+		frappe.destroy()
+
+	return failed
+
+
 @click.command("clear-website-cache")
 @pass_context
 def clear_website_cache(context):
@@ -1172,6 +1223,7 @@ commands = [
 	build,
 	clear_cache,
 	clear_website_cache,
+	warm_meta_cache,
 	database,
 	transform_database,
 	jupyter,
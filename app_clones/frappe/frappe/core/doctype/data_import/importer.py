@@ -1,16 +1,20 @@
 # Copyright (c) 2020, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+import itertools
 import json
 import os
 import re
 import timeit
+from collections import Counter
 from datetime import date, datetime, time
 
 import frappe
 from frappe import _
 from frappe.core.doctype.version.version import get_diff
 from frappe.model import no_value_fields
+from frappe.model.document import bulk_insert
+from frappe.model.utils.link_values import get_key
 from frappe.utils import cint, cstr, duration_to_seconds, flt, update_progress_bar
 from frappe.utils.csvutils import get_csv_content_from_google_sheets, read_csv_content
 from frappe.utils.xlsxutils import (
@@ -20,6 +24,7 @@ from frappe.utils.xlsxutils import (
 
 INVALID_VALUES = ("", None)
 MAX_ROWS_IN_PREVIEW = 10
+LINK_VALUES_BATCH_SIZE = 1000
 INSERT = "Insert New Records"
 UPDATE = "Update Existing Records"
 DURATION_PATTERN = re.compile(r"^(?:(\d+d)?((^|\s)\d+h)?((^|\s)\d+m)?((^|\s)\d+s)?)$")
@@ -111,25 +116,61 @@ class Importer:
 			frappe.db.delete("Data Import Log", {"success": 0, "data_import": self.data_import.name})
 
 		# get successfully imported rows
-		imported_rows = []
+		imported_rows = set()
 		for log in import_log:
 			log = frappe._dict(log)
 			if log.success or len(import_log) < self.data_import.payload_count:
-				imported_rows += json.loads(log.row_indexes)
+				imported_rows.update(json.loads(log.row_indexes))
 
 			log_index = log.log_index
 
 		# start import
 		total_payload_count = len(payloads)
 		batch_size = frappe.conf.data_import_batch_size or 1000
+		insert_in_bulk = self.use_bulk_insert()
 
 		for batch_index, batched_payloads in enumerate(frappe.utils.create_batch(payloads, batch_size)):
+			if insert_in_bulk:
+				pending_payloads = [
+					payload
+					for payload in batched_payloads
+					if imported_rows.isdisjoint(row.row_number for row in payload.rows)
+				]
+				start = timeit.default_timer()
+				if pending_payloads and self.bulk_insert_records(pending_payloads, log_index):
+					log_index += len(pending_payloads)
+					current_index = min((batch_index + 1) * batch_size, total_payload_count)
+					processing_time = (timeit.default_timer() - start) / len(pending_payloads)
+					eta = self.get_eta(current_index, total_payload_count, processing_time)
+
+					if self.console:
+						update_progress_bar(
+							f"Importing {self.doctype}: {total_payload_count} records",
+							current_index - 1,
+							total_payload_count,
+						)
+					elif total_payload_count > 5:
+						frappe.publish_realtime(
+							"data_import_progress",
+							{
+								"current": current_index,
+								"total": total_payload_count,
+								"data_import": self.data_import.name,
+								"success": True,
+								"eta": eta,
+							},
+							user=frappe.session.user,
+						)
+					continue
+
+				# fall back to importing one document at a time to log failures per row
+
 			for i, payload in enumerate(batched_payloads):
 				doc = payload.doc
 				row_indexes = [row.row_number for row in payload.rows]
 				current_index = (i + 1) + (batch_index * batch_size)
 
-				if set(row_indexes).intersection(set(imported_rows)):
+				if not imported_rows.isdisjoint(row_indexes):
 					print("Skipping imported rows", row_indexes)
 					if total_payload_count > 5:
 						frappe.publish_realtime(
@@ -252,7 +293,55 @@ class Importer:
 		elif self.import_type == UPDATE:
 			return self.update_record(doc)
 
-	def insert_record(self, doc):
+	def use_bulk_insert(self):
+		"""New records of doctypes listed in the `data_import_bulk_insert` hook are inserted in bulk,
+		without running controller methods"""
+		return (
+			self.import_type == INSERT
+			and not self.data_import.submit_after_import
+			and self.doctype in frappe.get_hooks("data_import_bulk_insert")
+		)
+
+	def bulk_insert_records(self, payloads, log_index):
+		"""Insert all payloads with multi-row INSERTs and commit, returns False if any of them fails"""
+		try:
+			docs = [self.get_validated_new_doc(payload.doc) for payload in payloads]
+			bulk_insert(self.doctype, docs)
+
+			for i, (payload, doc) in enumerate(zip(payloads, docs, strict=True)):
+				create_import_log(
+					self.data_import.name,
+					log_index + i,
+					{
+						"success": True,
+						"docname": doc.name,
+						"row_indexes": [row.row_number for row in payload.rows],
+					},
+				)
+
+			if not self.data_import.status == "Partial Success":
+				self.data_import.db_set("status", "Partial Success")
+
+			frappe.db.commit()
+			return True
+
+		except Exception:
+			frappe.clear_messages()
+			frappe.db.rollback()
+			return False
+
+	def get_validated_new_doc(self, doc):
+		new_doc = self.get_new_doc(doc)
+		new_doc.check_permission("create")
+		new_doc._action = "save"
+		# link values are validated per column before import
+		new_doc.flags.ignore_links = True
+		new_doc.set_new_name()
+		new_doc.set_parent_in_children()
+		new_doc._validate()
+		return new_doc
+
+	def get_new_doc(self, doc):
 		meta = frappe.get_meta(self.doctype)
 		new_doc = frappe.new_doc(self.doctype)
 		new_doc.update(doc)
@@ -266,7 +355,11 @@ class Importer:
 			"docname": self.data_import.name,
 			"label": _("via Data Import"),
 		}
+		return new_doc
 
+	def insert_record(self, doc):
+		meta = frappe.get_meta(self.doctype)
+		new_doc = self.get_new_doc(doc)
 		new_doc.insert()
 		if meta.is_submittable and self.data_import.submit_after_import:
 			new_doc.submit()
@@ -323,8 +416,7 @@ class Importer:
 			row_indexes.extend(json.loads(f.get("row_indexes", [])))
 
 		# de duplicate
-		row_indexes = list(set(row_indexes))
-		row_indexes.sort()
+		row_indexes = set(row_indexes)
 
 		header_row = [col.header_title for col in self.import_file.columns]
 		rows = [header_row]
@@ -513,22 +605,23 @@ class ImportFile:
 
 	def get_payloads_for_import(self):
 		payloads = []
-		# make a copy
-		data = list(self.data)
-		while data:
-			doc, rows, data = self.parse_next_row_for_import(data)
+		start = 0
+		while start < len(self.data):
+			doc, rows = self.parse_next_row_for_import(self.data, start)
 			payloads.append(frappe._dict(doc=doc, rows=rows))
+			start += len(rows)
 		return payloads
 
-	def parse_next_row_for_import(self, data):
+	def parse_next_row_for_import(self, data, start=0):
 		"""
-		Parses rows that make up a doc. A doc maybe built from a single row or multiple rows.
-		Returns the doc, rows, and data without the rows.
+		Parses rows starting at index `start` that make up a doc. A doc maybe built from a single
+		row or multiple rows.
+		Returns the doc and rows.
 		"""
 		doctypes = self.header.doctypes
 
 		# first row is included by default
-		first_row = data[0]
+		first_row = data[start]
 		rows = [first_row]
 
 		# if there are child doctypes, find the subsequent rows
@@ -537,8 +630,7 @@ class ImportFile:
 			# are considered as child rows
 			parent_column_indexes = self.header.get_column_indexes(self.doctype)
 
-			data_without_first_row = data[1:]
-			for row in data_without_first_row:
+			for row in itertools.islice(data, start + 1, None):
 				row_values = row.get_values(parent_column_indexes)
 				# if the row is blank, it's a child row doc
 				if all(v in INVALID_VALUES for v in row_values):
@@ -563,7 +655,7 @@ class ImportFile:
 
 		doc = parent_doc
 
-		return doc, rows, data[len(rows) :]
+		return doc, rows
 
 	def get_warnings(self):
 		warnings = []
@@ -715,7 +807,7 @@ class Row:
 				return
 
 		elif df.fieldtype == "Link":
-			exists = self.link_exists(value, df)
+			exists = col.link_exists(value) or self.link_exists(value, df)
 			if not exists:
 				msg = _("Value {0} missing for {1}").format(frappe.bold(value), frappe.bold(df.options))
 				self.warnings.append(
@@ -868,6 +960,8 @@ class Column:
 		self.df = None
 		self.skip_import = None
 		self.warnings = []
+		# keys of names of linked documents found while validating values
+		self.existing_link_values = set()
 
 		self.meta = frappe.get_meta(doctype)
 		self.parse()
@@ -958,13 +1052,13 @@ class Column:
 			if isinstance(d, str):
 				return frappe.utils.guess_date_format(d)
 
-		date_formats = [guess_date_format(d) for d in self.column_values]
-		date_formats = [d for d in date_formats if d]
+		date_formats = Counter(guess_date_format(d) for d in self.column_values)
+		date_formats.pop(None, None)
 		if not date_formats:
 			return
 
 		unique_date_formats = set(date_formats)
-		max_occurred_date_format = max(unique_date_formats, key=date_formats.count)
+		max_occurred_date_format = max(unique_date_formats, key=date_formats.get)
 
 		if len(unique_date_formats) > 1:
 			# fmt: off
@@ -997,12 +1091,13 @@ class Column:
 
 		if self.df.fieldtype == "Link":
 			# find all values that dont exist
-			values = list({cstr(v).lower() for v in self.column_values if v})
-			exists = [
-				cstr(d.name).lower()
-				for d in frappe.get_all(self.df.options, filters={"name": ("in", values)})
-			]
-			not_exists = list(set(values) - set(exists))
+			values = list({cstr(v) for v in self.column_values if v})
+			for batch in frappe.utils.create_batch(values, LINK_VALUES_BATCH_SIZE):
+				self.existing_link_values.update(
+					get_key(name)
+					for name in frappe.get_all(self.df.options, filters={"name": ("in", batch)}, pluck="name")
+				)
+			not_exists = sorted(v for v in values if not self.link_exists(v))
 			if not_exists:
 				missing_values = ", ".join(not_exists)
 				message = _("The following values do not exist for {0}: {1}")
@@ -1050,6 +1145,10 @@ class Column:
 						}
 					)
 
+	def link_exists(self, value):
+		"""Checks `value` against names found in this column's validation"""
+		return get_key(value) in self.existing_link_values
+
 	def as_dict(self):
 		d = frappe._dict()
 		d.index = self.index
@@ -1,7 +1,9 @@
 # Copyright (c) 2019, Frappe Technologies and Contributors
 # License: MIT. See LICENSE
+from unittest.mock import patch
+
 import frappe
-from frappe.core.doctype.data_import.importer import Importer
+from frappe.core.doctype.data_import.importer import Column, Importer
 from frappe.tests.test_query_builder import db_type_is, run_only_if
 from frappe.tests.utils import FrappeTestCase
 from frappe.utils import format_duration, getdate
@@ -127,6 +129,81 @@ class TestImporter(FrappeTestCase):
 		self.assertEqual(updated_doc.table_field_1[0].child_description, "child description")
 		self.assertEqual(updated_doc.table_field_1_again[0].child_title, "child title again")
 
+	def test_data_import_bulk_insert(self):
+		import_file = get_import_file("sample_import_file")
+		data_import = self.get_importer(doctype_name, import_file)
+		i = Importer(data_import.reference_doctype, data_import=data_import)
+
+		titles = [frappe.generate_hash(length=8) for _ in range(3)]
+		for row_index, title in zip((1, 3, 4), titles, strict=True):
+			i.import_file.raw_data[row_index][0] = title
+		i.import_file.parse_data_from_template()
+
+		with (
+			patch.object(Importer, "use_bulk_insert", return_value=True),
+			patch.object(Importer, "process_doc") as process_doc,
+		):
+			import_log = i.import_data()
+
+		process_doc.assert_not_called()
+		self.assertEqual(len(import_log), 3)
+		self.assertTrue(all(log.success for log in import_log))
+
+		doc1 = frappe.get_doc(doctype_name, titles[0])
+		self.assertEqual(doc1.description, "test description")
+		self.assertEqual(format_duration(doc1.duration), "3h")
+		self.assertEqual([d.child_title for d in doc1.table_field_1], ["child title", "child title 2"])
+		self.assertEqual(doc1.table_field_2[1].child_2_date, getdate("2019-10-30"))
+		self.assertEqual(doc1.table_field_1_again[1].parentfield, "table_field_1_again")
+		self.assertEqual(frappe.get_doc(doctype_name, titles[2]).another_number, 5)
+
+	def test_data_import_bulk_insert_falls_back_per_row(self):
+		import_file = get_import_file("sample_import_file_without_mandatory")
+		data_import = self.get_importer(doctype_name, import_file)
+		i = Importer(data_import.reference_doctype, data_import=data_import)
+
+		title = frappe.generate_hash(length=8)
+		i.import_file.raw_data[1][0] = frappe.generate_hash(length=8)
+		i.import_file.raw_data[4][0] = title
+		i.import_file.parse_data_from_template()
+
+		with patch.object(Importer, "use_bulk_insert", return_value=True):
+			import_log = i.import_data()
+
+		# rows with missing mandatory values are logged one by one, the rest are still imported
+		self.assertEqual(
+			[(frappe.parse_json(log.row_indexes), log.success) for log in import_log],
+			[([2, 3], 0), ([4], 0), ([5], 1)],
+		)
+		self.assertTrue(frappe.db.exists(doctype_name, title))
+
+	def test_link_values_are_validated_per_column(self):
+		values = ["Administrator", "ADMINISTRATOR", "Guest", "Guest", "not-a-user@example.com", None]
+
+		with (
+			patch("frappe.core.doctype.data_import.importer.LINK_VALUES_BATCH_SIZE", 2),
+			patch("frappe.get_all", wraps=frappe.get_all) as get_all,
+		):
+			column = Column(0, "Allocated To", "ToDo", values)
+
+		# distinct values are fetched in batches
+		self.assertEqual(len([c for c in get_all.call_args_list if c.args[:1] == ("User",)]), 2)
+		self.assertTrue(column.link_exists("Administrator"))
+		self.assertTrue(column.link_exists("Guest"))
+		self.assertFalse(column.link_exists("not-a-user@example.com"))
+
+		missing_values = ["not-a-user@example.com"]
+		if frappe.db.db_type == "mariadb":
+			# mariadb compares names case insensitively
+			self.assertTrue(column.link_exists("ADMINISTRATOR"))
+		else:
+			self.assertFalse(column.link_exists("ADMINISTRATOR"))
+			missing_values.insert(0, "ADMINISTRATOR")
+
+		self.assertEqual(len(column.warnings), 1)
+		self.assertEqual(column.warnings[0]["type"], "warning")
+		self.assertIn(", ".join(missing_values), column.warnings[0]["message"])
+
 	def get_importer(self, doctype, import_file, update=False):
 		data_import = frappe.new_doc("Data Import")
 		data_import.import_type = "Insert New Records" if not update else "Update Existing Records"
@@ -10,6 +10,8 @@ from frappe.desk.form.linked_with import get_linked_doctypes
 from frappe.model.document import Document
 from frappe.utils import cstr
 
+USER_PERMISSION_MATCH_TABLE = "__UserPermissionMatch"
+
 
 class UserPermission(Document):
 	# begin: auto-generated types
@@ -35,10 +37,12 @@ class UserPermission(Document):
 
 	def on_update(self):
 		frappe.cache.hdel("user_permissions", self.user)
+		queue_user_permission_match_update([self.user])
 		frappe.publish_realtime("update_user_permissions", user=self.user, after_commit=True)
 
 	def on_trash(self):
 		frappe.cache.hdel("user_permissions", self.user)
+		queue_user_permission_match_update([self.user])
 		frappe.publish_realtime("update_user_permissions", user=self.user, after_commit=True)
 
 	def validate_user_permission(self):
@@ -144,6 +148,99 @@ def get_user_permissions(user=None):
 	return out
 
 
+def user_permission_match_table_exists():
+	return USER_PERMISSION_MATCH_TABLE in frappe.db.get_tables()
+
+
+def queue_user_permission_match_update(users):
+	"""Update materialized user permissions of `users` when the current transaction is committed.
+
+	`__UserPermissionMatch` holds one row per permitted document (including descendants of
+	nested set documents) so that list queries can filter by a subquery instead of inlining
+	every permitted document in the query."""
+	if not user_permission_match_table_exists():
+		return
+
+	if not getattr(frappe.local, "user_permission_match_queue", None):
+		frappe.local.user_permission_match_queue = set()
+		frappe.db.before_commit.add(update_queued_user_permission_matches)
+		frappe.db.after_rollback.add(clear_user_permission_match_queue)
+
+	frappe.local.user_permission_match_queue.update(users)
+
+
+def clear_user_permission_match_queue():
+	frappe.local.user_permission_match_queue = set()
+
+
+def update_queued_user_permission_matches():
+	users = frappe.local.user_permission_match_queue
+	clear_user_permission_match_queue()
+
+	for user in users:
+		update_user_permission_match(user)
+
+
+def update_user_permission_match(user):
+	table = frappe.qb.Table(USER_PERMISSION_MATCH_TABLE)
+	frappe.qb.from_(table).delete().where(table.user == user).run()
+
+	frappe.cache.hdel("user_permissions", user)
+	rows = {
+		(user, allow, perm.get("applicable_for") or "", perm.get("doc"))
+		for allow, perms in get_user_permissions(user).items()
+		for perm in perms
+	}
+	if rows:
+		frappe.db.bulk_insert(
+			USER_PERMISSION_MATCH_TABLE,
+			fields=["user", "allow", "applicable_for", "for_value"],
+			values=rows,
+		)
+
+
+def update_descendant_user_permission_matches(doctype, ancestors):
+	"""Update materialized user permissions which include descendants of `ancestors`,
+	called with the (old and new) ancestors of a node added to, moved within or removed from a tree."""
+	if not ancestors or not user_permission_match_table_exists():
+		return
+
+	users = frappe.get_all(
+		"User Permission",
+		filters={"allow": doctype, "hide_descendants": 0, "for_value": ("in", ancestors)},
+		pluck="user",
+		distinct=True,
+	)
+	for user in users:
+		frappe.cache.hdel("user_permissions", user)
+	queue_user_permission_match_update(users)
+
+
+def update_renamed_user_permission_matches(doctype, old, new):
+	"""Update materialized user permissions which include a renamed (or merged) document.
+
+	User Permissions are renamed with raw SQL along with other dynamic links."""
+	if not user_permission_match_table_exists():
+		return
+
+	table = frappe.qb.Table(USER_PERMISSION_MATCH_TABLE)
+	condition = (table.allow == doctype) & table.for_value.isin([old, new])
+	if doctype == "DocType":
+		condition |= table.allow.isin([old, new]) | table.applicable_for.isin([old, new])
+
+	users = frappe.qb.from_(table).select(table.user).distinct().where(condition).run(pluck=True)
+	for user in users:
+		frappe.cache.hdel("user_permissions", user)
+	queue_user_permission_match_update(users)
+
+
+def rebuild_user_permission_match():
+	frappe.db.create_user_permission_match_table()
+	frappe.db.truncate(USER_PERMISSION_MATCH_TABLE)
+	for user in frappe.get_all("User Permission", pluck="user", distinct=True):
+		update_user_permission_match(user)
+
+
 def user_permission_exists(user, allow, for_value, applicable_for=None):
 	"""Checks if similar user permission already exists"""
 	user_permissions = get_user_permissions(user).get(allow, [])
@@ -112,6 +112,13 @@ def get_diff(old, new, for_child=False, compare_cancelled=False):
 		amended_from = new.get("amended_from")
 		old_row_name_field = "_amended_from" if (amended_from and amended_from == old.name) else "name"
 
+		# rows found unchanged while saving the document (see `Document.update_child_table`)
+		unchanged_rows = (
+			new.flags.unchanged_child_rows or set()
+			if old_row_name_field == "name" and not compare_cancelled
+			else set()
+		)
+
 	for df in new.meta.fields:
 		if df.fieldtype in FIELDTYPES_TO_IGNORE or getattr(df, "is_virtual", False):
 			continue
@@ -137,6 +144,8 @@ def get_diff(old, new, for_child=False, compare_cancelled=False):
 
 				if old_row_name and old_row_name in old_rows_by_name:
 					found_rows.add(old_row_name)
+					if old_row_name in unchanged_rows:
+						continue
 
 					diff = get_diff(old_rows_by_name[old_row_name], d, for_child=True)
 					if diff and diff.changed:
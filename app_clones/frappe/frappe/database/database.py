@@ -8,7 +8,8 @@ import random
 import re
 import string
 import traceback
-from collections.abc import Iterable, Sequence
+from collections import namedtuple
+from collections.abc import Iterable, Iterator, Sequence
 from contextlib import contextmanager, suppress
 from time import time
 from typing import TYPE_CHECKING, Any, Union
@@ -159,6 +160,7 @@ class Database:
 		run=True,
 		pluck=False,
 		as_iterator=False,
+		batch_size=SQL_ITERATOR_BATCH_SIZE,
 	):
 		"""Execute a SQL query and fetch all rows.
 
@@ -176,6 +178,7 @@ class Database:
 		:param as_iterator: Returns iterator over results instead of fetching all results at once.
 		        This should be used with unbuffered cursor as default cursors used by pymysql and postgres
 		        buffer the results internally. See `Database.unbuffered_cursor`.
+		:param batch_size: Number of rows fetched from the cursor at a time with `as_iterator`.
 		Examples:
 
 		        # return customer names as dicts
@@ -273,11 +276,14 @@ class Database:
 		if auto_commit:
 			self.commit()
 
-		if not self._cursor.description:
+		# server side cursors on postgres only have a description after the first fetch
+		if not self._cursor.description and not getattr(self._cursor, "name", None):
 			return ()
 
 		if as_iterator:
-			return self._return_as_iterator(pluck=pluck, as_dict=as_dict, as_list=as_list, update=update)
+			return self._return_as_iterator(
+				pluck=pluck, as_dict=as_dict, as_list=as_list, update=update, batch_size=batch_size
+			)
 
 		last_result = self._transform_result(self._cursor.fetchall())
 		if pluck:
@@ -298,8 +304,8 @@ class Database:
 		self._clean_up()
 		return last_result
 
-	def _return_as_iterator(self, *, pluck, as_dict, as_list, update):
-		while result := self._transform_result(self._cursor.fetchmany(SQL_ITERATOR_BATCH_SIZE)):
+	def _return_as_iterator(self, *, pluck, as_dict, as_list, update, batch_size=SQL_ITERATOR_BATCH_SIZE):
+		while result := self._transform_result(self._cursor.fetchmany(batch_size)):
 			if pluck:
 				for row in result:
 					yield row[0]
@@ -316,7 +322,7 @@ class Database:
 				for row in result:
 					yield list(row)
 			else:
-				frappe.throw(_("`as_iterator` only works with `as_list=True` or `as_dict=True`"))
+				yield from result
 
 		self._clean_up()
 
@@ -759,6 +765,48 @@ class Database:
 	def get_list(*args, **kwargs):
 		return frappe.get_list(*args, **kwargs)
 
+	def iter_list(self, doctype, *args, batch_size=SQL_ITERATOR_BATCH_SIZE, **kwargs) -> Iterator[tuple]:
+		"""Stream results of `frappe.get_list` using a server side cursor.
+
+		Rows are yielded as namedtuples (or values of the `pluck` field) and only `batch_size`
+		rows are held in memory at a time. Permissions are checked the same way as `frappe.get_list`.
+
+		NOTE: No other query can be run on this connection until iteration is done.
+
+		Usage:
+		        for row in frappe.db.iter_list("GL Entry", fields=["account", "debit"], batch_size=5000):
+		                totals[row.account] += row.debit
+		"""
+		kwargs.pop("as_list", None)
+		if "limit_page_length" not in kwargs:
+			kwargs["limit_page_length"] = 0
+
+		if pluck := kwargs.pop("pluck", None):
+			kwargs["fields"] = [pluck]
+
+		query = frappe.get_list(doctype, *args, run=False, **kwargs)
+		if not isinstance(query, str):
+			# virtual doctypes & queries without any permitted field
+			yield from (row[pluck] for row in query) if pluck else query
+			return
+
+		with self.unbuffered_cursor():
+			row_type = None
+			for row in self.sql(query, as_iterator=True, batch_size=batch_size):
+				if pluck:
+					yield row[0]
+					continue
+
+				if row_type is None:
+					columns = [column[0] for column in self._cursor.description]
+					row_type = namedtuple("Row", columns, rename=True)
+				yield row_type._make(row)
+
+	def iter_all(self, doctype, *args, **kwargs) -> Iterator[tuple]:
+		"""Same as `iter_list` but doesn't check for permissions, like `frappe.get_all`."""
+		kwargs["ignore_permissions"] = True
+		return self.iter_list(doctype, *args, **kwargs)
+
 	@staticmethod
 	def _get_update_dict(
 		fieldname: str | dict, value: Any, *, modified: str, modified_by: str, update_modified: bool
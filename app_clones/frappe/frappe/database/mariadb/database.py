@@ -326,6 +326,17 @@ class MariaDBDatabase(MariaDBConnectionUtil, MariaDBExceptionUtil, Database):
 			) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"""
 		)
 
+	def create_user_permission_match_table(self):
+		self.sql_ddl(
+			"""create table if not exists __UserPermissionMatch (
+			`user` VARCHAR(180) NOT NULL,
+			`allow` VARCHAR(140) NOT NULL,
+			`applicable_for` VARCHAR(140) NOT NULL DEFAULT '',
+			`for_value` VARCHAR(140) NOT NULL,
+			INDEX `user_allow_for_value_index` (`user`, `allow`, `for_value`)
+			) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"""
+		)
+
 	@staticmethod
 	def get_on_duplicate_update(key=None):
 		return "ON DUPLICATE key UPDATE "
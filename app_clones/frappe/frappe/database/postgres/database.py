@@ -1,4 +1,5 @@
 import re
+from contextlib import contextmanager
 
 import psycopg2
 import psycopg2.extensions
@@ -219,6 +220,23 @@ class PostgresDatabase(PostgresExceptionUtil, Database):
 	def sql(self, query, values=EmptyQueryValues, *args, **kwargs):
 		return super().sql(modify_query(query), modify_values(values), *args, **kwargs)
 
+	@contextmanager
+	def unbuffered_cursor(self):
+		"""Use a server side (named) cursor. Named cursors can only execute a single query."""
+		original_cursor = self._cursor
+		new_cursor = None
+		try:
+			if not self._conn:
+				self.connect()
+				original_cursor = self._cursor
+
+			new_cursor = self._cursor = self._conn.cursor(name=f"frappe_{frappe.generate_hash(length=10)}")
+			yield
+		finally:
+			self._cursor = original_cursor
+			if new_cursor:
+				new_cursor.close()
+
 	def lazy_mogrify(self, *args, **kwargs) -> str:
 		return self.last_query
 
@@ -320,6 +338,20 @@ class PostgresDatabase(PostgresExceptionUtil, Database):
 			)"""
 		)
 
+	def create_user_permission_match_table(self):
+		self.sql_ddl(
+			"""create table if not exists "__UserPermissionMatch" (
+			"user" VARCHAR(180) NOT NULL,
+			"allow" VARCHAR(140) NOT NULL,
+			"applicable_for" VARCHAR(140) NOT NULL DEFAULT '',
+			"for_value" VARCHAR(140) NOT NULL
+			)"""
+		)
+		self.sql_ddl(
+			"""create index if not exists "user_allow_for_value_index"
+			on "__UserPermissionMatch" ("user", "allow", "for_value")"""
+		)
+
 	def updatedb(self, doctype, meta=None):
 		"""
 		Syncs a `DocType` to the table
@@ -1,15 +1,17 @@
 import json
+import time
 from typing import TYPE_CHECKING, Union
 
 import redis
 
 import frappe
-from frappe.utils import cstr
+from frappe.utils import cint, cstr, now
 
 if TYPE_CHECKING:
 	from frappe.model.document import Document
 
 queue_prefix = "insert_queue_for_"
+DEFAULT_RECORDS_PER_RUN = 500
 
 
 def deferred_insert(doctype: str, records: list[Union[dict, "Document"]] | str):
@@ -26,22 +28,94 @@ def deferred_insert(doctype: str, records: list[Union[dict, "Document"]] | str):
 
 
 def save_to_db():
+	"""Drain queued records into the database.
+
+	At most `deferred_insert_records_per_run` (site config) records are inserted per
+	queue on each run. Doctypes listed in the `deferred_insert_fast_path` hook skip
+	controller methods & validations and are written with multi-row INSERTs."""
+	records_per_run = cint(frappe.conf.deferred_insert_records_per_run) or DEFAULT_RECORDS_PER_RUN
+	fast_path_doctypes = set(frappe.get_hooks("deferred_insert_fast_path"))
+
 	queue_keys = frappe.cache.get_keys(queue_prefix)
 	for key in queue_keys:
-		record_count = 0
 		queue_key = get_key_name(key)
 		doctype = get_doctype_name(key)
-		while frappe.cache.llen(queue_key) > 0 and record_count <= 500:
-			records = frappe.cache.lpop(queue_key)
-			records = json.loads(records.decode("utf-8"))
-			if isinstance(records, dict):
-				record_count += 1
-				insert_record(records, doctype)
-				continue
+		start = time.monotonic()
+
+		records = []
+		while len(records) < records_per_run:
+			batch = pop_batch(queue_key, records_per_run - len(records))
+			if not batch:
+				break
+			for item in batch:
+				item = json.loads(item.decode("utf-8"))
+				records.extend([item] if isinstance(item, dict) else item)
+
+		if not records:
+			continue
+
+		if doctype in fast_path_doctypes:
+			bulk_insert_records(records, doctype)
+		else:
 			for record in records:
-				record_count += 1
 				insert_record(record, doctype)
 
+		elapsed = time.monotonic() - start
+		frappe.logger("deferred_insert").info(
+			f"Inserted {len(records)} {doctype} records in {elapsed:.3f}s"
+			f" ({len(records) / (elapsed or 1e-6):.0f} records/s)"
+		)
+
+
+def pop_batch(queue_key: str, count: int) -> list[bytes]:
+	"""Atomically pop upto `count` items from the head of the queue in a single round trip."""
+	key = frappe.cache.make_key(queue_key)
+	pipeline = frappe.cache.pipeline()
+	pipeline.lrange(key, 0, count - 1)
+	pipeline.ltrim(key, count, -1)
+	items, _ = pipeline.execute()
+	return items
+
+
+def bulk_insert_records(records: list[dict], doctype: str):
+	"""Insert records without running controller methods, using multi-row INSERTs.
+
+	Falls back to `insert_record` for every record if the bulk insert fails."""
+	from frappe.model.naming import set_new_name
+
+	if frappe.get_meta(doctype).get_table_fields():
+		for record in records:
+			insert_record(record, doctype)
+		return
+
+	timestamp = now()
+	fields = None
+	values = []
+	for record in records:
+		record.update({"doctype": doctype})
+		doc = frappe.get_doc(record)
+		doc._set_defaults()
+		doc.creation = doc.creation or timestamp
+		doc.modified = doc.modified or doc.creation
+		doc.owner = doc.owner or frappe.session.user
+		doc.modified_by = doc.modified_by or doc.owner
+		set_new_name(doc)
+
+		row = doc.get_valid_dict(convert_dates_to_str=True, ignore_virtual=True)
+		fields = fields or list(row)
+		values.append(tuple(row.get(field) for field in fields))
+
+	frappe.db.savepoint("deferred_bulk_insert")
+	try:
+		frappe.db.bulk_insert(doctype, fields, values)
+	except Exception as e:
+		frappe.db.rollback(save_point="deferred_bulk_insert")
+		frappe.logger().error(f"Error while bulk inserting deferred {doctype} records: {e}")
+		for record in records:
+			insert_record(record, doctype)
+	else:
+		frappe.db.release_savepoint("deferred_bulk_insert")
+
 
 def insert_record(record: Union[dict, "Document"], doctype: str):
 	try:
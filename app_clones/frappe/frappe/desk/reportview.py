@@ -77,7 +77,11 @@ def get_count() -> int:
 
 
 def execute(doctype, *args, **kwargs):
-	return DatabaseQuery(doctype).execute(*args, **kwargs)
+	query = DatabaseQuery(doctype)
+	result = query.execute(*args, **kwargs)
+	if kwargs.get("cursor") is not None:
+		frappe.response["next_cursor"] = query.next_cursor
+	return result
 
 
 def get_form_params():
@@ -559,9 +559,16 @@ default_log_clearing_doctypes = {
 	"Route History": 90,
 }
 
+# deferred inserts of these doctypes skip controller methods and are written with multi-row INSERTs
+deferred_insert_fast_path = ["Route History", "Access Log"]
+
+# data imports of new records of these doctypes skip controller methods and are written with multi-row INSERTs
+data_import_bulk_insert = []
+
 # These keys will not be erased when doing frappe.clear_cache()
 persistent_cache_keys = [
 	"changelog-*",  # version update notifications
+	"compiled_doctype_meta",  # versioned, see frappe.model.meta.get_compiled_meta
 	"insert_queue_for_*",  # Deferred Insert
 	"recorder-*",  # Recorder
 	"global_search_queue",
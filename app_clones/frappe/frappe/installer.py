@@ -181,6 +181,7 @@ def install_db(
 	frappe.db.create_auth_table()
 	frappe.db.create_global_search_table()
 	frappe.db.create_user_settings_table()
+	frappe.db.create_user_permission_match_table()
 
 	frappe.flags.in_install_db = False
 
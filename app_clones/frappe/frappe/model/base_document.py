@@ -781,8 +781,10 @@ class BaseDocument:
 
 		return missing
 
-	def get_invalid_links(self, is_submittable=False):
-		"""Returns list of invalid links and also updates fetch values if not set"""
+	def get_invalid_links(self, is_submittable=False, link_values=None):
+		"""Returns list of invalid links and also updates fetch values if not set
+
+		:param link_values: `LinkValues` prefetched for this document, if any."""
 
 		def get_msg(df, docname):
 			# check if parentfield exists (only applicable for child table doctype)
@@ -821,7 +823,11 @@ class BaseDocument:
 					if not _df.get("fetch_if_empty")
 					or (_df.get("fetch_if_empty") and not self.get(_df.fieldname))
 				]
-				if not meta.get("is_virtual"):
+				values = None
+				if link_values and not meta.get("is_virtual"):
+					values = link_values.get(doctype, docname, fields_to_fetch)
+
+				if values is None and not meta.get("is_virtual"):
 					if not fields_to_fetch:
 						# cache a single value type
 						values = _dict(name=frappe.db.get_value(doctype, docname, "name", cache=True))
@@ -857,7 +863,14 @@ class BaseDocument:
 						df.fieldname != "amended_from"
 						and (is_submittable or self.meta.is_submittable)
 						and frappe.get_meta(doctype).is_submittable
-						and DocStatus(frappe.db.get_value(doctype, docname, "docstatus") or 0).is_cancelled()
+						and DocStatus(
+							(
+								values.docstatus
+								if "docstatus" in values
+								else frappe.db.get_value(doctype, docname, "docstatus")
+							)
+							or 0
+						).is_cancelled()
 					):
 						cancelled_links.append((df.fieldname, docname, get_msg(df, docname)))
 
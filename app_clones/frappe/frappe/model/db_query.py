@@ -2,8 +2,10 @@
 # License: MIT. See LICENSE
 """build query for doclistview and return results"""
 
+import base64
 import copy
 import datetime
+import hashlib
 import json
 import re
 from collections import Counter
@@ -46,6 +48,10 @@ STRICT_UNION_PATTERN = re.compile(r".*\s(union).*\s")
 ORDER_GROUP_PATTERN = re.compile(r".*[^a-z0-9-_ ,`'\"\.\(\)].*")
 SPECIAL_FIELD_CHARS = frozenset(("(", "`", ".", "'", '"', "*"))
 
+# permitted and shared documents are filtered using a subquery instead of
+# inlining them in the query beyond this count
+INLINE_MATCH_VALUES_LIMIT = 100
+
 
 class DatabaseQuery:
 	def __init__(self, doctype, user=None):
@@ -109,6 +115,7 @@ class DatabaseQuery:
 		ignore_ddl=False,
 		*,
 		parent_doctype=None,
+		cursor=None,
 	) -> list:
 		if not ignore_permissions:
 			self.check_read_permission(self.doctype, parent_doctype=parent_doctype)
@@ -156,6 +163,8 @@ class DatabaseQuery:
 		self.strict = strict
 		self.ignore_ddl = ignore_ddl
 		self.parent_doctype = parent_doctype
+		self.cursor = cursor
+		self.next_cursor = None
 
 		# for contextual user permission check
 		# to determine which user permission is applicable on link field of specific doctype
@@ -210,6 +219,9 @@ class DatabaseQuery:
 			# apply_fieldlevel_read_permissions has likely removed ALL the fields that user asked for
 			return []
 
+		if self.cursor is not None:
+			self.apply_cursor(args)
+
 		if args.conditions:
 			args.conditions = "where " + args.conditions
 
@@ -229,7 +241,7 @@ from {tables}
 {order_by}
 {limit}""".format(**args)
 
-		return frappe.db.sql(
+		result = frappe.db.sql(
 			query,
 			as_dict=not self.as_list,
 			debug=self.debug,
@@ -238,6 +250,11 @@ from {tables}
 			run=self.run,
 		)
 
+		if self.cursor is not None and self.run:
+			result = self.set_next_cursor(result)
+
+		return result
+
 	def prepare_args(self):
 		self.parse_args()
 		self.sanitize_fields()
@@ -996,12 +1013,24 @@ from {tables}
 			return self.match_filters
 
 	def get_share_condition(self):
-		return (
-			cast_name(f"`tab{self.doctype}`.name")
-			+ f" in ({', '.join(frappe.db.escape(s, percent=False) for s in self.shared)})"
-		)
+		if len(self.shared) > INLINE_MATCH_VALUES_LIMIT:
+			# same as `frappe.share.get_shared` for read permission
+			user_condition = f"`user`={frappe.db.escape(self.user)}"
+			if self.user != "Guest":
+				user_condition += " or `everyone`=1"
+
+			values = (
+				"select `share_name` from `tabDocShare`"
+				f" where `share_doctype`={frappe.db.escape(self.doctype)} and `read`=1 and ({user_condition})"
+			)
+		else:
+			values = ", ".join(frappe.db.escape(s, percent=False) for s in self.shared)
+
+		return cast_name(f"`tab{self.doctype}`.name") + f" in ({values})"
 
 	def add_user_permissions(self, user_permissions):
+		from frappe.core.doctype.user_permission.user_permission import user_permission_match_table_exists
+
 		doctype_link_fields = []
 		doctype_link_fields = self.doctype_meta.get_link_fields()
 
@@ -1048,7 +1077,10 @@ from {tables}
 						docs.append(permission.get("doc"))
 
 				if docs:
-					values = ", ".join(frappe.db.escape(doc, percent=False) for doc in docs)
+					if len(docs) > INLINE_MATCH_VALUES_LIMIT and user_permission_match_table_exists():
+						values = self.get_user_permission_match_query(df)
+					else:
+						values = ", ".join(frappe.db.escape(doc, percent=False) for doc in docs)
 					condition += cast_name(f"`tab{self.doctype}`.`{df.get('fieldname')}`") + f" in ({values})"
 					match_conditions.append(f"({condition})")
 					match_filters[df.get("options")] = docs
@@ -1061,6 +1093,23 @@ from {tables}
 			self._fetch_shared_documents = True
 			self.match_filters.append(match_filters)
 
+	def get_user_permission_match_query(self, df) -> str:
+		"""Query for documents permitted via user permissions on the link field `df`,
+		from the user permissions materialized in `__UserPermissionMatch`."""
+		from frappe.core.doctype.user_permission.user_permission import USER_PERMISSION_MATCH_TABLE
+
+		if df.get("fieldname") == "name" and self.reference_doctype:
+			applicable_for = self.reference_doctype
+		else:
+			applicable_for = self.doctype
+
+		return (
+			f"select `for_value` from `{USER_PERMISSION_MATCH_TABLE}`"
+			f" where `user`={frappe.db.escape(self.user)}"
+			f" and `allow`={frappe.db.escape(df.get('options'))}"
+			f" and `applicable_for` in ('', {frappe.db.escape(applicable_for)})"
+		)
+
 	def get_permission_query_conditions(self) -> str:
 		conditions = []
 		hooks = frappe.get_hooks("permission_query_conditions", {})
@@ -1150,6 +1199,123 @@ from {tables}
 				if re.search(r"\b" + re.escape(func) + r"\s*\(", field.lower()):
 					frappe.throw(_("Cannot use {0} in order/group by").format(field))
 
+	def apply_cursor(self, args):
+		"""Paginate from the position encoded in `self.cursor` (pass `""` for the first page).
+
+		If every sort key is backed by an index, rows after the last row of the previous
+		page are seeked to using their sort key values (keyset pagination). Otherwise the
+		cursor holds an offset."""
+		table = f"`tab{self.doctype}`"
+		self.keyset = self.get_keyset(args.order_by)
+		if self.keyset and not any(fieldname == "name" for fieldname, _order in self.keyset):
+			# tie breaker, so that position is unique
+			self.keyset.append(("name", self.keyset[-1][1]))
+			args.order_by += f", {table}.`name` {self.keyset[-1][1]}"
+
+		position = decode_cursor(self.cursor, self.get_cursor_signature())
+
+		if not self.keyset:
+			self.limit_start = cint(position.get("offset"))
+			args.limit = self.add_limit()
+			return
+
+		args.fields += "".join(
+			f", {table}.`{fieldname}` as `_keyset_{i}`" for i, (fieldname, _order) in enumerate(self.keyset)
+		)
+
+		if values := position.get("values"):
+			condition = self.get_keyset_condition(values)
+			args.conditions = f"({args.conditions}) and {condition}" if args.conditions else condition
+
+		args.limit = f"limit {self.limit_page_length}"
+
+	def get_keyset(self, order_by: str) -> list[tuple[str, str]] | None:
+		"""Return `[(fieldname, "asc" | "desc"), ...]` if results can be paginated by sort key values."""
+		if self.distinct or self.group_by or not self.limit_page_length:
+			return
+
+		keyset = []
+		for term in order_by.replace(" order by ", "", 1).split(","):
+			parts = term.split()
+			if not parts or len(parts) > 2:
+				return
+
+			table, _, fieldname = parts[0].replace("`", "").rpartition(".")
+			order = parts[1].lower() if len(parts) == 2 else "asc"
+			if (
+				(table and table != f"tab{self.doctype}")
+				or order not in ("asc", "desc")
+				or not self.is_index_backed(fieldname)
+			):
+				return
+
+			keyset.append((fieldname, order))
+
+		return keyset or None
+
+	def is_index_backed(self, fieldname: str) -> bool:
+		meta = self.doctype_meta
+		if fieldname == "name":
+			return True
+		if fieldname == "modified":
+			return not meta.istable
+		if fieldname == "creation":
+			return meta.sort_field == "creation"
+
+		df = meta.get_field(fieldname)
+		# nullable columns can't be compared against reliably
+		return bool(df and (df.search_index or df.unique) and df.reqd)
+
+	def get_keyset_condition(self, values: list) -> str:
+		"""Build `(a > x) or (a = x and b > y) ...` for the last row's sort key values."""
+		table = f"`tab{self.doctype}`"
+		if len(values) != len(self.keyset):
+			frappe.throw(_("Invalid cursor"), frappe.ValidationError)
+
+		clauses = []
+		for i, (fieldname, order) in enumerate(self.keyset):
+			operator = "<" if order == "desc" else ">"
+			clause = [
+				f"{table}.`{f}` = {frappe.db.escape(cstr(v))}"
+				for (f, _order), v in zip(self.keyset[:i], values[:i], strict=True)
+			]
+			clause.append(f"{table}.`{fieldname}` {operator} {frappe.db.escape(cstr(values[i]))}")
+			clauses.append(f"({' and '.join(clause)})")
+
+		return f"({' or '.join(clauses)})"
+
+	def get_cursor_signature(self) -> str:
+		keyset = self.keyset or "offset"
+		return hashlib.sha1(f"{self.doctype}:{keyset}".encode()).hexdigest()[:10]
+
+	def set_next_cursor(self, result):
+		"""Strip sort key columns added by `apply_cursor` and set cursor for the next page."""
+		count = len(self.keyset or ())
+		last_row = result[-1] if result else None
+
+		if count:
+			keys = [f"_keyset_{i}" for i in range(count)]
+			if self.as_list:
+				last_values = last_row and list(last_row[-count:])
+				result = [row[:-count] for row in result]
+			else:
+				last_values = last_row and [last_row.get(key) for key in keys]
+				for row in result:
+					for key in keys:
+						row.pop(key, None)
+
+		if not last_row or len(result) < self.limit_page_length:
+			# last page
+			return result
+
+		if count:
+			position = {"values": last_values}
+		else:
+			position = {"offset": self.limit_start + len(result)}
+
+		self.next_cursor = encode_cursor(position, self.get_cursor_signature())
+		return result
+
 	def add_limit(self):
 		if self.limit_page_length:
 			return f"limit {self.limit_page_length} offset {self.limit_start}"
@@ -1399,3 +1565,24 @@ def strip_alias(field: str) -> str:
 	if " as " in field.lower():
 		return field.split(" as ", 1)[0]
 	return field
+
+
+def encode_cursor(position: dict, signature: str) -> str:
+	payload = json.dumps({"s": signature, **position}, default=str, separators=(",", ":"))
+	return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, signature: str) -> dict:
+	"""Return position encoded in cursor, `{}` for the first page."""
+	if not cursor:
+		return {}
+
+	try:
+		position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+	except Exception:
+		frappe.throw(_("Invalid cursor"), frappe.ValidationError)
+
+	if not isinstance(position, dict) or position.pop("s", None) != signature:
+		frappe.throw(_("Cursor doesn't match the requested sort order"), frappe.ValidationError)
+
+	return position
@@ -15,7 +15,7 @@ from frappe.core.doctype.server_script.server_script_utils import run_server_scr
 from frappe.desk.form.document_follow import follow_document
 from frappe.integrations.doctype.webhook import run_webhooks
 from frappe.model import optional_fields, table_fields
-from frappe.model.base_document import BaseDocument, get_controller
+from frappe.model.base_document import DOCTYPES_FOR_DOCTYPE, BaseDocument, get_controller
 from frappe.model.docstatus import DocStatus
 from frappe.model.naming import set_new_name, validate_name
 from frappe.model.utils import is_virtual_doctype
@@ -427,8 +427,9 @@ class Document(BaseDocument):
 		else:
 			self.db_update()
 
-		self.update_children()
+		self.update_children(doc_before_save=self.get_doc_before_save())
 		self.run_post_save_methods()
+		self.flags.unchanged_child_rows = None
 
 		# clear unsaved flag
 		if hasattr(self, "__unsaved"):
@@ -463,22 +464,28 @@ class Document(BaseDocument):
 			)
 			_file.save()
 
-	def update_children(self):
-		"""update child tables"""
+	def update_children(self, doc_before_save: Optional["Document"] = None):
+		"""update child tables
+
+		:param doc_before_save: Document as it is in the database, only changed rows are updated if set."""
+		self.flags.unchanged_child_rows = set()
 		for df in self.meta.get_table_fields():
-			self.update_child_table(df.fieldname, df)
+			self.update_child_table(df.fieldname, df, doc_before_save=doc_before_save)
 
-	def update_child_table(self, fieldname: str, df: Optional["DocField"] = None):
+	def update_child_table(
+		self,
+		fieldname: str,
+		df: Optional["DocField"] = None,
+		doc_before_save: Optional["Document"] = None,
+	):
 		"""sync child table for given fieldname"""
 		df: "DocField" = df or self.meta.get_field(fieldname)
 		all_rows = self.get(df.fieldname)
+		is_virtual = frappe.get_meta(df.options).is_virtual == 1
 
 		# delete rows that do not match the ones in the document
 		# if the doctype isn't in ignore_children_type flag and isn't virtual
-		if not (
-			df.options in (self.flags.ignore_children_type or ())
-			or frappe.get_meta(df.options).is_virtual == 1
-		):
+		if not (df.options in (self.flags.ignore_children_type or ()) or is_virtual):
 			existing_row_names = [row.name for row in all_rows if row.name and not row.is_new()]
 
 			tbl = frappe.qb.DocType(df.options)
@@ -495,10 +502,68 @@ class Document(BaseDocument):
 
 			qry.run()
 
-		# update / insert
+		if not doc_before_save or is_virtual:
+			# update / insert
+			for d in all_rows:
+				d: Document
+				d.db_update()
+			return
+
+		previous_rows = {row.name: row for row in doc_before_save.get(df.fieldname)}
+		new_rows = []
+		unchanged_rows = []
+
 		for d in all_rows:
 			d: Document
-			d.db_update()
+			if d.get("__islocal") or not d.name:
+				new_rows.append(d)
+			elif d.name in previous_rows and get_row_values(d) == get_row_values(previous_rows[d.name]):
+				# not written at all, so it keeps the timestamp it was last changed at
+				d.modified = previous_rows[d.name].modified
+				d.modified_by = previous_rows[d.name].modified_by
+				unchanged_rows.append(d.name)
+			else:
+				d.db_update()
+
+		if new_rows:
+			self.bulk_insert_child_rows(df.options, new_rows)
+
+		self.flags.unchanged_child_rows.update(unchanged_rows)
+
+	def bulk_insert_child_rows(self, doctype: str, rows: list["Document"]):
+		"""Insert new child rows with a multi-row INSERT, one by one if that fails (e.g. duplicate name)."""
+		if len(rows) == 1 or doctype in DOCTYPES_FOR_DOCTYPE:
+			for d in rows:
+				d.db_insert()
+			return
+
+		values = []
+		for d in rows:
+			if not d.name:
+				set_new_name(d)
+			if not d.creation:
+				d.creation = d.modified = now()
+				d.owner = d.modified_by = frappe.session.user
+			values.append(d.get_valid_dict(convert_dates_to_str=True, ignore_virtual=True))
+
+		columns = list(values[0])
+		frappe.db.savepoint("bulk_insert_child_rows")
+		try:
+			frappe.db.bulk_insert(doctype, columns, [list(v.values()) for v in values])
+		except Exception as e:
+			if not (frappe.db.is_primary_key_violation(e) or frappe.db.is_unique_key_violation(e)):
+				raise
+			# released only after a successful insert, releasing in an aborted transaction (postgres)
+			# would raise and hide the original error
+			frappe.db.rollback(save_point="bulk_insert_child_rows")
+		else:
+			frappe.db.release_savepoint("bulk_insert_child_rows")
+			for d in rows:
+				d.set("__islocal", False)
+			return
+
+		for d in rows:
+			d.db_insert()
 
 	def get_doc_before_save(self) -> "Document":
 		return getattr(self, "_doc_before_save", None)
@@ -963,10 +1028,15 @@ class Document(BaseDocument):
 		if self.flags.ignore_links or self._action == "cancel":
 			return
 
-		invalid_links, cancelled_links = self.get_invalid_links()
+		from frappe.model.utils.link_values import LinkValues
 
-		for d in self.get_all_children():
-			result = d.get_invalid_links(is_submittable=self.meta.is_submittable)
+		children = self.get_all_children()
+		link_values = LinkValues([self, *children])
+
+		invalid_links, cancelled_links = self.get_invalid_links(link_values=link_values)
+
+		for d in children:
+			result = d.get_invalid_links(is_submittable=self.meta.is_submittable, link_values=link_values)
 			invalid_links.extend(result[0])
 			cancelled_links.extend(result[1])
 
@@ -1763,6 +1833,14 @@ def bulk_insert(
 		)
 
 
+def get_row_values(row: "Document") -> dict:
+	"""Values of a child row as they are stored in the database, excluding timestamps."""
+	values = row.get_valid_dict(convert_dates_to_str=True, ignore_virtual=True)
+	values.pop("modified", None)
+	values.pop("modified_by", None)
+	return values
+
+
 def _document_values_generator(
 	documents: Iterable["Document"],
 	columns: list[str],
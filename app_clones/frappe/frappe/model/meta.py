@@ -14,6 +14,7 @@ Example:
 
 
 """
+import hashlib
 import json
 import os
 from datetime import datetime
@@ -62,16 +63,64 @@ LARGE_TABLE_SIZE_THRESHOLD = 100_000
 LARGE_TABLE_RECENCY_THRESHOLD = 30  # days
 
 
+# Bump this when attributes computed by `Meta.process` / `Meta.compile` change
+META_COMPILATION_VERSION = 1
+COMPILED_META_CACHE_KEY = "compiled_doctype_meta"
+
+# Tables (and the column linking them to a DocType) that `Meta.process` reads from
+META_SOURCE_TABLES = (
+	("DocType", "name"),
+	("Custom Field", "dt"),
+	("Property Setter", "doc_type"),
+	("Custom DocPerm", "parent"),
+	("DocType Link", "parent"),
+	("DocType Action", "parent"),
+	("DocType State", "parent"),
+)
+
+
 def get_meta(doctype, cached=True) -> "Meta":
 	cached = cached and isinstance(doctype, str)
 	if cached and (meta := frappe.cache.hget("doctype_meta", doctype)):
 		return meta
 
-	meta = Meta(doctype)
+	meta = get_compiled_meta(doctype) if cached else Meta(doctype)
 	frappe.cache.hset("doctype_meta", meta.name, meta)
 	return meta
 
 
+def get_compiled_meta(doctype: str) -> "Meta":
+	"""Return processed Meta from the compiled meta cache, building it if it's outdated.
+
+	Unlike `doctype_meta`, compiled meta survives `frappe.clear_cache` and is
+	validated against `get_meta_version` instead. State read from the database
+	itself (valid columns, `is_large_table`) isn't versioned and is rebuilt on load."""
+	if frappe.flags.in_install:
+		return Meta(doctype)
+
+	version = get_meta_version(doctype)
+	compiled = frappe.cache.hget(COMPILED_META_CACHE_KEY, doctype)
+	if compiled and compiled[0] == version:
+		meta = compiled[1]
+		meta.load_table_state()
+		return meta
+
+	meta = Meta(doctype)
+	meta.compile()
+	frappe.cache.hset(COMPILED_META_CACHE_KEY, doctype, (version, meta))
+	return meta
+
+
+def get_meta_version(doctype: str) -> str:
+	"""Return hash of the modification state of everything a DocType's Meta is built from."""
+	query = " union all ".join(
+		f"select count(*), max(modified) from `tab{table}` where `{column}` = %(doctype)s"
+		for table, column in META_SOURCE_TABLES
+	)
+	state = [META_COMPILATION_VERSION, frappe.__version__, frappe.db.sql(query, {"doctype": doctype})]
+	return hashlib.sha1(frappe.as_json(state, indent=None).encode()).hexdigest()
+
+
 def load_meta(doctype):
 	return Meta(doctype)
 
@@ -175,8 +224,19 @@ class Meta(Document):
 
 		return serialize(self)
 
+	def compile(self):
+		"""Build lookup indexes that are otherwise computed lazily, before caching."""
+		# fieldname → docfield map and table fields, for the final list of fields
+		self.init_field_caches()
+		self.get_table_field_doctypes()
+		self.get_link_fields()
+		self.get_dynamic_link_fields()
+		self.get_set_only_once_fields()
+
 	def get_link_fields(self):
-		return self.get("fields", {"fieldtype": "Link", "options": ["!=", "[Select]"]})
+		if not hasattr(self, "_link_fields"):
+			self._link_fields = self.get("fields", {"fieldtype": "Link", "options": ["!=", "[Select]"]})
+		return list(self._link_fields)
 
 	def get_data_fields(self):
 		return self.get("fields", {"fieldtype": "Data"})
@@ -213,6 +273,12 @@ class Meta(Document):
 	def get_table_fields(self):
 		return self._table_fields
 
+	def get_table_field_doctypes(self) -> dict[str, str]:
+		"""Return map of table fieldnames to their child DocTypes"""
+		if not hasattr(self, "_table_field_doctypes"):
+			self._table_field_doctypes = {df.fieldname: df.options for df in self._table_fields}
+		return self._table_field_doctypes
+
 	def get_global_search_fields(self):
 		"""Return list of fields with `in_global_search` set and `name` if set"""
 		fields = self.get("fields", {"in_global_search": 1, "fieldtype": ["not in", NO_VALUE_FIELDS]})
@@ -439,6 +505,12 @@ class Meta(Document):
 
 				self.set(fieldname, new_list)
 
+	def load_table_state(self):
+		"""Read again what meta knows about the DocType's table, e.g. after loading compiled meta"""
+		self.__dict__.pop("_valid_columns", None)
+		self.get_valid_columns()
+		self.check_if_large_table()
+
 	def check_if_large_table(self):
 		"""Apply some heuristics to detect large tables.
 
@@ -1,9 +1,11 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
 
+import atexit
 import base64
 import datetime
 import re
+import threading
 import time
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Optional
@@ -23,6 +25,10 @@ if TYPE_CHECKING:
 NAMING_SERIES_PATTERN = re.compile(r"^[\w\- \/.#{}]+$", re.UNICODE)
 BRACED_PARAMS_PATTERN = re.compile(r"(\{[\w | #]+\})")
 
+# Blocks of series numbers reserved by this process, by (site, prefix). See `get_series_block_size`.
+_series_blocks: dict[tuple[str, str], frappe._dict] = {}
+_series_blocks_lock = threading.Lock()
+
 
 # Types that can be using in naming series fields
 NAMING_SERIES_PART_TYPES = (
@@ -119,8 +125,11 @@ class NamingSeries:
 			frappe.qb.into(Series).insert(prefix, 0).columns("name", "current").run()
 
 		(frappe.qb.update(Series).set(Series.current, cint(new_count)).where(Series.name == prefix)).run()
+		reset_series_blocks(prefix)
 
 	def get_current_value(self) -> int:
+		"""Returns the counter of the series. For series that reserve blocks of numbers, this is the
+		end of the last reserved block (see `get_series_block_size`)."""
 		prefix = self.get_prefix()
 		return cint(frappe.db.get_value("Series", prefix, "current", order_by="name"))
 
@@ -382,6 +391,15 @@ def determine_consecutive_week_number(datetime):
 
 
 def getseries(key, digits):
+	if block_size := get_series_block_size(key):
+		current = get_next_from_series_block(key, block_size)
+	else:
+		current = increment_series(key)
+	return ("%0" + str(digits) + "d") % current
+
+
+def increment_series(key, increment=1) -> int:
+	"""Increments counter of the series in `tabSeries` and returns the new value."""
 	# series created ?
 	# Using frappe.qb as frappe.get_values does not allow order_by=None
 	series = DocType("Series")
@@ -390,13 +408,169 @@ def getseries(key, digits):
 	if current and current[0][0] is not None:
 		current = current[0][0]
 		# yes, update it
-		frappe.db.sql("UPDATE `tabSeries` SET `current` = `current` + 1 WHERE `name`=%s", (key,))
-		current = cint(current) + 1
+		frappe.db.sql("UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name`=%s", (increment, key))
+		current = cint(current) + increment
 	else:
 		# no, create it
-		frappe.db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, 1)", (key,))
-		current = 1
-	return ("%0" + str(digits) + "d") % current
+		frappe.db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)", (key, increment))
+		current = increment
+	return current
+
+
+def get_series_block_size(prefix) -> int:
+	"""Returns the number of series numbers to reserve at a time for the prefix, 0 if disabled.
+
+	Every new name of a series locks its row in `tabSeries` till the transaction is committed,
+	so concurrent inserts using the same series wait for each other. Series can instead reserve
+	a block of numbers at a time for each worker by setting, in site config:
+
+	    "naming_series_block_size": {"ACC-SINV-": 50}
+
+	which applies to all prefixes starting with "ACC-SINV-". Names will not be sequential across
+	workers, and numbers of rolled back transactions and unused numbers of a block are skipped.
+	Reserved blocks and numbers skipped by a running process are logged in the "naming" log.
+	The counter in `tabSeries` (and so `NamingSeries.get_current_value`) is the end of the last
+	reserved block, not the last number used.
+
+	Background jobs don't reserve blocks, as each job runs in a process that exits after the job.
+	"""
+	block_sizes = frappe.conf.naming_series_block_size
+	if not block_sizes or frappe.job:
+		return 0
+
+	for series_prefix, block_size in block_sizes.items():
+		if prefix.startswith(series_prefix):
+			return cint(block_size)
+
+	return 0
+
+
+def get_next_from_series_block(prefix, block_size) -> int:
+	token = frappe.cache.hget("naming_series_block_token", prefix)
+	transaction = get_series_block_transaction()
+
+	# block reserved in this transaction
+	block = transaction.reserved_blocks.get(prefix)
+
+	if not block:
+		block_key = (frappe.local.site, prefix)
+		with _series_blocks_lock:
+			block = _series_blocks.get(block_key)
+			if block and (block.token != token or block.next > block.end):
+				_series_blocks.pop(block_key)
+				log_skipped_series_numbers(prefix, block.next, block.end)
+				block = None
+
+			if block:
+				current = block.next
+				block.next += 1
+				transaction.used_numbers.append((prefix, current))
+				return current
+
+	if not block or block.token != token or block.next > block.end:
+		end = increment_series(prefix, block_size)
+		block = frappe._dict(next=end - block_size + 1, end=end, token=token)
+		transaction.reserved_blocks[prefix] = block
+		# a process killed before using the block leaves a gap, which can be traced from here
+		frappe.logger("naming").info(
+			{"site": frappe.local.site, "series": prefix, "reserved_from": block.next, "reserved_to": end}
+		)
+
+	current = block.next
+	block.next += 1
+	return current
+
+
+def get_series_block_transaction():
+	"""Blocks reserved and numbers used from earlier blocks in the current transaction."""
+	if not getattr(frappe.local, "series_block_transaction", None):
+		frappe.local.series_block_transaction = frappe._dict(reserved_blocks={}, used_numbers=[])
+		frappe.db.before_commit.add(save_reserved_series_blocks)
+		frappe.db.after_commit.add(release_reserved_series_blocks)
+		frappe.db.after_rollback.add(discard_reserved_series_blocks)
+
+	return frappe.local.series_block_transaction
+
+
+def save_reserved_series_blocks():
+	# reservations may have been undone by rolling back to a savepoint
+	for prefix, block in frappe.local.series_block_transaction.reserved_blocks.items():
+		frappe.db.sql(
+			"UPDATE `tabSeries` SET `current` = GREATEST(`current`, %s) WHERE `name`=%s",
+			(block.end, prefix),
+		)
+
+
+def release_reserved_series_blocks():
+	"""Makes blocks reserved in the committed transaction available to other transactions."""
+	transaction = frappe.local.series_block_transaction
+	frappe.local.series_block_transaction = None
+
+	with _series_blocks_lock:
+		for prefix, block in transaction.reserved_blocks.items():
+			block_key = (frappe.local.site, prefix)
+			if previous_block := _series_blocks.get(block_key):
+				log_skipped_series_numbers(prefix, previous_block.next, previous_block.end)
+			_series_blocks[block_key] = block
+
+
+def log_unused_series_blocks():
+	"""Logs numbers of reserved blocks left unused when the process exits."""
+	with _series_blocks_lock:
+		for (site, prefix), block in _series_blocks.items():
+			log_skipped_series_numbers(prefix, block.next, block.end, site=site)
+		_series_blocks.clear()
+
+
+atexit.register(log_unused_series_blocks)
+
+
+def discard_reserved_series_blocks():
+	# reservations are rolled back along with the transaction, but numbers used from
+	# blocks reserved in earlier transactions are lost
+	transaction = frappe.local.series_block_transaction
+	frappe.local.series_block_transaction = None
+
+	for prefix, current in transaction.used_numbers:
+		log_skipped_series_numbers(prefix, current, current)
+
+
+def reset_series_blocks(prefix):
+	"""Stops using reserved blocks of the prefix, in all workers."""
+	if get_series_block_size(prefix):
+		frappe.cache.hset("naming_series_block_token", prefix, frappe.generate_hash(length=10))
+
+
+def revert_series_block(prefix, count) -> bool:
+	"""Returns the number to its block if it was the last number taken from it in this transaction."""
+	transaction = get_series_block_transaction()
+	block = transaction.reserved_blocks.get(prefix)
+	if block and block.next - 1 == count:
+		block.next -= 1
+		return True
+
+	# numbers used in earlier transactions can't be returned, the revert could be rolled back
+	if (prefix, count) not in transaction.used_numbers:
+		return False
+
+	with _series_blocks_lock:
+		block = _series_blocks.get((frappe.local.site, prefix))
+		if block and block.next - 1 == count:
+			block.next -= 1
+			transaction.used_numbers.remove((prefix, count))
+			return True
+
+	return False
+
+
+def log_skipped_series_numbers(prefix, start, end, site=None):
+	if start > end:
+		return
+
+	site = site or frappe.local.site
+	frappe.logger("naming", allow_site=site).info(
+		{"site": site, "series": prefix, "skipped_from": start, "skipped_to": end}
+	)
 
 
 def revert_series_if_last(key, name, doc=None):
@@ -440,6 +614,11 @@ def revert_series_if_last(key, name, doc=None):
 		prefix = parse_naming_series(prefix.split("."), doc=doc)
 
 	count = cint(name.replace(prefix, ""))
+	if get_series_block_size(prefix):
+		# counter in `tabSeries` is the end of the last reserved block
+		revert_series_block(prefix, count)
+		return
+
 	series = DocType("Series")
 	current = (frappe.qb.from_(series).where(series.name == prefix).for_update().select("current")).run()
 
@@ -184,6 +184,10 @@ def rename_doc(
 
 	rename_dynamic_links(doctype, old, new)
 
+	from frappe.core.doctype.user_permission.user_permission import update_renamed_user_permission_matches
+
+	update_renamed_user_permission_matches(doctype, old, new)
+
 	# save the user settings in the db
 	update_user_settings(old, new, link_fields)
 
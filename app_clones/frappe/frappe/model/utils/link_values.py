@@ -0,0 +1,100 @@
+# Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
+# License: MIT. See LICENSE
+
+from collections import defaultdict
+
+import frappe
+from frappe import _dict
+from frappe.utils import cstr
+
+LINK_VALUES_BATCH_SIZE = 1000
+
+
+class LinkValues:
+	"""Values of documents linked from a set of documents (usually a parent and its children).
+
+	All links to the same doctype are fetched with one query (per `LINK_VALUES_BATCH_SIZE`
+	names) along with all the values to be fetched via `fetch_from` and the docstatus, instead
+	of a query per link field per row.
+
+	Lookups that can't be answered from the fetched values (e.g. document not found, which
+	may also be a collation difference) return `None` and are left to the caller.
+	"""
+
+	def __init__(self, docs):
+		self.values = {}
+		self.fetched_fields = {}
+		self.fetch(docs)
+
+	def fetch(self, docs):
+		names = defaultdict(set)
+		fields = defaultdict(set)
+
+		for doc in docs:
+			link_fields = doc.meta.get_link_fields() + doc.meta.get(
+				"fields", {"fieldtype": ("=", "Dynamic Link")}
+			)
+			for df in link_fields:
+				docname = doc.get(df.fieldname)
+				doctype = df.options if df.fieldtype == "Link" else doc.get(df.options)
+				if not docname or not doctype:
+					continue
+
+				meta = frappe.get_meta(doctype)
+				if meta.issingle or meta.get("is_virtual"):
+					continue
+
+				names[doctype].add(docname)
+				fields[doctype].update(
+					_df.fetch_from.split(".")[-1] for _df in doc.meta.get_fields_to_fetch(df.fieldname)
+				)
+				if meta.is_submittable:
+					fields[doctype].add("docstatus")
+
+		stats = get_link_validation_stats()
+		for doctype, doctype_names in names.items():
+			columns = set(frappe.db.get_table_columns(doctype))
+			to_fetch = ["name", *sorted(f for f in fields[doctype] if f in columns and f != "name")]
+			self.fetched_fields[doctype] = set(to_fetch)
+			self.values[doctype] = {}
+
+			table = frappe.qb.DocType(doctype)
+			doctype_names = list(doctype_names)
+			for i in range(0, len(doctype_names), LINK_VALUES_BATCH_SIZE):
+				batch = doctype_names[i : i + LINK_VALUES_BATCH_SIZE]
+				for row in (
+					frappe.qb.from_(table).select(*to_fetch).where(table.name.isin(batch)).run(as_dict=True)
+				):
+					self.values[doctype][get_key(row.name)] = row
+				stats["queries"] += 1
+				stats["queries_saved"] -= 1
+
+	def get(self, doctype, docname, fields_to_fetch=None) -> _dict | None:
+		"""Returns fetched values of linked document, `None` if they weren't fetched."""
+		values = self.values.get(doctype, {}).get(get_key(docname))
+		if values is None:
+			return None
+
+		fetched_fields = self.fetched_fields[doctype]
+		if any(_df.fetch_from.split(".")[-1] not in fetched_fields for _df in fields_to_fetch or ()):
+			return None
+
+		stats = get_link_validation_stats()
+		stats["lookups"] += 1
+		stats["queries_saved"] += 1
+		return values
+
+
+def get_key(docname):
+	# MariaDB compares names case insensitively, Postgres doesn't
+	if frappe.db.db_type == "mariadb":
+		return cstr(docname).casefold()
+	return cstr(docname)
+
+
+def get_link_validation_stats() -> dict:
+	"""Link lookups served from batched link values in this request, queries made to fetch them
+	and queries saved compared to querying every lookup separately."""
+	if not hasattr(frappe.local, "_link_validation_stats"):
+		frappe.local._link_validation_stats = {"lookups": 0, "queries": 0, "queries_saved": 0}
+	return frappe.local._link_validation_stats
@@ -472,6 +472,8 @@ frappe.views.BaseList = class BaseList {
 			order_by: this.sort_selector && this.sort_selector.get_sql_string(),
 			start: this.start,
 			page_length: this.page_length,
+			// seek past the last loaded row instead of scanning `start` rows
+			cursor: this.start ? this.next_cursor || undefined : "",
 			view: this.view,
 			group_by: group_by_required ? group_by : null,
 		};
@@ -530,6 +532,7 @@ frappe.views.BaseList = class BaseList {
 
 	prepare_data(r) {
 		let data = r.message || {};
+		this.next_cursor = r.next_cursor;
 
 		// extract user_info for assignments
 		Object.assign(frappe.boot.user_info, data.user_info);
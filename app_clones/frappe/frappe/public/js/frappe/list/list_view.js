@@ -1525,6 +1525,7 @@ frappe.views.ListView = class ListView extends frappe.views.BaseList {
 		const call_args = this.get_call_args();
 		call_args.args.filters.push([this.doctype, "name", "in", names]);
 		call_args.args.start = 0;
+		delete call_args.args.cursor;
 
 		frappe.call(call_args).then(({ message }) => {
 			if (!message) return;
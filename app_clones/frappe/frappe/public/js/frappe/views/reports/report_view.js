@@ -224,6 +224,7 @@ frappe.views.ReportView = class ReportView extends frappe.views.ListView {
 
 	prepare_data(r) {
 		let data = r.message || {};
+		this.next_cursor = r.next_cursor;
 		data = frappe.utils.dict(data.keys, data.values);
 
 		if (this.start === 0) {
@@ -1,10 +1,19 @@
+import pickle
 import time
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import redis
 
 import frappe
 from frappe.tests.test_api import FrappeAPITestCase
 from frappe.tests.utils import FrappeTestCase
-from frappe.utils.caching import redis_cache, request_cache, site_cache
+from frappe.utils.caching import (
+	SITE_CACHE_INVALIDATION_CHANNEL,
+	redis_cache,
+	request_cache,
+	site_cache,
+)
+from frappe.utils.redis_wrapper import CLIENT_CACHE_INVALIDATION_CHANNEL, ClientCache, RedisWrapper
 
 CACHE_TTL = 4
 external_service = MagicMock(return_value=30)
@@ -92,6 +101,57 @@ class TestSiteCache(FrappeAPITestCase):
 		self.get(f"/api/method/{api_with_ttl}")
 		self.assertEqual(register_with_external_service.call_count, 3)
 
+	def test_site_cache_lru_eviction(self):
+		function_call_count = 0
+
+		@site_cache(maxsize=2)
+		def square(x: int) -> int:
+			nonlocal function_call_count
+			function_call_count += 1
+			return x * x
+
+		square.clear_cache()
+		square(1)
+		square(2)
+		square(1)  # 1 is now the most recently used entry
+		square(3)  # evicts 2
+		self.assertEqual(function_call_count, 3)
+
+		square(1)
+		self.assertEqual(function_call_count, 3)
+		square(2)
+		self.assertEqual(function_call_count, 4)
+
+		info = square.cache_info()
+		self.assertEqual(info["hits"], 2)
+		self.assertEqual(info["misses"], 4)
+		self.assertEqual(info["evictions"], 2)
+		self.assertEqual(info["currsize"], 2)
+		self.assertEqual(info["maxsize"], 2)
+
+	def test_shared_site_cache_invalidation(self):
+		function_call_count = 0
+
+		@site_cache(shared=True)
+		def cube(x: int) -> int:
+			nonlocal function_call_count
+			function_call_count += 1
+			return x**3
+
+		cube(2)
+		cube(2)
+		self.assertEqual(function_call_count, 1)
+
+		# invalidation published by some other worker
+		func_key = f"{cube.__module__}.{cube.__name__}"
+		frappe.cache.publish(SITE_CACHE_INVALIDATION_CHANNEL, f"other-host:1|{func_key}")
+		time.sleep(0.1)
+
+		cube(2)
+		self.assertEqual(function_call_count, 2)
+		cube(2)
+		self.assertEqual(function_call_count, 2)
+
 
 class TestRedisCache(FrappeAPITestCase):
 	def test_redis_cache(self):
@@ -273,3 +333,93 @@ class TestRedisWrapper(FrappeAPITestCase):
 
 	def test_backward_compat_cache(self):
 		self.assertEqual(frappe.cache, frappe.cache())
+
+	def test_client_cache(self):
+		client_cache = ClientCache(frappe.cache, maxsize=10, names=["test_client_cache"])
+		with patch.object(RedisWrapper, "client_cache", new_callable=PropertyMock, return_value=client_cache):
+			frappe.cache.hset("test_client_cache", "key", {"value": 1})
+			frappe.local.cache = {}
+
+			with patch("redis.Redis.hget") as redis_hget:
+				self.assertEqual(frappe.cache.hget("test_client_cache", "key"), {"value": 1})
+				redis_hget.assert_not_called()
+
+			# write from some other process
+			_name = frappe.cache.make_key("test_client_cache")
+			frappe.cache.publish(
+				CLIENT_CACHE_INVALIDATION_CHANNEL, pickle.dumps(("other-host:1", _name, "key"))
+			)
+			redis.Redis.hset(frappe.cache, _name, "key", pickle.dumps({"value": 2}))
+			time.sleep(0.1)
+			frappe.local.cache = {}
+			self.assertEqual(frappe.cache.hget("test_client_cache", "key"), {"value": 2})
+
+			frappe.cache.delete_key("test_client_cache")
+			self.assertEqual(client_cache.info()["currsize"], 0)
+
+	def test_client_cache_values_not_shared(self):
+		client_cache = ClientCache(frappe.cache, maxsize=10, names=["test_client_cache"])
+		with patch.object(RedisWrapper, "client_cache", new_callable=PropertyMock, return_value=client_cache):
+			value = {"value": 1}
+			frappe.cache.hset("test_client_cache", "key", value)
+			value["value"] = 2
+
+			# every request gets its own copy of the cached value
+			frappe.local.cache = {}
+			cached_value = frappe.cache.hget("test_client_cache", "key")
+			self.assertEqual(cached_value, {"value": 1})
+			cached_value["value"] = 3
+
+			frappe.local.cache = {}
+			self.assertEqual(frappe.cache.hget("test_client_cache", "key"), {"value": 1})
+
+	def test_client_cache_get_value(self):
+		client_cache = ClientCache(frappe.cache, maxsize=10, names=["test_client_cache"])
+		with patch.object(RedisWrapper, "client_cache", new_callable=PropertyMock, return_value=client_cache):
+			frappe.cache.set_value("test_client_cache", {"value": 1})
+			frappe.local.cache = {}
+
+			with patch("redis.Redis.get") as redis_get:
+				cached_value = frappe.cache.get_value("test_client_cache")
+				self.assertEqual(cached_value, {"value": 1})
+				redis_get.assert_not_called()
+
+			cached_value["value"] = 2
+			frappe.local.cache = {}
+			self.assertEqual(frappe.cache.get_value("test_client_cache"), {"value": 1})
+
+			frappe.cache.delete_value("test_client_cache")
+			self.assertEqual(client_cache.info()["currsize"], 0)
+			frappe.local.cache = {}
+			self.assertIsNone(frappe.cache.get_value("test_client_cache"))
+
+	def test_client_cache_invalidated_after_write(self):
+		client_cache = ClientCache(frappe.cache, maxsize=10, names=["test_client_cache"])
+		_name = frappe.cache.make_key("test_client_cache")
+		values_on_invalidate = []
+
+		def invalidate(_name, key=None, publish=True):
+			# the value in redis must already be updated when other processes are told to re-read it
+			values_on_invalidate.append(redis.Redis.hget(frappe.cache, _name, key))
+
+		with (
+			patch.object(RedisWrapper, "client_cache", new_callable=PropertyMock, return_value=client_cache),
+			patch.object(client_cache, "invalidate", side_effect=invalidate),
+		):
+			frappe.cache.hset("test_client_cache", "key", {"value": 1})
+			frappe.cache.hdel("test_client_cache", "key")
+
+		self.assertEqual(values_on_invalidate, [pickle.dumps({"value": 1}), None])
+
+	def test_client_cache_per_site(self):
+		with patch.dict(frappe.conf, {"client_cache_size": 10}):
+			client_cache = frappe.cache.client_cache
+			self.assertEqual(client_cache.maxsize, 10)
+			self.assertIs(frappe.cache.client_cache, client_cache)
+
+			with patch.dict(frappe.conf, {"db_name": "_other_site", "client_cache_size": 20}):
+				self.assertEqual(frappe.cache.client_cache.maxsize, 20)
+				self.assertIsNot(frappe.cache.client_cache, client_cache)
+
+		with patch.dict(frappe.conf, {"client_cache_size": 0}):
+			self.assertIsNone(frappe.cache.client_cache)
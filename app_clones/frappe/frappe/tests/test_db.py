@@ -1093,7 +1093,28 @@ class TestSqlIterator(FrappeTestCase):
 				msg=f"{query=} results not same as iterator",
 			)
 
+			self.assertEqual(
+				list(frappe.db.sql(query)),
+				list(frappe.db.sql(query, as_iterator=True, batch_size=7)),
+				msg=f"{query=} results not same as iterator",
+			)
+
 	@run_only_if(db_type_is.MARIADB)
 	def test_unbuffered_cursor(self):
 		with frappe.db.unbuffered_cursor():
 			self.test_db_sql_iterator()
+
+	def test_iter_all(self):
+		expected = frappe.get_all("Country", fields=["name", "code"], order_by="name")
+		rows = list(frappe.db.iter_all("Country", fields=["name", "code"], order_by="name", batch_size=10))
+
+		self.assertEqual(len(rows), len(expected))
+		self.assertEqual([(row.name, row.code) for row in rows], [(d.name, d.code) for d in expected])
+
+	def test_iter_all_pluck(self):
+		expected = frappe.get_all("Country", pluck="name", order_by="name")
+		self.assertEqual(list(frappe.db.iter_all("Country", pluck="name", order_by="name")), expected)
+
+	def test_iter_list_permissions(self):
+		with self.set_user("Guest"):
+			self.assertRaises(frappe.PermissionError, lambda: list(frappe.db.iter_list("ToDo")))
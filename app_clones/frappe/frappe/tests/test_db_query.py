@@ -573,6 +573,69 @@ class TestDBQuery(FrappeTestCase):
 		update("Nested DocType", "All", 0, "if_owner", 1)
 		frappe.set_user("Administrator")
 
+	def test_user_permission_match_subquery(self):
+		from frappe.core.doctype.user_permission.user_permission import update_queued_user_permission_matches
+
+		frappe.set_user("Administrator")
+		create_nested_doctype()
+		create_nested_doctype_records()
+		clear_user_permissions_for_doctype("Nested DocType")
+		add_user_permission("Nested DocType", "Level 1 A", "test2@example.com")
+		update("Nested DocType", "All", 0, "if_owner", 0)
+
+		# new descendants are permitted too
+		frappe.get_doc(
+			doctype="Nested DocType", name="Level 2 A-1", parent_nested_doctype="Level 1 A"
+		).insert(ignore_if_duplicate=True)
+
+		# materialized user permissions are updated before commit
+		update_queued_user_permission_matches()
+
+		frappe.set_user("test2@example.com")
+		with patch("frappe.model.db_query.INLINE_MATCH_VALUES_LIMIT", 0):
+			self.assertIn("__UserPermissionMatch", DatabaseQuery("Nested DocType").build_match_conditions())
+			data = DatabaseQuery("Nested DocType").execute()
+
+		self.assertIn({"name": "Level 2 A"}, data)
+		self.assertIn({"name": "Level 2 A-1"}, data)
+		self.assertNotIn({"name": "Level 1 B"}, data)
+		self.assertNotIn({"name": "Level 2 B"}, data)
+
+		frappe.set_user("Administrator")
+		update("Nested DocType", "All", 0, "if_owner", 1)
+
+	def test_user_permission_match_updates(self):
+		from frappe.core.doctype.user_permission.user_permission import update_queued_user_permission_matches
+
+		frappe.set_user("Administrator")
+		create_nested_doctype()
+		create_nested_doctype_records()
+		clear_user_permissions_for_doctype("Nested DocType")
+		add_user_permission("Nested DocType", "Level 1 A", "test2@example.com")
+		add_user_permission("Nested DocType", "Level 1 B", "test1@example.com")
+		update_queued_user_permission_matches()
+
+		# only users permitted on ancestors of the new node are updated
+		name = f"Level 3 A-{frappe.generate_hash(length=5)}"
+		frappe.get_doc(doctype="Nested DocType", name=name, parent_nested_doctype="Level 2 A").insert()
+		self.assertEqual(frappe.local.user_permission_match_queue, {"test2@example.com"})
+		update_queued_user_permission_matches()
+
+		def get_permitted_values(user):
+			match = frappe.qb.Table("__UserPermissionMatch")
+			return frappe.qb.from_(match).select(match.for_value).where(match.user == user).run(pluck=True)
+
+		# renamed documents stay permitted
+		frappe.rename_doc("Nested DocType", name, f"{name}-renamed", force=True)
+		update_queued_user_permission_matches()
+		self.assertIn(f"{name}-renamed", get_permitted_values("test2@example.com"))
+		self.assertNotIn(name, get_permitted_values("test2@example.com"))
+
+		# deleted documents aren't
+		frappe.delete_doc("Nested DocType", f"{name}-renamed")
+		update_queued_user_permission_matches()
+		self.assertNotIn(f"{name}-renamed", get_permitted_values("test2@example.com"))
+
 	def test_filter_sanitizer(self):
 		self.assertRaises(
 			frappe.DataError,
@@ -805,6 +868,30 @@ class TestDBQuery(FrappeTestCase):
 		owners = DatabaseQuery("DocType").execute(filters={"name": "DocType"}, pluck="owner")
 		self.assertEqual(owners, ["Administrator"])
 
+	def test_cursor_pagination(self):
+		for order_by, fields in (("modified desc", ["name"]), ("module asc", ["name", "module"])):
+			expected = [d.name for d in frappe.get_all("DocType", fields=fields, order_by=order_by)]
+			names, cursor = [], ""
+			while True:
+				query = DatabaseQuery("DocType")
+				page = query.execute(fields=fields, order_by=order_by, limit_page_length=50, cursor=cursor)
+				self.assertTrue(all("_keyset_0" not in row for row in page))
+				names.extend(row.name for row in page)
+				if not (cursor := query.next_cursor):
+					break
+
+			# `modified` is seeked, `module` isn't indexed and falls back to offsets
+			self.assertCountEqual(names, expected)
+
+	def test_cursor_sort_order_mismatch(self):
+		query = DatabaseQuery("DocType")
+		query.execute(order_by="modified desc", limit_page_length=5, cursor="")
+
+		with self.assertRaises(frappe.ValidationError):
+			DatabaseQuery("DocType").execute(
+				order_by="name asc", limit_page_length=5, cursor=query.next_cursor
+			)
+
 	def test_prepare_select_args(self):
 		# frappe.get_all inserts modified field into order_by clause
 		# test to make sure this is inserted into select field when postgres
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import frappe
 from frappe.deferred_insert import deferred_insert, save_to_db
 from frappe.tests.utils import FrappeTestCase
@@ -16,3 +18,27 @@ class TestDeferredInsert(FrappeTestCase):
 		frappe.clear_cache()  # deferred_insert cache keys are supposed to be persistent
 		save_to_db()
 		self.assertTrue(frappe.db.exists("Route History", route_history))
+
+	def test_deferred_insert_fast_path(self):
+		routes = [{"route": frappe.generate_hash(), "user": "Administrator"} for _ in range(5)]
+		deferred_insert("Route History", routes[:2])
+		deferred_insert("Route History", routes[2:])
+
+		with patch("frappe.deferred_insert.insert_record") as insert_record:
+			save_to_db()
+			insert_record.assert_not_called()
+
+		for route in routes:
+			self.assertTrue(frappe.db.exists("Route History", route))
+
+	@patch.dict(frappe.conf, {"deferred_insert_records_per_run": 2})
+	def test_deferred_insert_records_per_run(self):
+		routes = [{"route": frappe.generate_hash(), "user": "Administrator"} for _ in range(3)]
+		for route in routes:
+			deferred_insert("Route History", [route])
+
+		save_to_db()
+		self.assertEqual(frappe.db.count("Route History", {"route": ("in", [r["route"] for r in routes])}), 2)
+
+		save_to_db()
+		self.assertEqual(frappe.db.count("Route History", {"route": ("in", [r["route"] for r in routes])}), 3)
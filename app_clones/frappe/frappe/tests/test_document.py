@@ -78,6 +78,84 @@ class TestDocument(FrappeTestCase):
 		doc.save()
 		self.assertEqual(doc.child_table[-1].some_fieldname, default)
 
+	def test_update_only_changed_child_rows(self):
+		from frappe.model.base_document import BaseDocument
+
+		child_table = new_doctype(istable=1).insert().name
+		parent = (
+			new_doctype(fields=[{"fieldtype": "Table", "options": child_table, "fieldname": "child_table"}])
+			.insert()
+			.name
+		)
+
+		doc = frappe.get_doc(
+			{"doctype": parent, "child_table": [{"some_fieldname": f"row {i}"} for i in range(5)]}
+		).insert()
+		inserted_on = frappe.db.get_value(child_table, doc.child_table[0].name, "modified")
+		doc.child_table[1].some_fieldname = "changed"
+		doc.append("child_table", {"some_fieldname": "new row 1"})
+		doc.append("child_table", {"some_fieldname": "new row 2"})
+
+		with patch.object(
+			BaseDocument, "db_update", autospec=True, side_effect=BaseDocument.db_update
+		) as db_update:
+			doc.save()
+
+		updated_rows = [
+			call.args[0].name for call in db_update.call_args_list if call.args[0].doctype == child_table
+		]
+		self.assertEqual(updated_rows, [doc.child_table[1].name])
+
+		doc.reload()
+		self.assertEqual(
+			[d.some_fieldname for d in doc.child_table],
+			["row 0", "changed", "row 2", "row 3", "row 4", "new row 1", "new row 2"],
+		)
+		# unchanged rows aren't written at all
+		self.assertEqual(
+			[d.modified == doc.modified for d in doc.child_table],
+			[False, True, False, False, False, True, True],
+		)
+		self.assertEqual(doc.child_table[0].modified, inserted_on)
+
+	def test_bulk_insert_child_rows_savepoint(self):
+		child_table = new_doctype(istable=1).insert().name
+		parent = (
+			new_doctype(fields=[{"fieldtype": "Table", "options": child_table, "fieldname": "child_table"}])
+			.insert()
+			.name
+		)
+
+		def save_with_new_rows():
+			doc = frappe.get_doc({"doctype": parent}).insert()
+			for i in range(3):
+				doc.append("child_table", {"some_fieldname": f"row {i}"})
+			return doc.save()
+
+		# savepoint isn't released after a failed insert, the original error is raised
+		with (
+			patch.object(frappe.db, "bulk_insert", side_effect=frappe.db.InternalError),
+			patch.object(frappe.db, "release_savepoint") as release_savepoint,
+			self.assertRaises(frappe.db.InternalError),
+		):
+			save_with_new_rows()
+		release_savepoint.assert_not_called()
+
+		# or after a duplicate name, rows are inserted one by one
+		with (
+			patch.object(frappe.db, "bulk_insert", side_effect=frappe.db.InternalError),
+			patch.object(frappe.db, "is_primary_key_violation", return_value=True),
+			patch.object(frappe.db, "release_savepoint") as release_savepoint,
+		):
+			doc = save_with_new_rows()
+		release_savepoint.assert_not_called()
+		self.assertEqual(frappe.db.count(child_table, {"parent": doc.name}), 3)
+
+		with patch.object(frappe.db, "release_savepoint") as release_savepoint:
+			doc = save_with_new_rows()
+		release_savepoint.assert_called_once_with("bulk_insert_child_rows")
+		self.assertEqual(frappe.db.count(child_table, {"parent": doc.name}), 3)
+
 	def test_insert_with_child(self):
 		d = frappe.get_doc(
 			{
@@ -178,6 +256,49 @@ class TestDocument(FrappeTestCase):
 
 		self.assertEqual(frappe.db.get_value("User", d.name), d.name)
 
+	def test_batched_link_validation(self):
+		from frappe.model.utils.link_values import get_link_validation_stats
+		from frappe.permissions import AUTOMATIC_ROLES
+
+		frappe.delete_doc_if_exists("User", "test_batched_links@example.com", 1)
+		roles = frappe.get_all(
+			"Role",
+			filters={"desk_access": 1, "disabled": 0, "name": ("not in", AUTOMATIC_ROLES)},
+			pluck="name",
+			limit=10,
+		)
+
+		d = frappe.get_doc(
+			{
+				"doctype": "User",
+				"email": "test_batched_links@example.com",
+				"first_name": "Batched Links",
+				"roles": [{"role": role} for role in roles],
+			}
+		)
+
+		stats = get_link_validation_stats()
+		queries_saved = stats["queries_saved"]
+		d.insert()
+
+		self.assertGreaterEqual(stats["queries_saved"] - queries_saved, len(roles) - 1)
+
+		d.append("roles", {"role": "Not A Role"})
+		self.assertRaises(frappe.LinkValidationError, d.save)
+
+	def test_batched_link_values_case(self):
+		from frappe.model.utils.link_values import LinkValues
+
+		d = frappe.new_doc("User")
+		d.append("roles", {"role": "SYSTEM MANAGER"})
+		link_values = LinkValues(d.roles)
+
+		if frappe.db.db_type == "mariadb":
+			self.assertEqual(link_values.get("Role", "SYSTEM MANAGER").name, "System Manager")
+		else:
+			# names are case sensitive on postgres
+			self.assertIsNone(link_values.get("Role", "SYSTEM MANAGER"))
+
 	def test_validate(self):
 		d = self.test_insert()
 		d.starts_on = "2014-01-01"
@@ -3,6 +3,7 @@
 
 import time
 import unittest
+from unittest.mock import patch
 
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_full_jitter
 
@@ -215,6 +216,34 @@ class TestNaming(FrappeTestCase):
 
 		frappe.db.delete("Series", {"name": series})
 
+	def test_naming_series_blocks(self):
+		prefix = "TEST-BLOCK-"
+		key = f"{prefix}.###"
+		frappe.db.delete("Series", {"name": prefix})
+		series = NamingSeries(key)
+
+		with patch.dict(frappe.conf, {"naming_series_block_size": {prefix: 5}}):
+			self.assertEqual(getseries(prefix, 3), "001")
+			self.assertEqual(series.get_current_value(), 5)
+
+			self.assertEqual(getseries(prefix, 3), "002")
+			revert_series_if_last(key, f"{prefix}002")
+			self.assertEqual(getseries(prefix, 3), "002")
+
+			names = [getseries(prefix, 3) for _ in range(4)]
+			self.assertEqual(names, ["003", "004", "005", "006"])
+			self.assertEqual(series.get_current_value(), 10)
+
+			# reserved numbers are not used after counter is updated
+			series.update_counter(20)
+			self.assertEqual(getseries(prefix, 3), "021")
+			self.assertEqual(series.get_current_value(), 25)
+
+			# background jobs don't reserve blocks
+			with patch.object(frappe.local, "job", frappe._dict(method="test"), create=True):
+				self.assertEqual(getseries(prefix, 3), "026")
+				self.assertEqual(series.get_current_value(), 26)
+
 	def test_naming_for_cancelled_and_amended_doc(self):
 		submittable_doctype = frappe.get_doc(
 			{
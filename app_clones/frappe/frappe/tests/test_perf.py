@@ -58,6 +58,32 @@ class TestPerformance(FrappeTestCase):
 		with self.assertQueryCount(0):
 			frappe.get_meta("User")
 
+	def test_compiled_meta_caching(self):
+		from frappe.model.meta import COMPILED_META_CACHE_KEY
+
+		frappe.get_meta("User")
+		frappe.clear_cache()
+		self.assertTrue(frappe.cache.hexists(COMPILED_META_CACHE_KEY, "User"))
+
+		# only the version check and the table's state should hit the database
+		with patch("frappe.model.meta.Meta.process") as process, self.assertQueryCount(4):
+			meta = frappe.get_meta("User")
+		process.assert_not_called()
+		self.assertTrue(meta.has_field("first_name"))
+		self.assertTrue(meta.get_link_fields())
+		self.assertEqual(meta.get_table_field_doctypes()["roles"], "Has Role")
+
+	def test_compiled_meta_version(self):
+		from frappe.custom.doctype.property_setter.property_setter import make_property_setter
+		from frappe.model.meta import get_meta_version
+
+		version = get_meta_version("ToDo")
+		self.assertEqual(version, get_meta_version("ToDo"))
+
+		make_property_setter("ToDo", "description", "bold", 1, "Check")
+		self.assertNotEqual(version, get_meta_version("ToDo"))
+		frappe.db.rollback()
+
 	def test_permitted_fieldnames(self):
 		frappe.clear_cache()
 
@@ -3,15 +3,24 @@
 
 import datetime
 import json
-from collections import defaultdict
+import os
+import socket
+from collections import OrderedDict, defaultdict
 from collections.abc import Callable
 from functools import wraps
 
 import pytz
+import redis
 
 import frappe
 
-_SITE_CACHE = defaultdict(lambda: defaultdict(dict))
+_SITE_CACHE = defaultdict(lambda: defaultdict(OrderedDict))
+_SITE_CACHE_STATS = defaultdict(lambda: {"hits": 0, "misses": 0, "evictions": 0})
+
+# site_cache(shared=True) functions registered in this process, keyed by func_key
+_SHARED_SITE_CACHE_FUNCTIONS = set()
+SITE_CACHE_INVALIDATION_CHANNEL = "frappe:site_cache:invalidate"
+_invalidation_listener = None
 
 
 def __generate_request_cache_key(args: tuple, kwargs: dict):
@@ -63,14 +72,19 @@ def request_cache(func: Callable) -> Callable:
 	return wrapper
 
 
-def site_cache(ttl: int | None = None, maxsize: int | None = None) -> Callable:
+def site_cache(ttl: int | None = None, maxsize: int | None = None, shared: bool = False) -> Callable:
 	"""Decorator to cache method calls across requests. The cache is stored in
 	frappe.utils.caching._SITE_CACHE. The cache persists on the parent process.
 	It offers a light-weight cache for the current process without the additional
 	overhead of serializing / deserializing Python objects.
 
-	Note: This cache isn't shared among workers. If you need to share data across
-	workers, use redis (frappe.cache API) instead.
+	Once `maxsize` entries are cached for a site, the least recently used entry is
+	evicted. Hits, misses and evictions are available via `func.cache_info()`.
+
+	Note: Values aren't shared among workers. If you need to share data across
+	workers, use redis (frappe.cache API) instead. With `shared=True`, calling
+	`func.clear_cache()` in any worker invalidates this function's cache in every
+	worker connected to the same redis cache server.
 
 	Usage:
 	        from frappe.utils.caching import site_cache
@@ -89,12 +103,27 @@ def site_cache(ttl: int | None = None, maxsize: int | None = None) -> Callable:
 
 	def time_cache_wrapper(func: Callable | None = None) -> Callable:
 		func_key = f"{func.__module__}.{func.__name__}"
+		stats = _SITE_CACHE_STATS[func_key]
 
 		def clear_cache():
 			"""Clear cache for this function for all sites if not specified."""
 			_SITE_CACHE[func_key].clear()
+			if shared:
+				_publish_invalidation(func_key)
+
+		def cache_info():
+			"""Return hit, miss & eviction counters along with the current size for the active site."""
+			info = dict(stats)
+			site = getattr(frappe.local, "site", None)
+			info["currsize"] = len(_SITE_CACHE[func_key].get(site, ()))
+			info["maxsize"] = getattr(func, "maxsize", None)
+			return info
 
 		func.clear_cache = clear_cache
+		func.cache_info = cache_info
+
+		if shared:
+			_SHARED_SITE_CACHE_FUNCTIONS.add(func_key)
 
 		if ttl is not None and not callable(ttl):
 			func.ttl = ttl
@@ -108,19 +137,29 @@ def site_cache(ttl: int | None = None, maxsize: int | None = None) -> Callable:
 			if getattr(frappe.local, "initialised", None):
 				func_call_key = json.dumps((args, kwargs))
 
+				if shared:
+					_process_invalidations()
+
 				if hasattr(func, "ttl") and datetime.datetime.now(pytz.UTC) >= func.expiration:
-					func.clear_cache()
+					# expiry is tracked per process, other workers needn't be notified
+					_SITE_CACHE[func_key].clear()
 					func.expiration = datetime.datetime.now(pytz.UTC) + datetime.timedelta(seconds=func.ttl)
 
-				if hasattr(func, "maxsize") and len(_SITE_CACHE[func_key][frappe.local.site]) >= func.maxsize:
-					_SITE_CACHE[func_key][frappe.local.site].pop(
-						next(iter(_SITE_CACHE[func_key][frappe.local.site])), None
-					)
+				cache = _SITE_CACHE[func_key][frappe.local.site]
 
-				if func_call_key not in _SITE_CACHE[func_key][frappe.local.site]:
-					_SITE_CACHE[func_key][frappe.local.site][func_call_key] = func(*args, **kwargs)
+				if func_call_key in cache:
+					cache.move_to_end(func_call_key)
+					stats["hits"] += 1
+					return cache[func_call_key]
 
-				return _SITE_CACHE[func_key][frappe.local.site][func_call_key]
+				stats["misses"] += 1
+				value = cache[func_call_key] = func(*args, **kwargs)
+
+				if hasattr(func, "maxsize") and len(cache) > func.maxsize:
+					cache.popitem(last=False)
+					stats["evictions"] += 1
+
+				return value
 
 			return func(*args, **kwargs)
 
@@ -132,6 +171,67 @@ def site_cache(ttl: int | None = None, maxsize: int | None = None) -> Callable:
 	return time_cache_wrapper
 
 
+def clear_site_cache():
+	"""Clear site_cache for all functions, notifying other workers of functions defined with `shared=True`."""
+	_SITE_CACHE.clear()
+	if _SHARED_SITE_CACHE_FUNCTIONS:
+		_publish_invalidation("*")
+
+
+def _get_origin() -> str:
+	return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _publish_invalidation(func_key: str):
+	if not frappe.cache:
+		return
+	try:
+		frappe.cache.publish(SITE_CACHE_INVALIDATION_CHANNEL, f"{_get_origin()}|{func_key}")
+	except redis.exceptions.ConnectionError:
+		pass
+
+
+def _invalidate_local(func_key: str):
+	if func_key == "*":
+		for key in _SHARED_SITE_CACHE_FUNCTIONS:
+			_SITE_CACHE.pop(key, None)
+	else:
+		_SITE_CACHE.pop(func_key, None)
+
+
+def _process_invalidations():
+	"""Apply invalidations published by other workers.
+
+	Pending messages are read off the subscription's socket without blocking, so
+	this doesn't cost a round trip to redis.
+	"""
+	global _invalidation_listener
+
+	if not frappe.cache:
+		return
+
+	pid = os.getpid()
+	try:
+		if _invalidation_listener is None or _invalidation_listener[0] != pid:
+			# Messages published before subscribing (or while forking) are lost
+			_invalidation_listener = None
+			_invalidate_local("*")
+
+			pubsub = frappe.cache.pubsub(ignore_subscribe_messages=True)
+			pubsub.subscribe(SITE_CACHE_INVALIDATION_CHANNEL)
+			_invalidation_listener = (pid, pubsub)
+
+		origin = _get_origin()
+		while message := _invalidation_listener[1].get_message():
+			sender, func_key = frappe.safe_decode(message["data"]).split("|", 1)
+			if sender != origin:
+				_invalidate_local(func_key)
+
+	except redis.exceptions.ConnectionError:
+		# resubscribe (and drop possibly stale values) on next call
+		_invalidation_listener = None
+
+
 def redis_cache(ttl: int | None = 3600, user: str | bool | None = None, shared: bool = False) -> Callable:
 	"""Decorator to cache method calls and its return values in Redis
 
@@ -39,6 +39,11 @@ class NestedSetInvalidMergeError(frappe.ValidationError):
 
 # called in the on_update method
 def update_nsm(doc):
+	from frappe.core.doctype.user_permission.user_permission import (
+		update_descendant_user_permission_matches,
+		user_permission_match_table_exists,
+	)
+
 	# get fields, data from the DocType
 	old_parent_field = "old_parent"
 	parent_field = "parent_" + frappe.scrub(doc.doctype)
@@ -53,8 +58,15 @@ def update_nsm(doc):
 	# has parent changed (?) or parent is None (root)
 	if not doc.lft and not doc.rgt:
 		update_add_node(doc, parent or "", parent_field)
+		if user_permission_match_table_exists():
+			update_descendant_user_permission_matches(doc.doctype, get_ancestors_of(doc.doctype, doc.name))
 	elif old_parent != parent:
+		# users permitted on old as well as new ancestors see the moved subtree change
+		ancestors = get_ancestors_of(doc.doctype, doc.name) if user_permission_match_table_exists() else []
 		update_move_node(doc, parent_field)
+		if user_permission_match_table_exists():
+			ancestors += get_ancestors_of(doc.doctype, doc.name)
+			update_descendant_user_permission_matches(doc.doctype, ancestors)
 
 	# set old parent
 	doc.set(old_parent_field, parent)
@@ -238,8 +250,16 @@ def remove_subtree(doctype: str, name: str, throw=True):
 
 	WARN: This does not run any controller hooks for deletion and deletes them with raw SQL query.
 	"""
+	from frappe.core.doctype.user_permission.user_permission import (
+		update_descendant_user_permission_matches,
+		user_permission_match_table_exists,
+	)
+
 	frappe.has_permission(doctype, ptype="delete", throw=throw)
 
+	if user_permission_match_table_exists():
+		update_descendant_user_permission_matches(doctype, get_ancestors_of(doctype, name))
+
 	# Determine the `lft` and `rgt` of the subtree to be removed.
 	lft, rgt = frappe.db.get_value(doctype, name, ["lft", "rgt"])
 
@@ -1,7 +1,11 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: MIT. See LICENSE
+import os
 import pickle
 import re
+import socket
+import threading
+from collections import OrderedDict
 
 import redis
 from redis.commands.search import Search
@@ -24,6 +28,121 @@ class RedisearchWrapper(Search):
 		return super().sugget(self.client.make_key(key), *args, **kwargs)
 
 
+CLIENT_CACHE_INVALIDATION_CHANNEL = "frappe:client_cache:invalidate"
+DEFAULT_CLIENT_CACHE_KEYS = ("doctype_meta", "defaults", "user_permissions")
+
+
+class ClientCache:
+	"""Bounded, process wide cache of values (`get_value`) and hash fields (`hget`) stored in redis.
+
+	Values are kept pickled, as stored in redis, and unpickled on every read so that
+	requests never share (and modify) the same object. Writes made through `RedisWrapper`
+	are published on a pub/sub channel and every process drops the stale value before
+	its next read.
+	"""
+
+	def __init__(self, redis_client: "RedisWrapper", maxsize: int, names):
+		self.redis = redis_client
+		self.maxsize = maxsize
+		self.names = frozenset(names)
+		self.data = OrderedDict()
+		self.lock = threading.RLock()
+		self.hits = self.misses = self.evictions = 0
+		self._listener = None
+
+	@staticmethod
+	def get_origin() -> str:
+		return f"{socket.gethostname()}:{os.getpid()}"
+
+	def is_cached(self, name: str) -> bool:
+		return name in self.names
+
+	def get(self, _name: bytes, key=None):
+		"""Return `(found, value)` for the hash field, or the value if `key` isn't passed."""
+		self.process_invalidations()
+		cache_key = (frappe.safe_encode(_name), key)
+		with self.lock:
+			try:
+				pickled_value = self.data[cache_key]
+			except KeyError:
+				self.misses += 1
+				return False, None
+
+			self.data.move_to_end(cache_key)
+			self.hits += 1
+
+		return True, pickle.loads(pickled_value)
+
+	def set(self, _name: bytes, key, pickled_value: bytes):
+		cache_key = (frappe.safe_encode(_name), key)
+		with self.lock:
+			self.data[cache_key] = pickled_value
+			self.data.move_to_end(cache_key)
+			if len(self.data) > self.maxsize:
+				self.data.popitem(last=False)
+				self.evictions += 1
+
+	def invalidate(self, _name: bytes, key=None, publish: bool = True):
+		"""Drop a hash field, or the whole hash (or value) if `key` isn't passed."""
+		self._invalidate_local(_name, key)
+		if publish:
+			try:
+				self.redis.publish(
+					CLIENT_CACHE_INVALIDATION_CHANNEL, pickle.dumps((self.get_origin(), _name, key))
+				)
+			except redis.exceptions.ConnectionError:
+				pass
+
+	def _invalidate_local(self, _name: bytes, key=None):
+		_name = frappe.safe_encode(_name)
+		with self.lock:
+			if key is not None:
+				self.data.pop((_name, key), None)
+				return
+
+			for cache_key in [k for k in self.data if k[0] == _name]:
+				del self.data[cache_key]
+
+	def clear(self):
+		with self.lock:
+			self.data.clear()
+
+	def process_invalidations(self):
+		"""Apply invalidations published by other processes.
+
+		Pending messages are read off the subscription's socket without blocking.
+		"""
+		pid = os.getpid()
+		try:
+			if self._listener is None or self._listener[0] != pid:
+				# anything published before subscribing (or inherited via fork) can't be trusted
+				self._listener = None
+				self.clear()
+
+				pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+				pubsub.subscribe(CLIENT_CACHE_INVALIDATION_CHANNEL)
+				self._listener = (pid, pubsub)
+
+			origin = self.get_origin()
+			while message := self._listener[1].get_message():
+				sender, _name, key = pickle.loads(message["data"])
+				if sender != origin:
+					self._invalidate_local(_name, key)
+
+		except redis.exceptions.ConnectionError:
+			self._listener = None
+			self.clear()
+
+	def info(self) -> dict:
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"evictions": self.evictions,
+			"currsize": len(self.data),
+			"maxsize": self.maxsize,
+		}
+
+
 class RedisWrapper(redis.Redis):
 	"""Redis client that will automatically prefix conf.db_name"""
 
@@ -38,6 +157,24 @@ class RedisWrapper(redis.Redis):
 		"""WARNING: Added for backward compatibility to support frappe.cache().method(...)"""
 		return self
 
+	@property
+	def client_cache(self) -> ClientCache | None:
+		"""Process wide cache in front of redis for hashes listed in `client_cache_keys`.
+
+		Enabled by setting `client_cache_size` (max number of hash fields) in site config.
+		Config is read per site, so every site (and config) served by the process gets its own cache."""
+		maxsize = frappe.conf.get("client_cache_size")
+		if not maxsize:
+			return None
+
+		names = tuple(frappe.conf.get("client_cache_keys") or DEFAULT_CLIENT_CACHE_KEYS)
+		cache_key = (frappe.conf.db_name, maxsize, names)
+		client_caches = self.__dict__.setdefault("_client_caches", {})
+		if cache_key not in client_caches:
+			client_caches[cache_key] = ClientCache(self, maxsize=maxsize, names=names)
+
+		return client_caches[cache_key]
+
 	def make_key(self, key, user=None, shared=False):
 		if shared:
 			return key
@@ -57,20 +194,28 @@ class RedisWrapper(redis.Redis):
 		:param user: Prepends key with User
 		:param expires_in_sec: Expire value of this key in X seconds
 		"""
+		original_key = key
 		key = self.make_key(key, user, shared)
 
 		if not expires_in_sec:
 			frappe.local.cache[key] = val
 
+		pickled_val = pickle.dumps(val)
 		try:
 			if expires_in_sec:
-				self.setex(name=key, time=expires_in_sec, value=pickle.dumps(val))
+				self.setex(name=key, time=expires_in_sec, value=pickled_val)
 			else:
-				self.set(key, pickle.dumps(val))
+				self.set(key, pickled_val)
 
 		except redis.exceptions.ConnectionError:
 			return None
 
+		if (client_cache := self.client_cache) and client_cache.is_cached(original_key):
+			client_cache.invalidate(key)
+			# expiry isn't tracked by the client cache
+			if not expires_in_sec:
+				client_cache.set(key, None, pickled_val)
+
 	def get_value(self, key, generator=None, user=None, expires=False, shared=False):
 		"""Returns cache value. If not found and generator function is
 		        given, it will call the generator.
@@ -87,14 +232,21 @@ class RedisWrapper(redis.Redis):
 			val = local_cache[key]
 
 		else:
-			val = None
-			try:
-				val = self.get(key)
-			except redis.exceptions.ConnectionError:
-				pass
-
-			if val is not None:
-				val = pickle.loads(val)
+			client_cache = self.client_cache
+			if not client_cache or expires or not client_cache.is_cached(original_key):
+				client_cache = None
+
+			found, val = client_cache.get(key) if client_cache else (False, None)
+			if not found:
+				try:
+					val = self.get(key)
+				except redis.exceptions.ConnectionError:
+					pass
+
+				if val is not None:
+					if client_cache:
+						client_cache.set(key, None, val)
+					val = pickle.loads(val)
 
 			if not expires:
 				if val is None and generator:
@@ -138,8 +290,11 @@ class RedisWrapper(redis.Redis):
 		if not isinstance(keys, list | tuple):
 			keys = (keys,)
 
+		names = keys
 		if make_keys:
 			keys = [self.make_key(k, shared=shared, user=user) for k in keys]
+		else:
+			names = [re.sub(r"^user:[^:]*:", "", cstr(k).split("|", 1)[-1]) for k in keys]
 
 		local_cache = frappe.local.cache
 		for key in keys:
@@ -150,6 +305,12 @@ class RedisWrapper(redis.Redis):
 		except redis.exceptions.ConnectionError:
 			pass
 
+		# invalidate only after the write, else other processes can re-cache the old value
+		if client_cache := self.client_cache:
+			for key, name in zip(keys, names, strict=True):
+				if client_cache.is_cached(name):
+					client_cache.invalidate(key if isinstance(key, bytes) else key.encode())
+
 	def lpush(self, key, value):
 		return super().lpush(self.make_key(key), value)
 
@@ -189,11 +350,16 @@ class RedisWrapper(redis.Redis):
 		frappe.local.cache.setdefault(_name, {})[key] = value
 
 		# set in redis
+		pickled_value = pickle.dumps(value)
 		try:
-			super().hset(_name, key, pickle.dumps(value), *args, **kwargs)
+			super().hset(_name, key, pickled_value, *args, **kwargs)
 		except redis.exceptions.ConnectionError:
 			pass
 
+		if (client_cache := self.client_cache) and client_cache.is_cached(name):
+			client_cache.invalidate(_name, key)
+			client_cache.set(_name, key, pickled_value)
+
 	def hexists(self, name: str, key: str, shared: bool = False) -> bool:
 		if key is None:
 			return False
@@ -228,6 +394,15 @@ class RedisWrapper(redis.Redis):
 		if key in local_cache[_name]:
 			return local_cache[_name][key]
 
+		client_cache = self.client_cache
+		if client_cache and client_cache.is_cached(name):
+			found, value = client_cache.get(_name, key)
+			if found:
+				local_cache[_name][key] = value
+				return value
+		else:
+			client_cache = None
+
 		value = None
 		try:
 			value = super().hget(_name, key)
@@ -235,6 +410,8 @@ class RedisWrapper(redis.Redis):
 			pass
 
 		if value is not None:
+			if client_cache:
+				client_cache.set(_name, key, value)
 			value = pickle.loads(value)
 			local_cache[_name][key] = value
 		elif generator:
@@ -248,11 +425,15 @@ class RedisWrapper(redis.Redis):
 		if _name in frappe.local.cache:
 			if key in frappe.local.cache[_name]:
 				del frappe.local.cache[_name][key]
+
 		try:
 			super().hdel(_name, key)
 		except redis.exceptions.ConnectionError:
 			pass
 
+		if (client_cache := self.client_cache) and client_cache.is_cached(name):
+			client_cache.invalidate(_name, key)
+
 	def hdel_keys(self, name_starts_with, key):
 		"""Delete hash names with wildcard `*` and key"""
 		for name in self.get_keys(name_starts_with):
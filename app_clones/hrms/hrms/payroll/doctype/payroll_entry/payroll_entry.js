@@ -150,7 +150,10 @@ frappe.ui.form.on("Payroll Entry", {
 			frm.add_custom_button(__("Submit Salary Slip"), function () {
 				submit_salary_slip(frm);
 			}).addClass("btn-primary");
-		} else if (!frm.doc.salary_slips_created && frm.doc.status === "Failed") {
+		} else if (
+			!frm.doc.salary_slips_created &&
+			(frm.doc.status === "Failed" || frm.doc.__onload?.salary_slip_creation_stopped)
+		) {
 			frm.add_custom_button(__("Create Salary Slips"), function () {
 				frm.trigger("create_salary_slips");
 			}).addClass("btn-primary");
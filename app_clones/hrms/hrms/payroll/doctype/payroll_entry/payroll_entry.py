@@ -16,11 +16,13 @@ from frappe.utils import (
 	add_to_date,
 	cint,
 	comma_and,
+	create_batch,
 	date_diff,
 	flt,
 	get_link_to_form,
 	getdate,
 )
+from frappe.utils.background_jobs import is_job_enqueued
 
 import erpnext
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
@@ -29,14 +31,25 @@ from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 from erpnext.accounts.utils import get_fiscal_year
 
 from hrms.payroll.doctype.salary_slip.salary_slip_loan_utils import if_lending_app_installed
+from hrms.payroll.doctype.salary_slip.salary_slip_prefetch import SalarySlipPrefetch
 from hrms.payroll.doctype.salary_withholding.salary_withholding import link_bank_entry_in_salary_withholdings
 
+# Salary Slips of a chunk of employees are created in one background job, chunks are processed in parallel
+SALARY_SLIP_CHUNK_SIZE = 250
+
 
 class PayrollEntry(Document):
 	def onload(self):
 		if not self.docstatus == 1 or self.salary_slips_submitted:
 			return
 
+		if self.status == "Queued" and not self.salary_slips_created:
+			# creation can be retried if its background jobs were stopped
+			self.set_onload(
+				"salary_slip_creation_stopped",
+				not is_salary_slip_creation_running(self.name, len(self.employees)),
+			)
+
 		# check if salary slips were manually submitted
 		entries = frappe.db.count("Salary Slip", {"payroll_entry": self.name, "docstatus": 1}, ["name"])
 		if cint(entries) == len(self.employees):
@@ -239,14 +252,11 @@ class PayrollEntry(Document):
 				}
 			)
 			if len(employees) > 30 or frappe.flags.enqueue_payroll_entry:
+				if is_salary_slip_creation_running(self.name, len(employees)):
+					frappe.throw(_("Salary Slips of this Payroll Entry are still being created"))
+
 				self.db_set("status", "Queued")
-				frappe.enqueue(
-					create_salary_slips_for_employees,
-					timeout=3000,
-					employees=employees,
-					args=args,
-					publish_progress=False,
-				)
+				enqueue_salary_slip_creation(employees, args)
 				frappe.msgprint(
 					_("Salary Slip creation is queued. It may take a few minutes"),
 					alert=True,
@@ -1430,7 +1440,31 @@ def log_payroll_failure(process, payroll_entry, error):
 	payroll_entry.db_set({"error_message": error_message, "status": "Failed"})
 
 
-def create_salary_slips_for_employees(employees, args, publish_progress=True):
+def enqueue_salary_slip_creation(employees, args):
+	"""
+	Create salary slips in chunks of employees, each in its own background job so that
+	chunks are created by the available workers in parallel and a failure only rolls back its chunk
+	"""
+	chunks = list(create_batch(employees, SALARY_SLIP_CHUNK_SIZE))
+	job_ids = get_salary_slip_chunk_job_ids(args.payroll_entry, len(employees))
+
+	for chunk, job_id in zip(chunks, job_ids, strict=True):
+		frappe.enqueue(
+			create_salary_slips_for_employees,
+			timeout=3000,
+			job_id=job_id,
+			employees=chunk,
+			args=args,
+			publish_progress=False,
+			chunk_job_id=job_id,
+		)
+
+
+def create_salary_slips_for_employees(employees, args, publish_progress=True, chunk_job_id=None):
+	"""
+	Create salary slips for employees. If `chunk_job_id` is passed, employees are a chunk of the
+	Payroll Entry and it is only updated once salary slips exist for all its employees.
+	"""
 	payroll_entry = frappe.get_cached_doc("Payroll Entry", args.payroll_entry)
 
 	try:
@@ -1438,6 +1472,8 @@ def create_salary_slips_for_employees(employees, args, publish_progress=True):
 		count = 0
 
 		employees = list(set(employees) - set(salary_slips_exist_for))
+		# attendance, leaves, structure assignments and earnings of all employees are fetched at once
+		frappe.flags.salary_slip_prefetch = SalarySlipPrefetch(employees, args.start_date, args.end_date)
 		for emp in employees:
 			args.update({"doctype": "Salary Slip", "employee": emp})
 			frappe.get_doc(args).insert()
@@ -1449,7 +1485,8 @@ def create_salary_slips_for_employees(employees, args, publish_progress=True):
 					title=_("Creating Salary Slips..."),
 				)
 
-		payroll_entry.db_set({"status": "Submitted", "salary_slips_created": 1, "error_message": ""})
+		if not chunk_job_id:
+			payroll_entry.db_set({"status": "Submitted", "salary_slips_created": 1, "error_message": ""})
 
 		if salary_slips_exist_for:
 			frappe.msgprint(
@@ -1465,8 +1502,73 @@ def create_salary_slips_for_employees(employees, args, publish_progress=True):
 		log_payroll_failure("creation", payroll_entry, e)
 
 	finally:
+		frappe.flags.salary_slip_prefetch = None
 		frappe.db.commit()  # nosemgrep
-		frappe.publish_realtime("completed_salary_slip_creation", user=frappe.session.user)
+		if chunk_job_id:
+			update_salary_slip_creation_status(payroll_entry.name, exclude_job_id=chunk_job_id)
+		else:
+			frappe.publish_realtime("completed_salary_slip_creation", user=frappe.session.user)
+
+
+def update_salary_slip_creation_status(payroll_entry, exclude_job_id=None):
+	"""
+	Update a Payroll Entry whose salary slips are created in chunks, based on the salary slips that exist.
+	Once they exist for all employees it is Submitted. If some are missing while no chunk is running
+	anymore, e.g. because its job was stopped, it is marked Failed so that creation can be retried.
+	"""
+	payroll_entry = frappe.get_doc("Payroll Entry", payroll_entry)
+	if payroll_entry.salary_slips_created:
+		return
+
+	employees = [d.employee for d in payroll_entry.employees]
+	args = frappe._dict(
+		company=payroll_entry.company,
+		payroll_entry=payroll_entry.name,
+		start_date=payroll_entry.start_date,
+		end_date=payroll_entry.end_date,
+	)
+	pending = set(employees) - set(get_existing_salary_slips(employees, args))
+	frappe.publish_progress(
+		(len(employees) - len(pending)) * 100 / len(employees),
+		title=_("Creating Salary Slips..."),
+		doctype=payroll_entry.doctype,
+		docname=payroll_entry.name,
+	)
+
+	if not pending:
+		payroll_entry.db_set({"status": "Submitted", "salary_slips_created": 1, "error_message": ""})
+	elif payroll_entry.status == "Queued" and not is_salary_slip_creation_running(
+		payroll_entry.name, len(employees), exclude_job_id
+	):
+		payroll_entry.db_set(
+			{
+				"status": "Failed",
+				"error_message": _(
+					"Salary Slips were not created for {0} employees, their background job was stopped."
+				).format(len(pending)),
+			}
+		)
+	else:
+		# failed chunks have set the status to Failed along with the error, other chunks are still running
+		return
+
+	frappe.db.commit()  # nosemgrep
+	frappe.publish_realtime("completed_salary_slip_creation", user=frappe.session.user)
+
+
+def get_salary_slip_chunk_job_ids(payroll_entry, employee_count):
+	return [
+		f"payroll_entry_salary_slips::{payroll_entry}::{i}"
+		for i in range(0, employee_count, SALARY_SLIP_CHUNK_SIZE)
+	]
+
+
+def is_salary_slip_creation_running(payroll_entry, employee_count, exclude_job_id=None):
+	return any(
+		is_job_enqueued(job_id)
+		for job_id in get_salary_slip_chunk_job_ids(payroll_entry, employee_count)
+		if job_id != exclude_job_id
+	)
 
 
 def show_payroll_submission_status(submitted, unsubmitted, payroll_entry):
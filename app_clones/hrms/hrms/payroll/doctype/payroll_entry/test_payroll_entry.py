@@ -1,6 +1,8 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: GNU General Public License v3. See license.txt
 
+from unittest.mock import patch
+
 from dateutil.relativedelta import relativedelta
 
 import frappe
@@ -392,6 +394,109 @@ class TestPayrollEntry(FrappeTestCase):
 		self.assertEqual(payroll_entry.status, "Submitted")
 		self.assertEqual(payroll_entry.error_message, "")
 
+	@change_settings("Payroll Settings", {"payroll_based_on": "Attendance"})
+	def test_salary_slip_creation_in_chunks(self):
+		company_doc = frappe.get_doc("Company", "_Test Company")
+		employee1 = make_employee("test_payroll_chunk1@payroll.com", company=company_doc.name)
+		employee2 = make_employee("test_payroll_chunk2@payroll.com", company=company_doc.name)
+		setup_salary_structure(employee1, company_doc)
+		setup_salary_structure(employee2, company_doc, salary_structure="_Test Salary Structure 2")
+
+		dates = get_start_end_dates("Monthly", nowdate())
+		mark_attendance(employee1, dates.start_date, "Absent", ignore_validate=True)
+		payroll_entry = get_payroll_entry(
+			start_date=dates.start_date,
+			end_date=dates.end_date,
+			payable_account=company_doc.default_payroll_payable_account,
+			currency=company_doc.default_currency,
+			company=company_doc.name,
+			cost_center="Main - _TC",
+		)
+
+		def run_job(method, timeout=None, job_id=None, **kwargs):
+			method(**kwargs)
+
+		# one chunk per employee, run right away instead of in background jobs
+		frappe.flags.enqueue_payroll_entry = True
+		frappe.db.set_value("Employee", employee2, "status", "Inactive")
+		with (
+			patch("hrms.payroll.doctype.payroll_entry.payroll_entry.SALARY_SLIP_CHUNK_SIZE", 1),
+			patch("frappe.enqueue", side_effect=run_job),
+		):
+			payroll_entry.submit()
+
+			# the failed chunk does not roll back the salary slips of the other chunk
+			payroll_entry.reload()
+			self.assertEqual(payroll_entry.status, "Failed")
+			filters = {"payroll_entry": payroll_entry.name}
+			self.assertTrue(frappe.db.exists("Salary Slip", {"employee": employee1, **filters}))
+			self.assertFalse(frappe.db.exists("Salary Slip", {"employee": employee2, **filters}))
+
+			frappe.db.set_value("Employee", employee2, "status", "Active")
+			payroll_entry.create_salary_slips()
+
+		frappe.flags.enqueue_payroll_entry = False
+		payroll_entry.reload()
+		self.assertEqual(payroll_entry.status, "Submitted")
+		self.assertEqual(payroll_entry.salary_slips_created, 1)
+		self.assertEqual(frappe.db.count("Salary Slip", filters), 2)
+
+		# payment days from prefetched attendance match the ones queried per salary slip
+		salary_slip = frappe.get_doc("Salary Slip", {"employee": employee1, **filters})
+		expected = frappe.get_doc(
+			{
+				"doctype": "Salary Slip",
+				"employee": employee1,
+				"company": company_doc.name,
+				"payroll_frequency": "Monthly",
+				"start_date": dates.start_date,
+				"end_date": dates.end_date,
+			}
+		)
+		expected.get_emp_and_working_day_details()
+		self.assertEqual(salary_slip.absent_days, expected.absent_days)
+		self.assertEqual(salary_slip.payment_days, expected.payment_days)
+
+	def test_stopped_salary_slip_chunk(self):
+		company_doc = frappe.get_doc("Company", "_Test Company")
+		employee1 = make_employee("test_payroll_stopped1@payroll.com", company=company_doc.name)
+		employee2 = make_employee("test_payroll_stopped2@payroll.com", company=company_doc.name)
+		setup_salary_structure(employee1, company_doc)
+		setup_salary_structure(employee2, company_doc, salary_structure="_Test Salary Structure 2")
+
+		dates = get_start_end_dates("Monthly", nowdate())
+		payroll_entry = get_payroll_entry(
+			start_date=dates.start_date,
+			end_date=dates.end_date,
+			payable_account=company_doc.default_payroll_payable_account,
+			currency=company_doc.default_currency,
+			company=company_doc.name,
+			cost_center="Main - _TC",
+		)
+
+		# the job of the second chunk is stopped before it creates its salary slips
+		def run_first_job(method, timeout=None, job_id=None, **kwargs):
+			if job_id.endswith("::0"):
+				method(**kwargs)
+
+		frappe.flags.enqueue_payroll_entry = True
+		with (
+			patch("hrms.payroll.doctype.payroll_entry.payroll_entry.SALARY_SLIP_CHUNK_SIZE", 1),
+			patch("frappe.enqueue", side_effect=run_first_job),
+		):
+			payroll_entry.submit()
+
+		payroll_entry.reload()
+		self.assertEqual(payroll_entry.status, "Failed")
+		self.assertEqual(payroll_entry.salary_slips_created, 0)
+		self.assertEqual(frappe.db.count("Salary Slip", {"payroll_entry": payroll_entry.name}), 1)
+
+		# creation can't be started again while chunks are still running
+		with patch("hrms.payroll.doctype.payroll_entry.payroll_entry.is_job_enqueued", return_value=True):
+			self.assertRaises(frappe.ValidationError, payroll_entry.create_salary_slips)
+
+		frappe.flags.enqueue_payroll_entry = False
+
 	def test_payroll_entry_cancellation(self):
 		company_doc = frappe.get_doc("Company", "_Test Company")
 		employee = make_employee("test_employee@payroll.com", company=company_doc.name)
@@ -53,6 +53,7 @@ from hrms.payroll.doctype.salary_slip.salary_slip_loan_utils import (
 	process_loan_interest_accrual_and_demand,
 	set_loan_repayment,
 )
+from hrms.payroll.doctype.salary_slip.salary_slip_prefetch import get_lwp_or_ppl_leave_applications
 from hrms.payroll.utils import sanitize_expression
 from hrms.utils.holiday_list import get_holiday_dates_between
 
@@ -533,6 +534,22 @@ class SalarySlip(TransactionBase):
 		self, include_holidays_in_total_working_days, consider_marked_attendance_on_holidays, holidays
 	):
 		"""Calculates the number of half absent days for an employee within a date range"""
+		exclude_holidays = (
+			(not include_holidays_in_total_working_days)
+			and (not consider_marked_attendance_on_holidays)
+			and holidays
+		)
+
+		prefetch = frappe.flags.salary_slip_prefetch
+		if prefetch and prefetch.covers(self.employee, self.actual_start_date, self.actual_end_date):
+			holidays = {getdate(d) for d in holidays} if exclude_holidays else set()
+			attendance = prefetch.get_attendance(
+				self.employee, self.actual_start_date, self.actual_end_date, status=["Half Day"]
+			)
+			return len(
+				[d for d in attendance if d.half_day_status == "Absent" and d.attendance_date not in holidays]
+			)
+
 		Attendance = frappe.qb.DocType("Attendance")
 		query = (
 			frappe.qb.from_(Attendance)
@@ -545,11 +562,7 @@ class SalarySlip(TransactionBase):
 				& (Attendance.half_day_status == "Absent")
 			)
 		)
-		if (
-			(not include_holidays_in_total_working_days)
-			and (not consider_marked_attendance_on_holidays)
-			and holidays
-		):
+		if exclude_holidays:
 			query = query.where(Attendance.attendance_date.notin(holidays))
 		return query.run()[0][0]
 
@@ -593,6 +606,12 @@ class SalarySlip(TransactionBase):
 		return no_of_holidays
 
 	def _get_marked_attendance_days(self, holidays: list | None = None) -> float:
+		prefetch = frappe.flags.salary_slip_prefetch
+		if prefetch and prefetch.covers(self.employee, self.actual_start_date, self.actual_end_date):
+			holidays = {getdate(d) for d in holidays or []}
+			attendance = prefetch.get_attendance(self.employee, self.actual_start_date, self.actual_end_date)
+			return len([d for d in attendance if d.attendance_date not in holidays])
+
 		Attendance = frappe.qb.DocType("Attendance")
 		query = (
 			frappe.qb.from_(Attendance)
@@ -695,6 +714,12 @@ class SalarySlip(TransactionBase):
 		return frappe.cache().get_value(LEAVE_TYPE_MAP, _get_leave_type_map)
 
 	def get_employee_attendance(self, start_date, end_date):
+		prefetch = frappe.flags.salary_slip_prefetch
+		if prefetch and prefetch.covers(self.employee, start_date, end_date):
+			return prefetch.get_attendance(
+				self.employee, start_date, end_date, status=["Absent", "Half Day", "On Leave"]
+			)
+
 		attendance = frappe.qb.DocType("Attendance")
 
 		attendance_details = (
@@ -791,18 +816,24 @@ class SalarySlip(TransactionBase):
 			doc.append("earnings", wages_row)
 
 	def set_salary_structure_assignment(self):
-		self._salary_structure_assignment = frappe.db.get_value(
-			"Salary Structure Assignment",
-			{
-				"employee": self.employee,
-				"salary_structure": self.salary_structure,
-				"from_date": ("<=", self.actual_start_date),
-				"docstatus": 1,
-			},
-			"*",
-			order_by="from_date desc",
-			as_dict=True,
-		)
+		prefetch = frappe.flags.salary_slip_prefetch
+		if prefetch and prefetch.covers(self.employee, self.actual_start_date):
+			self._salary_structure_assignment = prefetch.get_salary_structure_assignment(
+				self.employee, self.salary_structure, self.actual_start_date
+			)
+		else:
+			self._salary_structure_assignment = frappe.db.get_value(
+				"Salary Structure Assignment",
+				{
+					"employee": self.employee,
+					"salary_structure": self.salary_structure,
+					"from_date": ("<=", self.actual_start_date),
+					"docstatus": 1,
+				},
+				"*",
+				order_by="from_date desc",
+				as_dict=True,
+			)
 
 		if not self._salary_structure_assignment:
 			frappe.throw(
@@ -1609,15 +1640,23 @@ class SalarySlip(TransactionBase):
 
 	def get_taxable_earnings_for_prev_period(self, start_date, end_date, allow_tax_exemption=False):
 		exempted_amount = 0
-		taxable_earnings = self.get_salary_slip_details(
-			start_date, end_date, parentfield="earnings", is_tax_applicable=1
-		)
-
-		if allow_tax_exemption:
-			exempted_amount = self.get_salary_slip_details(
-				start_date, end_date, parentfield="deductions", exempted_from_income_tax=1
+		prefetch = frappe.flags.salary_slip_prefetch
+		if prefetch and self.employee in prefetch.employees:
+			taxable_earnings, exempted_amount = prefetch.get_taxable_earnings_for_prev_period(
+				self.employee, start_date, end_date
+			)
+			if not allow_tax_exemption:
+				exempted_amount = 0
+		else:
+			taxable_earnings = self.get_salary_slip_details(
+				start_date, end_date, parentfield="earnings", is_tax_applicable=1
 			)
 
+			if allow_tax_exemption:
+				exempted_amount = self.get_salary_slip_details(
+					start_date, end_date, parentfield="deductions", exempted_from_income_tax=1
+				)
+
 		opening_taxable_earning = self.get_opening_for("taxable_earnings_till_date", start_date, end_date)
 
 		return (taxable_earnings + opening_taxable_earning) - exempted_amount, exempted_amount
@@ -2261,32 +2300,11 @@ def eval_tax_slab_condition(condition, eval_globals=None, eval_locals=None):
 
 
 def get_lwp_or_ppl_for_date_range(employee, start_date, end_date):
-	LeaveApplication = frappe.qb.DocType("Leave Application")
-	LeaveType = frappe.qb.DocType("Leave Type")
-
-	leaves = (
-		frappe.qb.from_(LeaveApplication)
-		.inner_join(LeaveType)
-		.on(LeaveType.name == LeaveApplication.leave_type)
-		.select(
-			LeaveApplication.name,
-			LeaveType.is_ppl,
-			LeaveType.fraction_of_daily_salary_per_leave,
-			LeaveType.include_holiday,
-			LeaveApplication.from_date,
-			LeaveApplication.to_date,
-			LeaveApplication.half_day,
-			LeaveApplication.half_day_date,
-		)
-		.where(
-			((LeaveType.is_lwp == 1) | (LeaveType.is_ppl == 1))
-			& (LeaveApplication.docstatus == 1)
-			& (LeaveApplication.status == "Approved")
-			& (LeaveApplication.employee == employee)
-			& ((LeaveApplication.salary_slip.isnull()) | (LeaveApplication.salary_slip == ""))
-			& ((LeaveApplication.from_date <= end_date) & (LeaveApplication.to_date >= start_date))
-		)
-	).run(as_dict=True)
+	prefetch = frappe.flags.salary_slip_prefetch
+	if prefetch and prefetch.covers(employee, start_date, end_date):
+		leaves = prefetch.get_leave_applications(employee, start_date, end_date)
+	else:
+		leaves = get_lwp_or_ppl_leave_applications([employee], start_date, end_date)
 
 	leave_date_mapper = frappe._dict()
 	for leave in leaves:
@@ -0,0 +1,173 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# License: GNU General Public License v3. See license.txt
+
+from collections import defaultdict
+
+import frappe
+from frappe.query_builder.functions import Sum
+from frappe.utils import flt, getdate
+
+
+class SalarySlipPrefetch:
+	"""
+	Attendance, leave applications and salary structure assignments of a chunk of employees for a
+	payroll period, and their taxable earnings of previous periods, fetched in bulk instead of one set
+	of queries per salary slip.
+
+	Set as `frappe.flags.salary_slip_prefetch` while Payroll Entry creates the salary slips of a chunk.
+	Salary slips of other employees or dates outside the period query as usual.
+	"""
+
+	def __init__(self, employees: list[str], start_date: str, end_date: str):
+		self.employees = set(employees)
+		self.start_date = getdate(start_date)
+		self.end_date = getdate(end_date)
+
+		self.attendance = defaultdict(list)
+		self.leave_applications = defaultdict(list)
+		self.salary_structure_assignments = defaultdict(list)
+		# taxable earnings and exemptions of submitted salary slips by employee, fetched per period when needed
+		self.taxable_earnings = {}
+		if self.employees:
+			self.fetch_attendance()
+			self.fetch_leave_applications()
+			self.fetch_salary_structure_assignments()
+
+	def covers(self, employee: str, start_date: str, end_date: str | None = None) -> bool:
+		return (
+			employee in self.employees
+			and self.start_date <= getdate(start_date)
+			and getdate(end_date or start_date) <= self.end_date
+		)
+
+	def fetch_attendance(self):
+		Attendance = frappe.qb.DocType("Attendance")
+		attendance = (
+			frappe.qb.from_(Attendance)
+			.select(
+				Attendance.employee,
+				Attendance.attendance_date,
+				Attendance.status,
+				Attendance.leave_type,
+				Attendance.half_day_status,
+			)
+			.where(
+				(Attendance.employee.isin(list(self.employees)))
+				& (Attendance.docstatus == 1)
+				& (Attendance.attendance_date.between(self.start_date, self.end_date))
+			)
+		).run(as_dict=True)
+
+		for d in attendance:
+			self.attendance[d.pop("employee")].append(d)
+
+	def fetch_leave_applications(self):
+		leaves = get_lwp_or_ppl_leave_applications(list(self.employees), self.start_date, self.end_date)
+		for leave in leaves:
+			self.leave_applications[leave.employee].append(leave)
+
+	def fetch_salary_structure_assignments(self):
+		assignments = frappe.get_all(
+			"Salary Structure Assignment",
+			filters={
+				"employee": ("in", list(self.employees)),
+				"from_date": ("<=", self.end_date),
+				"docstatus": 1,
+			},
+			fields=["*"],
+			order_by="from_date desc",
+		)
+
+		for assignment in assignments:
+			self.salary_structure_assignments[assignment.employee].append(assignment)
+
+	def get_attendance(
+		self, employee: str, start_date: str, end_date: str, status: list[str] | None = None
+	) -> list[dict]:
+		start_date, end_date = getdate(start_date), getdate(end_date)
+		return [
+			d
+			for d in self.attendance[employee]
+			if start_date <= d.attendance_date <= end_date and (not status or d.status in status)
+		]
+
+	def get_leave_applications(self, employee: str, start_date: str, end_date: str) -> list[dict]:
+		start_date, end_date = getdate(start_date), getdate(end_date)
+		return [
+			leave
+			for leave in self.leave_applications[employee]
+			if leave.from_date <= end_date and leave.to_date >= start_date
+		]
+
+	def get_salary_structure_assignment(self, employee: str, salary_structure: str, from_date: str):
+		from_date = getdate(from_date)
+		for assignment in self.salary_structure_assignments[employee]:
+			if assignment.salary_structure == salary_structure and assignment.from_date <= from_date:
+				return assignment
+
+	def get_taxable_earnings_for_prev_period(self, employee: str, start_date: str, end_date: str):
+		"""Taxable earnings and deductions exempted from income tax of submitted salary slips in a period"""
+		period = (getdate(start_date), getdate(end_date))
+		if period not in self.taxable_earnings:
+			self.taxable_earnings[period] = self.fetch_taxable_earnings(*period)
+
+		return self.taxable_earnings[period].get(employee, (0.0, 0.0))
+
+	def fetch_taxable_earnings(self, start_date, end_date) -> dict:
+		ss = frappe.qb.DocType("Salary Slip")
+		sd = frappe.qb.DocType("Salary Detail")
+		amounts = (
+			frappe.qb.from_(ss)
+			.join(sd)
+			.on(sd.parent == ss.name)
+			.select(ss.employee, sd.parentfield, Sum(sd.amount).as_("amount"))
+			.where(
+				(
+					((sd.parentfield == "earnings") & (sd.is_tax_applicable == 1))
+					| ((sd.parentfield == "deductions") & (sd.exempted_from_income_tax == 1))
+				)
+				& (sd.is_flexible_benefit == 0)
+				& (ss.docstatus == 1)
+				& (ss.employee.isin(list(self.employees)))
+				& (ss.start_date.between(start_date, end_date))
+				& (ss.end_date.between(start_date, end_date))
+			)
+			.groupby(ss.employee, sd.parentfield)
+		).run(as_dict=True)
+
+		taxable_earnings = defaultdict(lambda: [0.0, 0.0])
+		for d in amounts:
+			taxable_earnings[d.employee][0 if d.parentfield == "earnings" else 1] = flt(d.amount)
+
+		return {employee: tuple(earnings) for employee, earnings in taxable_earnings.items()}
+
+
+def get_lwp_or_ppl_leave_applications(employees, start_date, end_date) -> list[dict]:
+	"""Approved leave applications of leave without pay or partially paid leave types overlapping a period"""
+	LeaveApplication = frappe.qb.DocType("Leave Application")
+	LeaveType = frappe.qb.DocType("Leave Type")
+
+	return (
+		frappe.qb.from_(LeaveApplication)
+		.inner_join(LeaveType)
+		.on(LeaveType.name == LeaveApplication.leave_type)
+		.select(
+			LeaveApplication.name,
+			LeaveApplication.employee,
+			LeaveType.is_ppl,
+			LeaveType.fraction_of_daily_salary_per_leave,
+			LeaveType.include_holiday,
+			LeaveApplication.from_date,
+			LeaveApplication.to_date,
+			LeaveApplication.half_day,
+			LeaveApplication.half_day_date,
+		)
+		.where(
+			((LeaveType.is_lwp == 1) | (LeaveType.is_ppl == 1))
+			& (LeaveApplication.docstatus == 1)
+			& (LeaveApplication.status == "Approved")
+			& (LeaveApplication.employee.isin(employees))
+			& ((LeaveApplication.salary_slip.isnull()) | (LeaveApplication.salary_slip == ""))
+			& ((LeaveApplication.from_date <= end_date) & (LeaveApplication.to_date >= start_date))
+		)
+	).run(as_dict=True)
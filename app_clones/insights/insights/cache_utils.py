@@ -30,5 +30,8 @@ def get_or_set_cache(key, func, force=False, expiry=EXPIRY):
 
 @frappe.whitelist()
 def reset_insights_cache():
+    from insights.insights.doctype.insights_data_source_v3.result_cache import ResultCache
+
     frappe.only_for("System Manager")
     frappe.cache().delete_keys("insights*")
+    ResultCache().clear()
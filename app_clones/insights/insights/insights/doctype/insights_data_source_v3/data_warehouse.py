@@ -1,3 +1,4 @@
+import json
 import os
 
 import frappe
@@ -5,6 +6,7 @@ import frappe.utils
 import ibis
 import ibis.backends
 import ibis.backends.duckdb
+import pandas as pd
 from frappe.query_builder.functions import IfNull
 from frappe.utils import get_files_path
 from frappe.utils.background_jobs import is_job_enqueued
@@ -15,6 +17,10 @@ from insights import create_toast
 from insights.utils import InsightsDataSourcev3, InsightsTablev3
 
 WAREHOUSE_DB_NAME = "insights.duckdb"
+# deleted rows are only dropped by a full import
+DEFAULT_FULL_SYNC_INTERVAL_DAYS = 7
+# incremental syncs write their changes to delta files, merged into the table file once there are this many
+MAX_DELTA_FILES = 10
 
 
 class Warehouse:
@@ -45,6 +51,7 @@ class WarehouseTable:
         self.table_name = table_name
         self.warehouse_table_name = get_warehouse_table_name(data_source, table_name)
         self.parquet_filepath = get_parquet_filepath(data_source, table_name)
+        self.sync_state_filepath = get_sync_state_filepath(data_source, table_name)
 
         self.validate()
 
@@ -71,8 +78,8 @@ class WarehouseTable:
                 )
 
         if os.path.exists(self.parquet_filepath):
-            return self.warehouse.db.read_parquet(
-                self.parquet_filepath, table_name=self.warehouse_table_name
+            return read_stored_table(
+                self.warehouse.db, self.parquet_filepath, self.warehouse_table_name
             )
 
         return self.warehouse.db.table(self.warehouse_table_name)
@@ -90,10 +97,12 @@ class WarehouseTableImporter:
     def __init__(self, table: WarehouseTable):
         self.table = table
         self.remote_table = None
-        self.primary_key = ""
+        self.sort_keys = []
         self.warehouse_table_name = ""
         self.warehouse_folder = ""
         self.imported_batch_paths = []
+        self.watermark_column = None
+        self.sync_state = None
 
         self.log = None
         self.settings = frappe._dict()
@@ -191,6 +200,20 @@ class WarehouseTableImporter:
 
     def prepare_remote_table(self) -> Expr:
         self.remote_table = self.table.get_remote_table()
+        self.watermark_column = self.get_watermark_column()
+        self.sync_state = self.get_incremental_sync_state()
+
+        if self.sync_state:
+            # only import rows added or modified since the last import
+            self.remote_table = self.remote_table.filter(
+                _[self.watermark_column] >= self.sync_state.watermark
+            )
+            self.log.db_set("query", ibis.to_sql(self.remote_table), commit=True)
+            self.log.log_output(
+                f"Incremental Sync: {self.watermark_column} >= {self.sync_state.watermark}",
+                commit=True,
+            )
+            return
 
         if hasattr(self.remote_table, "creation"):
             self.remote_table = self.remote_table.order_by(ibis.desc("creation"))
@@ -201,10 +224,79 @@ class WarehouseTableImporter:
         if not hasattr(self.remote_table, "creation"):
             self.remote_table = self.remote_table.mutate(__row_number=ibis.row_number())
 
-    def start_batch_import(self):
-        self.primary_key = (
-            "creation" if hasattr(self.remote_table, "creation") else "__row_number"
+    def get_watermark_column(self) -> str | None:
+        columns = self.remote_table.columns
+        watermark_column = frappe.db.get_value(
+            "Insights Table v3",
+            {"data_source": self.table.data_source, "table": self.table.table_name},
+            "watermark_column",
+        )
+        if watermark_column:
+            if watermark_column in columns:
+                return watermark_column
+
+            self.log.log_output(
+                f"Watermark column {watermark_column} not found, importing the whole table.",
+                commit=True,
+            )
+            return
+
+        for column in ("modified", "creation"):
+            if column in columns:
+                return column
+
+    def get_incremental_sync_state(self) -> frappe._dict | None:
+        if not self.watermark_column or "name" not in self.remote_table.columns:
+            return
+        if not os.path.exists(self.table.parquet_filepath):
+            return
+        if not os.path.exists(self.table.sync_state_filepath):
+            return
+
+        with open(self.table.sync_state_filepath) as f:
+            sync_state = frappe._dict(json.load(f))
+
+        if sync_state.watermark_column != self.watermark_column:
+            return
+
+        full_sync_interval = (
+            frappe.conf.get("insights_full_sync_interval_days")
+            or DEFAULT_FULL_SYNC_INTERVAL_DAYS
+        )
+        next_full_sync = frappe.utils.add_days(sync_state.last_full_sync, full_sync_interval)
+        if frappe.utils.get_datetime(next_full_sync) <= frappe.utils.now_datetime():
+            return
+
+        ddb = ibis.duckdb.connect(":memory:")
+        stored_table = read_stored_table(
+            ddb, self.table.parquet_filepath, self.table.warehouse_table_name
         )
+        if set(stored_table.columns) != set(self.remote_table.columns):
+            # columns were added or removed, import the whole table again
+            ddb.disconnect()
+            return
+
+        sync_state.watermark = stored_table[self.watermark_column].max().execute()
+        ddb.disconnect()
+
+        if pd.isna(sync_state.watermark):
+            return
+
+        return sync_state
+
+    def start_batch_import(self):
+        if self.sync_state:
+            self.sort_keys = [self.watermark_column]
+        elif hasattr(self.remote_table, "creation"):
+            self.sort_keys = ["creation"]
+        else:
+            self.sort_keys = ["__row_number"]
+
+        if self.sort_keys != ["__row_number"] and "name" in self.remote_table.columns:
+            # watermarks aren't unique, batches are paged by (watermark, name) so rows
+            # sharing the watermark of the last row of a batch aren't skipped
+            self.sort_keys.append("name")
+
         self.warehouse_table_name = self.table.warehouse_table_name
         self.warehouse_folder = get_warehouse_folder_path()
         self.imported_batch_paths = []
@@ -212,7 +304,11 @@ class WarehouseTableImporter:
         try:
             batch_size = self.calculate_batch_size()
             self.process_batches(batch_size)
-            self.merge_batches()
+            if self.sync_state:
+                self.merge_changes()
+            else:
+                self.merge_batches()
+            self.save_sync_state()
             self.update_insights_table()
             self.log.status = "Completed"
             self.log.log_output("Import completed successfully.", commit=True)
@@ -225,6 +321,10 @@ class WarehouseTableImporter:
     def calculate_batch_size(self) -> int:
         sample_size = 10
         sample_rows = self.remote_table.head(sample_size).execute()
+        if sample_rows.empty:
+            # nothing to import (no changes since last sync)
+            return self.settings.row_limit
+
         total_size = sum(
             sample_rows[column].memory_usage(deep=True)
             for column in sample_rows.columns
@@ -241,7 +341,7 @@ class WarehouseTableImporter:
         return batch_size
 
     def process_batches(self, batch_size: int):
-        remote_table = self.remote_table.order_by(self.primary_key)
+        remote_table = self.remote_table.order_by(self.sort_keys)
         batch_number = 0
 
         while True:
@@ -254,11 +354,19 @@ class WarehouseTableImporter:
             if metadata["count"] < batch_size:
                 break
 
-            remote_table = remote_table.filter(
-                _[self.primary_key] > metadata["max_primary_key"]
-            )
+            remote_table = remote_table.filter(self.get_keyset_condition(metadata["last_row"]))
             batch_number += 1
 
+    def get_keyset_condition(self, last_row: tuple):
+        """Condition for rows sorted after `last_row`, i.e. (a, b) > (last a, last b)"""
+        condition = None
+        for i, key in enumerate(self.sort_keys):
+            key_condition = _[key] > last_row[i]
+            for previous_key, value in zip(self.sort_keys[:i], last_row[:i], strict=True):
+                key_condition &= _[previous_key] == value
+            condition = key_condition if condition is None else condition | key_condition
+        return condition
+
     def create_parquet_file(self, batch: Expr, batch_number: int) -> str:
         batch_file_name = f"{self.warehouse_table_name}_{batch_number}.parquet"
         path = os.path.join(self.warehouse_folder, batch_file_name)
@@ -269,16 +377,18 @@ class WarehouseTableImporter:
     def get_batch_metadata(self, path: str) -> dict:
         ddb = ibis.duckdb.connect(":memory:")
         batch = ddb.read_parquet(path)
-        metadata = (
-            batch.aggregate(
-                count=_.count(),
-                max_primary_key=_[self.primary_key].max(),
-            )
+        last_row = (
+            batch.order_by([ibis.desc(key) for key in self.sort_keys])
+            .select(self.sort_keys)
+            .limit(1)
             .execute()
-            .to_records(index=False)[0]
         )
+        metadata = {
+            "count": int(batch.count().execute()),
+            "last_row": tuple(last_row.iloc[0]) if not last_row.empty else (),
+        }
         self.log.log_output(
-            f"Rows: {metadata['count']}\n" f"Bookmark: {metadata['max_primary_key']}",
+            f"Rows: {metadata['count']}\n" f"Bookmark: {metadata['last_row']}",
             commit=True,
         )
         ddb.disconnect()
@@ -295,6 +405,8 @@ class WarehouseTableImporter:
         if hasattr(merged, "__row_number"):
             merged = merged.drop("__row_number")
         merged.to_parquet(path, compression="snappy")
+        # changes of earlier incremental syncs are part of the full import
+        remove_delta_files(path)
 
         total_rows = int(merged.count().execute())
         self.log.parquet_file = path
@@ -306,6 +418,83 @@ class WarehouseTableImporter:
         )
         ddb.disconnect()
 
+    def merge_changes(self):
+        """
+        Write the imported rows to a delta file of the stored table, read along with it by
+        `read_stored_table`. Rows are matched by `name`, so a sync costs the size of its changes;
+        the table is rewritten only when the delta files are compacted.
+        """
+        ddb = ibis.duckdb.connect(":memory:")
+        changes = ddb.read_parquet(self.imported_batch_paths, table_name="changes")
+        changed_rows = int(changes.count().execute())
+        self.log.rows_imported = changed_rows
+
+        if not changed_rows:
+            self.log.log_output("No new or modified rows.", commit=True)
+            ddb.disconnect()
+            return
+
+        path = self.table.parquet_filepath
+        stored_table = ddb.read_parquet(path, table_name="stored")
+        # keep only the latest version of rows imported more than once
+        changes = changes.filter(
+            ibis.row_number().over(
+                group_by=changes.name, order_by=ibis.desc(self.watermark_column)
+            )
+            == 0
+        )
+        changes = changes.select(stored_table.columns).cast(stored_table.schema())
+
+        delta_paths = get_delta_filepaths(path)
+        delta_number = get_delta_number(delta_paths[-1]) + 1 if delta_paths else 0
+        delta_path = f"{path.removesuffix('.parquet')}.delta_{delta_number}.parquet"
+        changes.to_parquet(f"{delta_path}.tmp", compression="snappy")
+        ddb.disconnect()
+        os.replace(f"{delta_path}.tmp", delta_path)
+
+        if len(delta_paths) + 1 >= MAX_DELTA_FILES:
+            self.compact_delta_files()
+
+        self.log.parquet_file = path
+        self.log.log_output(
+            f"Total Batches: {len(self.imported_batch_paths)}\n"
+            f"Rows Imported: {changed_rows}\n"
+            f"Delta Files: {len(get_delta_filepaths(path))}",
+            commit=True,
+        )
+
+    def compact_delta_files(self):
+        """Merge the delta files into the table file"""
+        path = self.table.parquet_filepath
+        ddb = ibis.duckdb.connect(":memory:")
+        merged = read_stored_table(ddb, path, self.warehouse_table_name)
+        merged.to_parquet(f"{path}.tmp", compression="snappy")
+        total_rows = int(merged.count().execute())
+        ddb.disconnect()
+
+        # deltas read along with the compacted table are applied again, which leaves it unchanged
+        os.replace(f"{path}.tmp", path)
+        remove_delta_files(path)
+        self.log.log_output(f"Compacted Delta Files, Total Rows: {total_rows}", commit=True)
+
+    def save_sync_state(self):
+        if not self.watermark_column or "name" not in self.remote_table.columns:
+            if os.path.exists(self.table.sync_state_filepath):
+                os.remove(self.table.sync_state_filepath)
+            return
+
+        last_full_sync = (
+            self.sync_state.last_full_sync if self.sync_state else frappe.utils.now()
+        )
+        with open(self.table.sync_state_filepath, "w") as f:
+            json.dump(
+                {
+                    "watermark_column": self.watermark_column,
+                    "last_full_sync": last_full_sync,
+                },
+                f,
+            )
+
     def update_log(self):
         self.log.db_set(
             {
@@ -357,3 +546,56 @@ def get_parquet_filepath(data_source: str, table_name: str) -> str:
     warehouse_path = get_warehouse_folder_path()
     warehouse_table = get_warehouse_table_name(data_source, table_name)
     return os.path.join(warehouse_path, f"{warehouse_table}.parquet")
+
+
+def get_sync_state_filepath(data_source: str, table_name: str) -> str:
+    warehouse_path = get_warehouse_folder_path()
+    warehouse_table = get_warehouse_table_name(data_source, table_name)
+    return os.path.join(warehouse_path, f"{warehouse_table}.sync.json")
+
+
+def get_delta_filepaths(parquet_filepath: str) -> list[str]:
+    """Delta files written by incremental syncs of the table, oldest first"""
+    folder, file_name = os.path.split(parquet_filepath)
+    prefix = f"{file_name.removesuffix('.parquet')}.delta_"
+    if not os.path.exists(folder):
+        return []
+
+    paths = [
+        os.path.join(folder, f)
+        for f in os.listdir(folder)
+        if f.startswith(prefix) and f.endswith(".parquet")
+    ]
+    return sorted(paths, key=get_delta_number)
+
+
+def get_delta_number(delta_filepath: str) -> int:
+    return int(delta_filepath.removesuffix(".parquet").rsplit(".delta_", 1)[1])
+
+
+def remove_delta_files(parquet_filepath: str):
+    for path in get_delta_filepaths(parquet_filepath):
+        os.remove(path)
+
+
+def read_stored_table(ddb: BaseBackend, parquet_filepath: str, table_name: str) -> Expr:
+    """Stored table with the rows of its delta files applied, matched by `name`"""
+    stored_table = ddb.read_parquet(parquet_filepath, table_name=table_name)
+    delta_paths = get_delta_filepaths(parquet_filepath)
+    if not delta_paths:
+        return stored_table
+
+    changes = ibis.union(
+        *(
+            ddb.read_parquet(path, table_name=f"{table_name}_delta_{i}").mutate(
+                __delta=ibis.literal(i)
+            )
+            for i, path in enumerate(delta_paths)
+        )
+    )
+    # the latest delta has the latest version of a row
+    changes = changes.filter(
+        ibis.row_number().over(group_by=changes.name, order_by=ibis.desc("__delta"))
+        == 0
+    ).drop("__delta")
+    return stored_table.anti_join(changes, "name").union(changes)
@@ -6,6 +6,7 @@ import frappe
 import ibis
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 from frappe.utils.data import flt
 from frappe.utils.safe_exec import safe_eval, safe_exec
 from ibis import _
@@ -17,6 +18,7 @@ from ibis.expr.types import Table as IbisQuery
 from insights import create_toast
 from insights.cache_utils import make_digest
 from insights.insights.doctype.insights_data_source_v3.data_warehouse import Warehouse
+from insights.insights.doctype.insights_data_source_v3.result_cache import ResultCache
 from insights.insights.doctype.insights_table_v3.insights_table_v3 import (
     InsightsTablev3,
 )
@@ -663,25 +665,41 @@ def to_insights_type(dtype: DataType):
 
 
 def cache_results(cache_key, result: pd.DataFrame, cache_expiry=3600):
+    try:
+        ResultCache().set(cache_key, result, cache_expiry)
+        return
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # columns with mixed types can't be stored as arrow, store them as json
+        pass
+
     cache_key = "insights:query_results:" + cache_key
     data = result.to_dict(orient="records")
     data = frappe.as_json(data)
     frappe.cache().set_value(cache_key, data, expires_in_sec=cache_expiry)
 
 
-def get_cached_results(cache_key) -> pd.DataFrame:
+def get_cached_results(cache_key, offset=0, limit=None) -> pd.DataFrame:
+    df = ResultCache().get(cache_key, offset, limit)
+    if df is not None:
+        return df.replace({pd.NaT: None, np.nan: None})
+
     cache_key = "insights:query_results:" + cache_key
     data = frappe.cache().get_value(cache_key)
     if not data:
         return None
     data = frappe.parse_json(data)
+    if offset or limit is not None:
+        data = data[offset : offset + limit if limit is not None else None]
     df = pd.DataFrame(data).replace({pd.NaT: None, np.nan: None})
     return df
 
 
 def has_cached_results(cache_key):
+    if ResultCache().exists(cache_key):
+        return True
+
     cache_key = "insights:query_results:" + cache_key
-    return frappe.cache().get_value(cache_key) is not None
+    return bool(frappe.cache().exists(cache_key))
 
 
 def exec_with_return(
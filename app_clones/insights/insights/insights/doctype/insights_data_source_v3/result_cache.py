@@ -0,0 +1,157 @@
+import os
+import time
+
+import frappe
+import pandas as pd
+import pyarrow as pa
+
+# Query results are stored as Arrow IPC files in the site's cache folder, which isn't
+# part of backups. Files are memory mapped while reading, so a page of a large result can be read
+# without loading the entire result.
+#
+# A file's mtime holds the time at which it expires and its atime the time it was
+# last read. That way, a single `stat` tells whether a result is cached, and the
+# least recently used results can be evicted once the cache outgrows its budget.
+#
+# The cache is best effort: if the files can't be written or read (disk full,
+# permissions), the query is run uncached instead of failing.
+
+RESULT_CACHE_FOLDER = "insights_result_cache"
+DEFAULT_CACHE_SIZE_MB = 1024
+RECORD_BATCH_SIZE = 10_000
+
+
+class ResultCache:
+    def __init__(self):
+        self.folder = get_result_cache_folder_path()
+        self.max_size = (
+            (frappe.conf.get("insights_result_cache_size_mb") or DEFAULT_CACHE_SIZE_MB) * 1024 * 1024
+        )
+
+    def get_path(self, cache_key: str) -> str:
+        return os.path.join(self.folder, f"{cache_key}.arrow")
+
+    def exists(self, cache_key: str) -> bool:
+        try:
+            stat = os.stat(self.get_path(cache_key))
+        except OSError:
+            return False
+        return stat.st_mtime > time.time()
+
+    def set(self, cache_key: str, result: pd.DataFrame, expiry: int = 3600) -> bool:
+        table = pa.Table.from_pandas(result, preserve_index=False)
+
+        path = self.get_path(cache_key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            with pa.OSFile(temp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table, max_chunksize=RECORD_BATCH_SIZE)
+
+            now = time.time()
+            os.utime(temp_path, (now, now + expiry))
+            os.replace(temp_path, path)
+            self.evict()
+        except OSError:
+            frappe.logger("insights").exception(f"Failed to cache query result {cache_key}")
+            self.remove(temp_path)
+            return False
+
+        return True
+
+    def get(self, cache_key: str, offset: int = 0, limit: int | None = None) -> pd.DataFrame | None:
+        if not self.exists(cache_key):
+            return None
+
+        path = self.get_path(cache_key)
+        try:
+            with pa.memory_map(path, "r") as source:
+                reader = pa.ipc.open_file(source)
+                table = self.read_rows(reader, offset, limit)
+                result = table.to_pandas()
+        except FileNotFoundError:
+            # evicted by another worker
+            return None
+        except (OSError, pa.ArrowInvalid):
+            frappe.logger("insights").exception(f"Failed to read cached query result {cache_key}")
+            self.remove(path)
+            return None
+
+        self.touch(path)
+        return result
+
+    def read_rows(self, reader: pa.ipc.RecordBatchFileReader, offset: int, limit: int | None) -> pa.Table:
+        if not offset and limit is None:
+            return reader.read_all()
+
+        batches = []
+        batch_start = 0
+        end = offset + limit if limit is not None else None
+        for i in range(reader.num_record_batches):
+            if end is not None and batch_start >= end:
+                break
+
+            batch = reader.get_batch(i)
+            batch_end = batch_start + batch.num_rows
+            if batch_end > offset:
+                start = max(offset - batch_start, 0)
+                stop = batch.num_rows if end is None else min(end - batch_start, batch.num_rows)
+                batches.append(batch.slice(start, stop - start))
+            batch_start = batch_end
+
+        return pa.Table.from_batches(batches, schema=reader.schema)
+
+    def touch(self, path: str):
+        try:
+            stat = os.stat(path)
+            os.utime(path, (time.time(), stat.st_mtime))
+        except OSError:
+            pass
+
+    def evict(self):
+        now = time.time()
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.folder):
+            if not entry.name.endswith(".arrow"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            if stat.st_mtime <= now:
+                self.remove(entry.path)
+                continue
+
+            entries.append((stat.st_atime, stat.st_size, entry.path))
+            total_size += stat.st_size
+
+        if total_size <= self.max_size:
+            return
+
+        # least recently read first
+        for _atime, size, path in sorted(entries):
+            self.remove(path)
+            total_size -= size
+            if total_size <= self.max_size:
+                break
+
+    def remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        if not os.path.exists(self.folder):
+            return
+
+        for entry in os.scandir(self.folder):
+            if entry.name.endswith(".arrow"):
+                self.remove(entry.path)
+
+
+def get_result_cache_folder_path() -> str:
+    return os.path.realpath(frappe.get_site_path("cache", RESULT_CACHE_FOLDER))
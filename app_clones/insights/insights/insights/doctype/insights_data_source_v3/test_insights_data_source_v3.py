@@ -1,9 +1,207 @@
 # Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
-# import frappe
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import MagicMock, patch
+
+import frappe
+import ibis
+import pandas as pd
 from frappe.tests.utils import FrappeTestCase
 
+from insights.insights.doctype.insights_data_source_v3.data_warehouse import (
+    WarehouseTableImporter,
+    get_delta_filepaths,
+    read_stored_table,
+)
+from insights.insights.doctype.insights_data_source_v3.result_cache import ResultCache
+
 
 class TestInsightsDataSourcev3(FrappeTestCase):
     pass
+
+
+class TestResultCache(FrappeTestCase):
+    def setUp(self):
+        self.cache = ResultCache()
+        self.cache.folder = tempfile.mkdtemp()
+        self.result = pd.DataFrame({"name": [f"row-{i}" for i in range(25)], "value": range(25)})
+
+    def tearDown(self):
+        shutil.rmtree(self.cache.folder, ignore_errors=True)
+
+    def test_set_and_get(self):
+        self.assertFalse(self.cache.exists("query"))
+        self.assertIsNone(self.cache.get("query"))
+
+        self.assertTrue(self.cache.set("query", self.result))
+        self.assertTrue(self.cache.exists("query"))
+        pd.testing.assert_frame_equal(self.cache.get("query"), self.result)
+
+        with patch("insights.insights.doctype.insights_data_source_v3.result_cache.RECORD_BATCH_SIZE", 10):
+            self.cache.set("query", self.result)
+
+        page = self.cache.get("query", offset=8, limit=5)
+        self.assertEqual(page["value"].tolist(), [8, 9, 10, 11, 12])
+        self.assertEqual(self.cache.get("query", offset=20)["value"].tolist(), [20, 21, 22, 23, 24])
+
+    def test_expiry(self):
+        self.cache.set("expired", self.result, expiry=-1)
+        self.assertFalse(self.cache.exists("expired"))
+        self.assertIsNone(self.cache.get("expired"))
+
+        # expired results are removed with the next write
+        self.cache.set("query", self.result)
+        self.assertFalse(os.path.exists(self.cache.get_path("expired")))
+
+    def test_eviction(self):
+        self.cache.set("first", self.result)
+        self.cache.set("second", self.result)
+
+        # first is read more recently, so second is evicted first
+        now = time.time()
+        os.utime(self.cache.get_path("second"), (now - 60, now + 3600))
+        self.cache.get("first")
+
+        self.cache.max_size = os.path.getsize(self.cache.get_path("first")) * 2
+        self.cache.set("third", self.result)
+
+        self.assertTrue(self.cache.exists("first"))
+        self.assertFalse(self.cache.exists("second"))
+        self.assertTrue(self.cache.exists("third"))
+
+    def test_io_errors(self):
+        with patch("pyarrow.OSFile", side_effect=OSError("No space left on device")):
+            self.assertFalse(self.cache.set("query", self.result))
+        self.assertFalse(self.cache.exists("query"))
+        self.assertEqual(os.listdir(self.cache.folder), [])
+
+        self.cache.set("query", self.result)
+        with patch("pyarrow.memory_map", side_effect=PermissionError):
+            self.assertIsNone(self.cache.get("query"))
+
+
+class TestWarehouseTableImporter(FrappeTestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.table = frappe._dict(
+            data_source="Test Data Source",
+            table_name="tabTest",
+            warehouse_table_name="test_data_source.tabtest",
+            parquet_filepath=os.path.join(self.folder, "test_data_source.tabtest.parquet"),
+            sync_state_filepath=os.path.join(self.folder, "test_data_source.tabtest.sync.json"),
+        )
+        self.rows = pd.DataFrame(
+            {
+                "name": [f"row-{i}" for i in range(5)],
+                "creation": pd.to_datetime(["2024-01-01"] * 5),
+                "modified": pd.to_datetime(
+                    ["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-02", "2024-01-03"]
+                ),
+                "value": range(5),
+            }
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def sync(self, rows: pd.DataFrame, batch_size: int = 2) -> WarehouseTableImporter:
+        self.table.get_remote_table = lambda: ibis.memtable(rows)
+        importer = WarehouseTableImporter(self.table)
+        importer.log = MagicMock()
+        importer.settings = frappe._dict(row_limit=1000, memory_limit=512)
+
+        with (
+            patch(
+                "insights.insights.doctype.insights_data_source_v3.data_warehouse.get_warehouse_folder_path",
+                return_value=self.folder,
+            ),
+            patch.object(importer, "calculate_batch_size", return_value=batch_size),
+            patch.object(importer, "update_insights_table"),
+        ):
+            importer.prepare_remote_table()
+            importer.start_batch_import()
+
+        self.assertEqual(importer.log.status, "Completed")
+        return importer
+
+    def get_stored_rows(self) -> pd.DataFrame:
+        ddb = ibis.duckdb.connect(":memory:")
+        rows = read_stored_table(ddb, self.table.parquet_filepath, self.table.warehouse_table_name).execute()
+        ddb.disconnect()
+        return rows.sort_values("name").reset_index(drop=True)
+
+    def test_full_sync_with_same_creation(self):
+        importer = self.sync(self.rows)
+        self.assertIsNone(importer.sync_state)
+        self.assertEqual(importer.sort_keys, ["creation", "name"])
+        self.assertEqual(self.get_stored_rows()["value"].tolist(), [0, 1, 2, 3, 4])
+
+    def test_incremental_sync(self):
+        self.sync(self.rows)
+
+        rows = self.rows.copy()
+        rows.loc[1, ["modified", "value"]] = [pd.Timestamp("2024-01-04"), 10]
+        new_row = {
+            "name": "row-5",
+            "creation": pd.Timestamp("2024-01-04"),
+            "modified": pd.Timestamp("2024-01-04"),
+        }
+        rows = pd.concat([rows, pd.DataFrame([{**new_row, "value": 5}])], ignore_index=True)
+
+        importer = self.sync(rows)
+        self.assertTrue(importer.sync_state)
+        self.assertEqual(importer.sort_keys, ["modified", "name"])
+        # rows modified at or after the last watermark only
+        self.assertEqual(importer.log.rows_imported, 3)
+        self.assertEqual(self.get_stored_rows()["value"].tolist(), [0, 10, 2, 3, 4, 5])
+        # changes are written to a delta file, the table file is left as is
+        self.assertEqual(len(get_delta_filepaths(self.table.parquet_filepath)), 1)
+        self.assertEqual(len(pd.read_parquet(self.table.parquet_filepath)), 5)
+
+    def test_delta_files_compaction(self):
+        self.sync(self.rows)
+
+        rows = self.rows.copy()
+        with patch("insights.insights.doctype.insights_data_source_v3.data_warehouse.MAX_DELTA_FILES", 3):
+            for day in range(4, 6):
+                rows.loc[1, ["modified", "value"]] = [pd.Timestamp(f"2024-01-0{day}"), day * 10]
+                self.sync(rows)
+                self.assertEqual(len(get_delta_filepaths(self.table.parquet_filepath)), day - 3)
+                self.assertEqual(self.get_stored_rows()["value"].tolist(), [0, day * 10, 2, 3, 4])
+
+            rows.loc[1, ["modified", "value"]] = [pd.Timestamp("2024-01-06"), 60]
+            self.sync(rows)
+
+        self.assertEqual(get_delta_filepaths(self.table.parquet_filepath), [])
+        self.assertEqual(self.get_stored_rows()["value"].tolist(), [0, 60, 2, 3, 4])
+
+        # a full sync replaces the changes of earlier incremental syncs
+        self.sync(rows)
+        self.assertEqual(len(get_delta_filepaths(self.table.parquet_filepath)), 1)
+        os.remove(self.table.sync_state_filepath)
+        self.sync(self.rows)
+        self.assertEqual(get_delta_filepaths(self.table.parquet_filepath), [])
+        self.assertEqual(self.get_stored_rows()["value"].tolist(), [0, 1, 2, 3, 4])
+
+    def test_incremental_sync_with_same_watermark(self):
+        self.sync(self.rows)
+
+        # more rows share the watermark than fit in a batch
+        rows = self.rows.copy()
+        rows["modified"] = pd.Timestamp("2024-01-05")
+        rows["value"] = rows["value"] + 100
+
+        self.sync(rows, batch_size=2)
+        self.assertEqual(self.get_stored_rows()["value"].tolist(), [100, 101, 102, 103, 104])
+
+    def test_column_change_runs_full_sync(self):
+        self.sync(self.rows)
+
+        rows = self.rows.assign(status="Open")
+        importer = self.sync(rows)
+        self.assertIsNone(importer.sync_state)
+        self.assertEqual(self.get_stored_rows()["status"].tolist(), ["Open"] * 5)
@@ -27,11 +27,30 @@ class InsightsTablev3(Document):
         last_synced_on: DF.Datetime | None
         stored: DF.Check
         table: DF.Data
+        watermark_column: DF.Data | None
     # end: auto-generated types
 
     def autoname(self):
         self.name = get_table_name(self.data_source, self.table)
 
+    def validate(self):
+        self.validate_watermark_column()
+
+    def validate_watermark_column(self):
+        if not self.watermark_column or not self.has_value_changed("watermark_column"):
+            return
+
+        ds = InsightsDataSourcev3.get_doc(self.data_source)
+        columns = ds.get_ibis_table(self.table).columns
+        if self.watermark_column not in columns:
+            frappe.throw(
+                f"Column {frappe.bold(self.watermark_column)} not found in table {frappe.bold(self.table)}."
+            )
+        if "name" not in columns:
+            frappe.throw(
+                f"Table {frappe.bold(self.table)} has no name column, it can only be imported as a whole."
+            )
+
     @staticmethod
     def bulk_create(data_source: str, tables: list[str]):
         frappe.db.bulk_insert(